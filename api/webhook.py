@@ -3,12 +3,10 @@ API de Webhook para receber dados do Jotform
 Endpoints para processar formulários de empreendedores
 """
 from fastapi import APIRouter, HTTPException, status, Request, Depends
-from fastapi.responses import JSONResponse
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 import asyncio
 import logging
 import time
-import json
 from datetime import datetime
 
 from dto.webhook_dtos import (
@@ -19,12 +17,30 @@ from dto.webhook_dtos import (
     BulkWebhookResponse,
     EmpreendedorSearchRequest,
     EmpreendedorUpdateRequest,
+    EmpreendedorLoteRequest,
+    EmpreendedorUpdateLoteRequest,
     EmpreendedorStatsResponse
 )
-from data.empreendedor_repository import EmpreendedorRepository
-from utils.jotform_processor import JotformProcessor
+from data.async_empreendedor_repository import AsyncEmpreendedorRepository
+from data.insert_coalescer import InsertCoalescer
+from data.empreendedor_repository import CAMPOS_PROJECAO, ERRO_SUBMISSAO_REPETIDA
+from utils.jotform_processor import JotformProcessor, CamposObrigatoriosError, PayloadInvalidoError
+from utils.jotform_field_mapper import field_mapper
+from utils.body_parser import BodyInvalidoError, iterar_ndjson, ler_body_webhook
+from utils.paginacao import CursorInvalidoError
 from models.impulso_models import Empreendedor
-from services.sheets_webhook_service import forward_to_sheets_webhook
+from services.sheets_webhook_service import forward_to_sheets_webhook, montar_sheets_payload
+from services.ingest_spool import IngestSpool, SpoolWorker
+from services.submission_filter import submission_filter
+from services.bulk_ingest_service import BulkIngestService, ResultadoBulk
+from services.health_service import HealthService
+from services.stats_service import EstatisticasIncrementais
+from services.cache_empreendedores import criar_cache
+from core.config import settings
+from core.database import lendo_da_primaria
+from core import json_codec
+from core.json_codec import FastJSONResponse, NDJSONStreamingResponse
+from core.logging_config import PayloadLog, amostrar_payload, medir_etapa
 
 logger = logging.getLogger(__name__)
 
@@ -35,18 +51,119 @@ router = APIRouter(
 )
 
 # Instância do repositório
-repo = EmpreendedorRepository()
+repo = AsyncEmpreendedorRepository()
 processor = JotformProcessor()
 
+# Inserts do webhook passam pelo group commit quando habilitado
+coalescer = InsertCoalescer(repo)
+writer = coalescer if settings.INSERT_COALESCER_ENABLED else repo
+
+# Spool durável para o modo aceitar-e-confirmar (202)
+spool = IngestSpool()
+
+MODO_SPOOL = "spool"
+
+# Projeção padrão de consulta e busca: só as colunas de EmpreendedorResponse
+CAMPOS_RESPOSTA = tuple(EmpreendedorResponse.model_fields)
+
+
+async def processar_registro_spool(raw_payload: Dict[str, Any]) -> Tuple[bool, Optional[str], bool]:
+    """
+    Gravar no banco um payload retirado do spool
+
+    Returns:
+        Tuple[bool, Optional[str], bool]: (sucesso, erro, retentar)
+    """
+    try:
+        empreendedor_data = processor.converter_payload(raw_payload)
+    except PayloadInvalidoError as e:
+        return False, f"Erro ao processar dados: {e}", False
+
+    success, empreendedor, error = await writer.create_empreendedor(empreendedor_data)
+    if error == ERRO_SUBMISSAO_REPETIDA and empreendedor is not None:
+        submission_filter.registrar(empreendedor_data.submission_id, empreendedor.id)
+        logger.info(f"Reenvio no spool ignorado: empreendedor_id={empreendedor.id}")
+        return True, None, False
+    
+    if not success:
+        # Duplicidades não se resolvem com nova tentativa; erros de banco sim
+        erro_lower = (error or "").lower()
+        retentar = "duplicad" not in erro_lower and "telefone único" not in erro_lower
+        return False, error, retentar
+
+    submission_filter.registrar(empreendedor_data.submission_id, empreendedor.id)
+    logger.info(f"Registro do spool gravado: empreendedor_id={empreendedor.id}")
+    asyncio.create_task(forward_to_sheets_webhook(montar_sheets_payload(raw_payload, empreendedor)))
+    return True, None, False
+
+
+spool_worker = SpoolWorker(spool, processar_registro_spool)
+
+# Motor da importação em lote
+bulk_service = BulkIngestService(repo)
+
+# Health checks com ping em cache
+health = HealthService(repo)
+
+# Estatísticas mantidas em memória pelos eventos do repositório
+estatisticas = EstatisticasIncrementais(repo)
+
+# Cache de consulta por ID (None se desabilitado)
+cache_empreendedores = criar_cache(repo)
+
+
+def campos_solicitados(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Colunas pedidas em ?fields=a,b,c (None sem o parâmetro)
+    
+    Raises:
+        HTTPException: 400 se alguma coluna não existir
+    """
+    if fields is None:
+        return None
+    campos = list(dict.fromkeys(campo.strip() for campo in fields.split(",") if campo.strip()))
+    invalidos = [campo for campo in campos if campo not in CAMPOS_PROJECAO]
+    if invalidos or not campos:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Campos inválidos em fields: {', '.join(invalidos) or '(vazio)'}. "
+                   f"Disponíveis: {', '.join(CAMPOS_PROJECAO)}"
+        )
+    return campos
+
+
+def resposta_reenvio(submission_id: str, empreendedor_id: int, start_time: float) -> FastJSONResponse:
+    """Resposta a um reenvio do Jotform: 200 com o ID do cadastro original"""
+    processing_time = (time.time() - start_time) * 1000
+    logger.info(
+        "🔁 Reenvio do Jotform: submissionID=%s, empreendedor_id=%s (%.2fms)",
+        submission_id, empreendedor_id, processing_time
+    )
+    return FastJSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "success": True,
+            "message": "Submissão já processada anteriormente",
+            "empreendedor_id": empreendedor_id,
+            "submission_id": submission_id,
+            "replay": True,
+            "tempo_processamento_ms": processing_time
+        }
+    )
+
 
 @router.post("/jotform")
-async def receber_webhook_jotform(request: Request):
+async def receber_webhook_jotform(request: Request, modo: Optional[str] = None):
     """
     Receber webhook do Jotform com dados de empreendedor
     
     Este endpoint aceita QUALQUER formato JSON do Jotform e processa automaticamente.
     A API é totalmente flexível e se adapta ao formato recebido.
     
+    **Modo de ingestão** (`?modo=` ou WEBHOOK_INGEST_MODE):
+    - sync: grava no banco antes de responder (201)
+    - spool: valida, grava no spool local e responde 202; um worker grava no banco
+    
     **Retorna:**
     - success: boolean indicando sucesso
     - message: mensagem descritiva
@@ -57,74 +174,43 @@ async def receber_webhook_jotform(request: Request):
     start_time = time.time()
     
     try:
-        # LOG DO REQUEST RECEBIDO
-        logger.info("="*80)
-        logger.info("🎯 WEBHOOK JOTFORM RECEBIDO")
-        logger.info("="*80)
-        logger.info(f"📋 Headers recebidos:")
-        for key, value in request.headers.items():
-            logger.info(f"   {key}: {value}")
-        logger.info("-"*80)
-        
-        # Capturar body bruto
-        body_bytes = await request.body()
-        body_str = body_bytes.decode('utf-8')
-        
-        logger.info(f"📦 Body bruto (tamanho: {len(body_str)} bytes):")
-        logger.info(f"{body_str[:1000]}")  # Primeiros 1000 caracteres
-        logger.info("-"*80)
-        
-        # Verificar se body está vazio
-        if not body_str or body_str.strip() == "":
-            logger.error("❌ Body vazio recebido!")
-            return JSONResponse(
+        # Payloads completos só em DEBUG e para uma amostra das requisições
+        log_payload = amostrar_payload(logger)
+        logger.debug("🎯 Webhook Jotform recebido")
+        if log_payload:
+            logger.debug("📋 Headers recebidos: %s", PayloadLog(dict(request.headers)))
+        
+        # Ler body com o parser do Content-Type (multipart em streaming)
+        try:
+            with medir_etapa("parse"):
+                corpo = await ler_body_webhook(request)
+        except BodyInvalidoError as e:
+            logger.error(f"❌ Não foi possível interpretar o body: {e}")
+            return FastJSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={
                     "success": False,
-                    "message": "Body vazio recebido. Verifique a configuração do webhook no Jotform.",
-                    "headers": dict(request.headers)
+                    "message": f"Não foi possível parsear o body: {e}",
+                    "content_type": request.headers.get("content-type")
                 }
             )
         
-        # Tentar parsear como JSON
-        try:
-            raw_payload = json.loads(body_str)
-            logger.info("✅ Body parseado como JSON com sucesso")
-        except json.JSONDecodeError as e:
-            # Pode ser form-data
-            logger.warning(f"⚠️ Body não é JSON válido: {e}")
-            logger.info("🔄 Tentando parsear como form-data...")
-            
-            # Tentar pegar do form
-            form_data = await request.form()
-            if form_data:
-                raw_payload = dict(form_data)
-                logger.info("✅ Body parseado como form-data com sucesso")
-            else:
-                logger.error("❌ Não conseguiu parsear como JSON nem form-data")
-                return JSONResponse(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    content={
-                        "success": False,
-                        "message": "Não foi possível parsear o body. Formato não suportado.",
-                        "body_recebido": body_str[:500],
-                        "headers": dict(request.headers)
-                    }
-                )
+        raw_payload = corpo.payload
+        logger.debug("✅ Body %s parseado (%d bytes)", corpo.tipo, corpo.tamanho)
+        if log_payload and corpo.bruto is not None:
+            logger.debug("📦 Body bruto: %s", PayloadLog(corpo.bruto, 1000))
         
-        # LOG DO PAYLOAD PARSEADO
-        logger.info(f"📥 Payload parseado:")
-        logger.info(json.dumps(raw_payload, indent=2, ensure_ascii=False))
-        logger.info("="*80)
+        if log_payload:
+            logger.debug("📥 Payload parseado: %s", PayloadLog(raw_payload))
         
         # ⚠️ JOTFORM PODE ENVIAR EM DIFERENTES FORMATOS
         
         # CASO 1: Array [{...}]
         if isinstance(raw_payload, list):
-            logger.info(f"🔄 Payload é um ARRAY com {len(raw_payload)} item(s)")
+            logger.debug("🔄 Payload é um ARRAY com %d item(s)", len(raw_payload))
             if len(raw_payload) == 0:
                 logger.error("❌ Array vazio recebido!")
-                return JSONResponse(
+                return FastJSONResponse(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     content={
                         "success": False,
@@ -134,139 +220,48 @@ async def receber_webhook_jotform(request: Request):
                 )
             
             raw_payload = raw_payload[0]
-            logger.info("✅ Extraído primeiro elemento do array")
         
         # CASO 2: Form-data do Jotform com rawRequest
         if isinstance(raw_payload, dict) and "rawRequest" in raw_payload:
-            logger.info("🔄 Detectado formato form-data do Jotform com rawRequest")
-            logger.info(f"📋 Metadados: formID={raw_payload.get('formID')}, submissionID={raw_payload.get('submissionID')}")
+            logger.debug(
+                "🔄 rawRequest do Jotform: formID=%s, submissionID=%s",
+                raw_payload.get('formID'), raw_payload.get('submissionID')
+            )
             
             try:
-                # Parsear rawRequest (é uma string JSON)
-                raw_request_str = raw_payload.get("rawRequest", "{}")
-                raw_request_data = json.loads(raw_request_str)
-                logger.info("✅ rawRequest parseado com sucesso")
-                
-                # Mapear campos q2_nome, q3_email, etc. para formato esperado
-                mapped_payload = {}
-                
-                # Mapear cada campo do Jotform
-                for key, value in raw_request_data.items():
-                    # Nome (q2_nome, q5_nome, etc.)
-                    if "nome" in key.lower() and isinstance(value, dict) and "first" in value:
-                        mapped_payload["Nome"] = value
-                    elif "nome" in key.lower() and isinstance(value, str):
-                        mapped_payload["nome"] = value
-                    
-                    # Email (q3_email, etc.)
-                    elif "email" in key.lower():
-                        mapped_payload["E-mail"] = value
-                    
-                    # Telefone (q4_telefone, etc.)
-                    elif "telefone" in key.lower() and isinstance(value, dict):
-                        mapped_payload["Telefone"] = value
-                    elif "telefone" in key.lower():
-                        mapped_payload["telefone"] = value
-                    
-                    # CPF
-                    elif "cpf" in key.lower() or "aqui" in key.lower():
-                        mapped_payload["CPF"] = value
-                    
-                    # Cidade
-                    elif "cidade" in key.lower():
-                        mapped_payload["Cidade"] = value
-                    
-                    # Estado
-                    elif "estado" in key.lower():
-                        mapped_payload["Estado"] = value
-                    
-                    # Escolaridade (antes de Idade: "escolaridade" contém "idade")
-                    elif "escolaridade" in key.lower():
-                        mapped_payload["Escolaridade"] = value
-                    
-                    # Idade (só chaves que têm idade e não são escolaridade)
-                    elif "idade" in key.lower():
-                        mapped_payload["Idade"] = value
-                    
-                    # Gênero
-                    elif "genero" in key.lower():
-                        mapped_payload["Gênero"] = value
-                    
-                    # Raça/cor
-                    elif "raca" in key.lower() or "cor" in key.lower():
-                        mapped_payload["Raça/cor"] = value
-                    
-                    # Renda (q20_faixaDe ou campos com "renda" e "insira")
-                    elif "faixade" in key.lower().replace("_", "").replace(" ", "") or ("renda" in key.lower() and "insira" in key.lower()):
-                        mapped_payload["Faixa de renda familiar mensal"] = value
-                    
-                    # Fontes de renda
-                    elif "quaissao" in key.lower().replace("_", "").replace(" ", ""):
-                        mapped_payload["Quais são as suas fontes de renda atualmente?"] = value
-                    
-                    # Tempo de funcionamento
-                    elif "tempode" in key.lower().replace("_", "").replace(" ", ""):
-                        mapped_payload["Tempo de funcionamento do negócio"] = value
-                    
-                    # Segmento
-                    elif "segmentode" in key.lower().replace("_", "").replace(" ", ""):
-                        mapped_payload["Segmento de atuação"] = value
-                    elif "seoutros" in key.lower().replace("_", "").replace(" ", ""):
-                        mapped_payload["Se outros, qual o segmento de atuação do seu négocio?"] = value
-                    
-                    # Organização Stone (q10_voceVeio ou insirauma58)
-                    elif "voceveio" in key.lower().replace("_", "").replace(" ", "") or "insirauma58" in key.lower().replace("_", "").replace(" ", ""):
-                        # Se for lista, pegar primeiro item; se for string, usar direto
-                        org_value = value[0] if isinstance(value, list) and len(value) > 0 else value
-                        mapped_payload["Você veio de alguma organização da Rede Instituto Stone? Se sim, qual?"] = org_value
-                
-                # Adicionar metadados úteis
-                mapped_payload["submissionID"] = raw_payload.get("submissionID")
-                mapped_payload["formID"] = raw_payload.get("formID")
+                # Parsear rawRequest (string JSON) e mapear q2_nome, q3_email, etc.
+                # com o mapeamento compilado do formulário
+                with medir_etapa("mapeamento"):
+                    mapped_payload, campos_nao_mapeados = field_mapper.mapear_submissao(raw_payload)
                 
                 # Log de campos não mapeados (para debug)
-                campos_nao_mapeados = [
-                    key for key in raw_request_data.keys() 
-                    if not any(
-                        key.lower() in mapped_key.lower() or mapped_key.lower() in key.lower()
-                        for mapped_key in mapped_payload.keys()
-                    )
-                    and key not in ["slug", "uploadServerUrl", "jsExecutionTracker", "submitSource", 
-                                   "submitDate", "buildDate", "event_id", "timeToSubmit", 
-                                   "enterprise_server", "validatedNewRequiredFieldIDs", "path", "newCardFormMobile"]
-                ]
                 if campos_nao_mapeados:
-                    logger.debug(f"⚠️ Campos do rawRequest não mapeados: {campos_nao_mapeados}")
+                    logger.debug("⚠️ Campos do rawRequest não mapeados: %s", campos_nao_mapeados)
                 
                 raw_payload = mapped_payload
-                logger.info("✅ Campos mapeados com sucesso")
-                logger.info(f"📦 Payload mapeado:")
-                logger.info(json.dumps(raw_payload, indent=2, ensure_ascii=False))
-                logger.info("-"*80)
                 
-            except json.JSONDecodeError as e:
+            except json_codec.JSONDecodeError as e:
                 logger.error(f"❌ Erro ao parsear rawRequest: {e}")
             except Exception as e:
                 logger.error(f"❌ Erro ao mapear campos: {e}")
         
-        logger.info(f"📦 Payload final para processar:")
-        logger.info(json.dumps(raw_payload, indent=2, ensure_ascii=False))
-        logger.info("-"*80)
+        if log_payload:
+            logger.debug("📦 Payload final para processar: %s", PayloadLog(raw_payload))
+        
+        # Reenvio de submissão já gravada: responder sem validar nem ir ao banco
+        submission_id = processor.extrair_submission_id(raw_payload) if isinstance(raw_payload, dict) else None
+        empreendedor_id_original = submission_filter.obter(submission_id)
+        if empreendedor_id_original is not None:
+            return resposta_reenvio(submission_id, empreendedor_id_original, start_time)
         
-        # Tentar converter para JotformWebhookPayload (flexível)
+        # Validar e converter em uma única passada
         try:
-            payload = JotformWebhookPayload(**raw_payload)
-            logger.info("✅ Payload validado com sucesso")
-        except Exception as e:
-            logger.warning(f"⚠️ Payload não segue formato esperado, mas vamos tentar processar: {e}")
-            # Mesmo assim, vamos tentar processar
-            payload = JotformWebhookPayload(**raw_payload)
-        
-        # Validar campos mínimos
-        if not processor.validar_payload(raw_payload):
+            with medir_etapa("validacao"):
+                empreendedor_data = processor.converter_payload(raw_payload)
+        except CamposObrigatoriosError:
             logger.error("❌ Payload não possui campos mínimos obrigatórios (Nome e Telefone)")
-            logger.info(f"🔍 Campos disponíveis no payload: {list(raw_payload.keys())}")
-            return JSONResponse(
+            logger.debug("🔍 Campos disponíveis no payload: %s", list(raw_payload.keys()))
+            return FastJSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={
                     "success": False,
@@ -279,14 +274,9 @@ async def receber_webhook_jotform(request: Request):
                     }
                 }
             )
-        
-        # Processar payload do Jotform
-        try:
-            empreendedor_data = processor.payload_to_empreendedor(payload)
-            logger.info(f"✅ Dados processados: Nome={empreendedor_data.nome}, Telefone={empreendedor_data.telefone}")
-        except Exception as e:
+        except PayloadInvalidoError as e:
             logger.error(f"❌ Erro ao processar dados: {e}")
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={
                     "success": False,
@@ -295,13 +285,33 @@ async def receber_webhook_jotform(request: Request):
                 }
             )
         
+        # Modo aceitar-e-confirmar: gravar no spool e responder 202
+        if (modo or settings.WEBHOOK_INGEST_MODE).lower() == MODO_SPOOL:
+            with medir_etapa("spool"):
+                spool_id = await spool.enfileirar_async(raw_payload)
+            processing_time = (time.time() - start_time) * 1000
+            logger.info(f"📥 Payload gravado no spool: spool_id={spool_id} ({processing_time:.2f}ms)")
+            return FastJSONResponse(
+                status_code=status.HTTP_202_ACCEPTED,
+                content={
+                    "success": True,
+                    "message": "Cadastro recebido e enfileirado para processamento",
+                    "spool_id": spool_id,
+                    "tempo_processamento_ms": processing_time
+                }
+            )
+        
         # Criar empreendedor no banco
-        logger.info("💾 Tentando salvar no banco de dados...")
-        success, empreendedor, error = repo.create_empreendedor(empreendedor_data)
+        with medir_etapa("banco"):
+            success, empreendedor, error = await writer.create_empreendedor(empreendedor_data)
+        
+        if error == ERRO_SUBMISSAO_REPETIDA and empreendedor is not None:
+            submission_filter.registrar(submission_id, empreendedor.id)
+            return resposta_reenvio(submission_id, empreendedor.id, start_time)
         
         if not success:
             logger.error(f"❌ Erro ao salvar no banco: {error}")
-            return JSONResponse(
+            return FastJSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={
                     "success": False,
@@ -310,49 +320,17 @@ async def receber_webhook_jotform(request: Request):
                 }
             )
         
+        submission_filter.registrar(submission_id, empreendedor.id)
+        
         # Encaminhar para webhook Sheets Stone (fire-and-forget),
         # incluindo dados do registro criado no banco
-        sheets_payload = {
-            **raw_payload,
-            # Dados do banco de dados
-            "empreendedor_id": empreendedor.id,
-            "comunidade_originadora": empreendedor.comunidade_originadora,
-            "data_inscricao": empreendedor.data_inscricao.isoformat() if empreendedor.data_inscricao else None,
-            "organizacao_stone": empreendedor.organizacao_stone,
-            "formulario_tipo": empreendedor.formulario_tipo,
-            # Campos adicionais do formulário que podem estar no empreendedor
-            "faixa_renda": empreendedor.faixa_renda,
-            "fonte_renda": empreendedor.fonte_renda,
-            "raca_cor": empreendedor.raca_cor,
-            "segmento_outros": empreendedor.segmento_outros,
-        }
-        logger.info(f"📤 Enviando para Sheets Stone webhook: empreendedor_id={empreendedor.id}")
-        asyncio.create_task(forward_to_sheets_webhook(sheets_payload))
+        asyncio.create_task(forward_to_sheets_webhook(montar_sheets_payload(raw_payload, empreendedor)))
 
         # Sucesso!
         processing_time = (time.time() - start_time) * 1000
-        logger.info("="*80)
-        logger.info(f"✅ SUCESSO! Empreendedor criado: ID={empreendedor.id}")
-        logger.info(f"   Nome: {empreendedor.nome}")
-        logger.info(f"   Telefone: {empreendedor.telefone}")
-        logger.info(f"   Email: {empreendedor.email}")
-        logger.info(f"   Tempo de processamento: {processing_time:.2f}ms")
-        logger.info("="*80)
-        
-        # Preparar resposta
-        empreendedor_response = EmpreendedorResponse(
-            id=empreendedor.id,
-            nome=empreendedor.nome,
-            telefone=empreendedor.telefone,
-            email=empreendedor.email,
-            cpf=empreendedor.cpf,
-            cidade=empreendedor.cidade,
-            estado=empreendedor.estado,
-            data_inscricao=empreendedor.data_inscricao,
-            formulario_tipo=empreendedor.formulario_tipo
-        )
+        logger.info("✅ Empreendedor criado via webhook: ID=%s (%.2fms)", empreendedor.id, processing_time)
         
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_201_CREATED,
             content={
                 "success": True,
@@ -366,7 +344,7 @@ async def receber_webhook_jotform(request: Request):
                     "cpf": empreendedor.cpf,
                     "cidade": empreendedor.cidade,
                     "estado": empreendedor.estado,
-                    "data_inscricao": empreendedor.data_inscricao.isoformat() if empreendedor.data_inscricao else None,
+                    "data_inscricao": empreendedor.data_inscricao,
                     "formulario_tipo": empreendedor.formulario_tipo
                 },
                 "tempo_processamento_ms": processing_time
@@ -374,12 +352,9 @@ async def receber_webhook_jotform(request: Request):
         )
         
     except Exception as e:
-        logger.error("="*80)
-        logger.error(f"❌ ERRO INESPERADO ao processar webhook")
-        logger.error(f"Erro: {e}")
-        logger.error("="*80, exc_info=True)
+        logger.error(f"❌ ERRO INESPERADO ao processar webhook: {e}", exc_info=True)
         
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
                 "success": False,
@@ -397,6 +372,10 @@ async def receber_webhook_jotform_bulk(payloads: List[JotformWebhookPayload]):
     Este endpoint processa múltiplos formulários de uma vez.
     Útil para importações em massa ou sincronizações.
     
+    Todos os registros são validados antes de gravar; duplicidade é checada por
+    conjunto e as linhas são gravadas em blocos (BULK_CHUNK_SIZE) em paralelo.
+    O encaminhamento ao Sheets é feito em listas, em segundo plano.
+    
     **Retorna:**
     - total_processados: total de registros processados
     - total_sucesso: total de sucessos
@@ -412,72 +391,31 @@ async def receber_webhook_jotform_bulk(payloads: List[JotformWebhookPayload]):
         total_sucesso = 0
         total_erros = 0
         
-        for idx, payload in enumerate(payloads):
-            try:
-                # Validar payload
-                if not processor.validar_payload(payload.dict()):
-                    resultados.append(WebhookResponse(
-                        success=False,
-                        message=f"Registro {idx + 1}: Payload inválido",
-                        errors=["Campos obrigatórios ausentes"]
-                    ))
-                    total_erros += 1
-                    continue
-                
-                # Processar payload
-                empreendedor_data = processor.payload_to_empreendedor(payload)
-                
-                # Criar empreendedor
-                success, empreendedor, error = repo.create_empreendedor(empreendedor_data)
-                
-                if success:
-                    # Encaminhar para webhook Sheets Stone, incluindo dados do registro criado
-                    bulk_sheets_payload = {
-                        **payload.model_dump(by_alias=True, exclude_none=True),
-                        # Dados do banco de dados
-                        "empreendedor_id": empreendedor.id,
-                        "comunidade_originadora": empreendedor.comunidade_originadora,
-                        "data_inscricao": empreendedor.data_inscricao.isoformat() if empreendedor.data_inscricao else None,
-                        "organizacao_stone": empreendedor.organizacao_stone,
-                        "formulario_tipo": empreendedor.formulario_tipo,
-                        # Campos adicionais do formulário que podem estar no empreendedor
-                        "faixa_renda": empreendedor.faixa_renda,
-                        "fonte_renda": empreendedor.fonte_renda,
-                        "raca_cor": empreendedor.raca_cor,
-                        "segmento_outros": empreendedor.segmento_outros,
-                    }
-                    await forward_to_sheets_webhook(bulk_sheets_payload)
-                    resultados.append(WebhookResponse(
-                        success=True,
-                        message=f"Registro {idx + 1}: Sucesso",
-                        empreendedor_id=empreendedor.id,
-                        data=EmpreendedorResponse(
-                            id=empreendedor.id,
-                            nome=empreendedor.nome,
-                            telefone=empreendedor.telefone,
-                            email=empreendedor.email,
-                            cpf=empreendedor.cpf,
-                            cidade=empreendedor.cidade,
-                            estado=empreendedor.estado,
-                            data_inscricao=empreendedor.data_inscricao,
-                            formulario_tipo=empreendedor.formulario_tipo
-                        )
-                    ))
-                    total_sucesso += 1
-                else:
-                    resultados.append(WebhookResponse(
-                        success=False,
-                        message=f"Registro {idx + 1}: Erro",
-                        errors=[error]
-                    ))
-                    total_erros += 1
-                
-            except Exception as e:
-                logger.error(f"Erro ao processar registro {idx + 1}: {e}")
+        for idx, resultado in enumerate(await bulk_service.importar(payloads)):
+            if resultado.sucesso:
+                empreendedor = resultado.empreendedor
+                resultados.append(WebhookResponse(
+                    success=True,
+                    message=f"Registro {idx + 1}: {'Submissão já processada' if resultado.reenvio else 'Sucesso'}",
+                    empreendedor_id=empreendedor.id,
+                    data=EmpreendedorResponse(
+                        id=empreendedor.id,
+                        nome=empreendedor.nome,
+                        telefone=empreendedor.telefone,
+                        email=empreendedor.email,
+                        cpf=empreendedor.cpf,
+                        cidade=empreendedor.cidade,
+                        estado=empreendedor.estado,
+                        data_inscricao=empreendedor.data_inscricao,
+                        formulario_tipo=empreendedor.formulario_tipo
+                    )
+                ))
+                total_sucesso += 1
+            else:
                 resultados.append(WebhookResponse(
                     success=False,
-                    message=f"Registro {idx + 1}: Erro inesperado",
-                    errors=[str(e)]
+                    message=f"Registro {idx + 1}: {'Payload inválido' if resultado.invalido else 'Erro'}",
+                    errors=[resultado.erro]
                 ))
                 total_erros += 1
         
@@ -504,6 +442,103 @@ async def receber_webhook_jotform_bulk(payloads: List[JotformWebhookPayload]):
         )
 
 
+def _linha_resultado(registro: int, linha: int, resultado: ResultadoBulk) -> Dict[str, Any]:
+    """Linha NDJSON com o resultado de um registro da importação em streaming"""
+    empreendedor = resultado.empreendedor
+    return {
+        "registro": registro,
+        "linha": linha,
+        "success": resultado.sucesso,
+        "empreendedor_id": empreendedor.id if empreendedor else None,
+        "telefone": empreendedor.telefone if empreendedor else None,
+        "error": resultado.erro,
+        "replay": resultado.reenvio,
+    }
+
+
+async def _importar_ndjson(request: Request) -> AsyncIterator[bytes]:
+    """
+    Importar NDJSON em blocos de tamanho fixo, emitindo os resultados de cada bloco ao gravá-lo
+
+    A leitura do body só continua depois que o bloco anterior foi gravado,
+    de modo que a memória fica limitada a um bloco, qualquer que seja o arquivo.
+    """
+    start_time = time.time()
+    tamanho_bloco = settings.BULK_CHUNK_SIZE * settings.BULK_MAX_CONCURRENCY
+    totais = {"total_processados": 0, "total_sucesso": 0, "total_erros": 0}
+    bloco: List[Tuple[int, int, Any]] = []  # (registro, linha, payload ou erro)
+
+    async def gravar_bloco() -> bytes:
+        validos = [(registro, linha, p) for registro, linha, p in bloco if isinstance(p, JotformWebhookPayload)]
+        importados = iter(await bulk_service.importar([p for _, _, p in validos]))
+        saida = []
+        for registro, linha, payload in bloco:
+            if isinstance(payload, JotformWebhookPayload):
+                resultado = next(importados)
+            else:
+                resultado = ResultadoBulk(False, erro=payload, invalido=True)
+            totais["total_processados"] += 1
+            totais["total_sucesso" if resultado.sucesso else "total_erros"] += 1
+            saida.append(json_codec.dumps(_linha_resultado(registro, linha, resultado)))
+        bloco.clear()
+        # Não acumular envios ao Sheets se ele estiver mais lento que o banco
+        await bulk_service.aguardar_encaminhamentos(settings.BULK_MAX_CONCURRENCY * 4)
+        return b"\n".join(saida) + b"\n"
+
+    try:
+        async for linha, item in iterar_ndjson(request):
+            if isinstance(item, BodyInvalidoError):
+                payload = str(item)
+            elif not isinstance(item, dict):
+                payload = f"Linha {linha}: registro deve ser um objeto JSON"
+            else:
+                try:
+                    payload = JotformWebhookPayload.model_validate(item)
+                except ValueError as e:
+                    payload = str(e)
+            bloco.append((totais["total_processados"] + len(bloco) + 1, linha, payload))
+
+            if len(bloco) >= tamanho_bloco:
+                yield await gravar_bloco()
+
+        if bloco:
+            yield await gravar_bloco()
+
+    except BodyInvalidoError as e:
+        logger.error(f"Importação NDJSON interrompida: {e}")
+        yield json_codec.dumps({"success": False, "fatal": True, "error": str(e)}) + b"\n"
+
+    processing_time = (time.time() - start_time) * 1000
+    logger.info(
+        f"Importação NDJSON: {totais['total_sucesso']} sucessos, "
+        f"{totais['total_erros']} erros em {processing_time:.2f}ms"
+    )
+    yield json_codec.dumps({
+        "resumo": True,
+        "success": totais["total_erros"] == 0,
+        **totais,
+        "tempo_processamento_ms": processing_time,
+    }) + b"\n"
+
+
+@router.post("/jotform/bulk/stream")
+async def receber_webhook_jotform_bulk_stream(request: Request):
+    """
+    Importação em massa em streaming (NDJSON)
+    
+    Body: um registro JSON por linha; uma linha também pode conter um array de
+    registros. Os registros são gravados em blocos e, a cada bloco gravado, a
+    resposta recebe uma linha NDJSON por registro:
+    
+    `{"registro", "linha", "success", "empreendedor_id", "telefone", "error"}`
+    
+    A última linha traz o resumo (`"resumo": true`, totais e tempo).
+    Útil para backfills históricos de qualquer tamanho.
+    """
+    logger.info("Importação NDJSON iniciada")
+    return NDJSONStreamingResponse(_importar_ndjson(request))
+
+
 @router.post("/jotform/raw", response_model=WebhookResponse)
 async def receber_webhook_jotform_raw(request: Request):
     """
@@ -513,22 +548,10 @@ async def receber_webhook_jotform_raw(request: Request):
     Útil quando a estrutura do formulário muda ou para debugging.
     """
     try:
-        raw_data = await request.json()
         logger.info("Webhook raw recebido")
-        logger.debug(f"Raw data: {raw_data}")
         
-        # Tentar converter para JotformWebhookPayload
-        try:
-            payload = JotformWebhookPayload(**raw_data)
-        except Exception as e:
-            logger.error(f"Erro ao converter raw data: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Formato de dados inválido: {str(e)}"
-            )
-        
-        # Processar normalmente
-        return await receber_webhook_jotform(payload)
+        # Processar normalmente (validação e conversão ficam no webhook principal)
+        return await receber_webhook_jotform(request)
         
     except HTTPException:
         raise
@@ -543,13 +566,83 @@ async def receber_webhook_jotform_raw(request: Request):
 
 # ===== ENDPOINTS DE GESTÃO DE EMPREENDEDORES =====
 
+@router.get("/empreendedores/stats", response_model=EmpreendedorStatsResponse)
+async def obter_estatisticas():
+    """
+    Obter estatísticas gerais dos empreendedores
+    
+    Retorna:
+    - Total de empreendedores
+    - Totais por comunidade, estado, segmento
+    - Total de ativos na Ludos
+    - Total em mentoria
+    - Médias de NPS (geral, mentoria, ludos)
+    
+    Servidas dos contadores em memória (defasagem máxima de
+    STATS_MAX_STALENESS_SECONDS); declarada antes de
+    /empreendedores/{empreendedor_id} para não ser capturada por ela.
+    """
+    try:
+        stats = await estatisticas.obter()
+        return EmpreendedorStatsResponse(**stats)
+        
+    except Exception as e:
+        logger.error(f"Erro ao obter estatísticas: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@router.get("/empreendedores/stats/status")
+async def status_estatisticas():
+    """
+    Status dos contadores de estatísticas
+    
+    Retorna defasagem desde a última reconciliação com o banco e a divergência
+    medida (última e máxima) entre contadores em memória e banco.
+    """
+    return {"success": True, **estatisticas.status()}
+
+
+@router.get("/empreendedores/cache/status")
+async def status_cache_empreendedores():
+    """
+    Métricas do cache de consulta por ID
+    
+    Itens, acertos, faltas, taxa de acerto, expirados, descartados (LRU),
+    invalidações e, com Redis, o estado da assinatura entre instâncias.
+    """
+    if cache_empreendedores is None:
+        return {"success": True, "habilitado": False}
+    return {"success": True, "habilitado": True, **cache_empreendedores.status()}
+
+
 @router.get("/empreendedores/{empreendedor_id}", response_model=EmpreendedorResponse)
-async def obter_empreendedor(empreendedor_id: int):
+async def obter_empreendedor(empreendedor_id: int, fields: Optional[str] = None):
     """
     Obter dados de um empreendedor por ID
+    
+    `fields` (ex.: ?fields=nome,telefone,ludos_pontos) escolhe as colunas
+    retornadas; sem ele, os campos de EmpreendedorResponse. Só as colunas
+    pedidas são lidas do banco.
+    
+    Respostas (e projeções só com campos de EmpreendedorResponse) saem do
+    cache em memória quando possível; ver /empreendedores/cache/status.
     """
+    campos = campos_solicitados(fields)
+    cache = cache_empreendedores if not lendo_da_primaria() else None
     try:
-        empreendedor = repo.get_empreendedor_by_id(empreendedor_id)
+        # Cache: respostas completas e projeções com campos de EmpreendedorResponse
+        if cache is not None and (not campos or set(campos) <= set(CAMPOS_RESPOSTA)):
+            resposta = cache.obter(empreendedor_id)
+            if resposta is not None:
+                if campos:
+                    return FastJSONResponse(content={campo: getattr(resposta, campo) for campo in dict.fromkeys(('id', *campos))})
+                return resposta
+        
+        versao = cache.versao if cache is not None else None
+        empreendedor = await repo.get_empreendedor_by_id(empreendedor_id, campos or CAMPOS_RESPOSTA)
         
         if not empreendedor:
             raise HTTPException(
@@ -557,17 +650,12 @@ async def obter_empreendedor(empreendedor_id: int):
                 detail=f"Empreendedor {empreendedor_id} não encontrado"
             )
         
-        return EmpreendedorResponse(
-            id=empreendedor.id,
-            nome=empreendedor.nome,
-            telefone=empreendedor.telefone,
-            email=empreendedor.email,
-            cpf=empreendedor.cpf,
-            cidade=empreendedor.cidade,
-            estado=empreendedor.estado,
-            data_inscricao=empreendedor.data_inscricao,
-            formulario_tipo=empreendedor.formulario_tipo
-        )
+        if campos:
+            return FastJSONResponse(content=dict(empreendedor._mapping))
+        resposta = EmpreendedorResponse(**empreendedor._mapping)
+        if cache is not None:
+            cache.guardar(resposta, versao)
+        return resposta
         
     except HTTPException:
         raise
@@ -581,7 +669,7 @@ async def obter_empreendedor(empreendedor_id: int):
 
 
 @router.post("/empreendedores/search")
-async def buscar_empreendedores(filters: EmpreendedorSearchRequest):
+async def buscar_empreendedores(filters: EmpreendedorSearchRequest, fields: Optional[str] = None):
     """
     Buscar empreendedores com filtros
     
@@ -591,34 +679,42 @@ async def buscar_empreendedores(filters: EmpreendedorSearchRequest):
     - comunidade_originadora, formulario_tipo
     - data_inscricao (range)
     - flags booleanas (ativo_na_ludos, fazendo_mentoria)
+    
+    Paginação: envie o `next_cursor` da resposta em `cursor` para a página
+    seguinte (keyset, custo constante em qualquer profundidade); `page`
+    continua aceito. `contagem` escolhe o total: exata, cache, estimada ou
+    nenhuma (padrão: exata por página, nenhuma com cursor).
+    
+    `fields` (query string, ex.: ?fields=nome,cidade) escolhe as colunas de
+    cada item; sem ele, os campos de EmpreendedorResponse.
     """
+    campos = campos_solicitados(fields)
     try:
-        empreendedores, total = repo.search_empreendedores(filters)
-        
-        resultados = [
-            EmpreendedorResponse(
-                id=emp.id,
-                nome=emp.nome,
-                telefone=emp.telefone,
-                email=emp.email,
-                cpf=emp.cpf,
-                cidade=emp.cidade,
-                estado=emp.estado,
-                data_inscricao=emp.data_inscricao,
-                formulario_tipo=emp.formulario_tipo
-            )
-            for emp in empreendedores
-        ]
+        empreendedores, total, proximo_cursor = await repo.search_empreendedores(
+            filters, campos or CAMPOS_RESPOSTA
+        )
+        
+        if campos:
+            resultados = [dict(emp._mapping) for emp in empreendedores]
+        else:
+            resultados = [EmpreendedorResponse(**emp._mapping) for emp in empreendedores]
         
         return {
             "success": True,
             "total": total,
-            "page": filters.page,
+            "page": None if filters.cursor else filters.page,
             "page_size": filters.page_size,
-            "total_pages": (total + filters.page_size - 1) // filters.page_size,
+            "total_pages": (total + filters.page_size - 1) // filters.page_size if total is not None else None,
+            "next_cursor": proximo_cursor,
             "data": resultados
         }
         
+    except CursorInvalidoError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
     except Exception as e:
         logger.error(f"Erro ao buscar empreendedores: {e}")
         raise HTTPException(
@@ -636,7 +732,7 @@ async def atualizar_empreendedor(
     Atualizar dados de um empreendedor
     """
     try:
-        success, error = repo.update_empreendedor(empreendedor_id, updates)
+        success, error = await repo.update_empreendedor(empreendedor_id, updates)
         
         if not success:
             if "não encontrado" in error.lower():
@@ -674,7 +770,7 @@ async def deletar_empreendedor(empreendedor_id: int):
     ⚠️ ATENÇÃO: Esta operação não pode ser desfeita!
     """
     try:
-        success, error = repo.delete_empreendedor(empreendedor_id)
+        success, error = await repo.delete_empreendedor(empreendedor_id)
         
         if not success:
             if "não encontrado" in error.lower():
@@ -704,56 +800,112 @@ async def deletar_empreendedor(empreendedor_id: int):
         )
 
 
-@router.get("/empreendedores/stats", response_model=EmpreendedorStatsResponse)
-async def obter_estatisticas():
+@router.post("/empreendedores/lote/atualizar")
+async def atualizar_empreendedores_lote(lote: EmpreendedorUpdateLoteRequest):
     """
-    Obter estatísticas gerais dos empreendedores
+    Aplicar o mesmo patch a vários empreendedores em um único UPDATE
     
-    Retorna:
-    - Total de empreendedores
-    - Totais por comunidade, estado, segmento
-    - Total de ativos na Ludos
-    - Total em mentoria
-    - Médias de NPS (geral, mentoria, ludos)
+    Alvo: `ids` (até 1000) ou `filtros` (mesmos critérios da busca, ao menos
+    um). O telefone não pode ser alterado em lote.
     """
     try:
-        stats = repo.get_stats()
-        return EmpreendedorStatsResponse(**stats)
+        success, total, error = await repo.update_empreendedores(lote.updates, lote.ids, lote.filtros)
         
+        if not success:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=error
+            )
+        
+        return {
+            "success": True,
+            "atualizados": total,
+            "message": f"{total} empreendedores atualizados"
+        }
+        
+    except HTTPException:
+        raise
+    
     except Exception as e:
-        logger.error(f"Erro ao obter estatísticas: {e}")
+        logger.error(f"Erro ao atualizar empreendedores em lote: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
 
-@router.get("/health")
-async def health_check():
+@router.post("/empreendedores/lote/remover")
+async def deletar_empreendedores_lote(lote: EmpreendedorLoteRequest):
     """
-    Health check do serviço de webhook
+    Deletar vários empreendedores em um único DELETE
+    
+    Alvo: `ids` (até 1000) ou `filtros` (mesmos critérios da busca, ao menos um).
+    
+    ⚠️ ATENÇÃO: Esta operação não pode ser desfeita!
     """
     try:
-        # Tentar fazer query simples no banco
-        stats = repo.get_stats()
+        success, total, error = await repo.delete_empreendedores(lote.ids, lote.filtros)
+        
+        if not success:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=error
+            )
         
         return {
-            "status": "healthy",
-            "service": "webhook-jotform",
-            "timestamp": datetime.utcnow(),
-            "database": "connected",
-            "total_empreendedores": stats.get('total_empreendedores', 0)
+            "success": True,
+            "removidos": total,
+            "message": f"{total} empreendedores deletados"
         }
         
+    except HTTPException:
+        raise
+    
     except Exception as e:
-        logger.error(f"Health check falhou: {e}")
-        return JSONResponse(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            content={
-                "status": "unhealthy",
-                "service": "webhook-jotform",
-                "timestamp": datetime.utcnow().isoformat(),
-                "error": str(e)
-            }
+        logger.error(f"Erro ao deletar empreendedores em lote: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@router.get("/spool/status")
+async def status_spool():
+    """
+    Status do spool de ingestão assíncrona
+    
+    Retorna profundidade (registros pendentes), lag do registro mais antigo
+    e quantidade de registros que esgotaram as tentativas.
+    """
+    try:
+        return {
+            "success": True,
+            "modo_padrao": settings.WEBHOOK_INGEST_MODE,
+            **(await asyncio.to_thread(spool.status))
+        }
+        
+    except Exception as e:
+        logger.error(f"Erro ao obter status do spool: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
         )
 
+
+@router.get("/health")
+async def health_check():
+    """
+    Health check do serviço de webhook
+    
+    Usa o ping ao banco em cache (HEALTH_PING_TTL_SECONDS); não consulta a tabela.
+    """
+    pronto = await health.pronto()
+    conteudo = {
+        "status": "healthy" if pronto["status"] == "ready" else "unhealthy",
+        "service": "webhook-jotform",
+        "timestamp": datetime.utcnow(),
+        **{chave: valor for chave, valor in pronto.items() if chave != "status"}
+    }
+    if pronto["status"] != "ready":
+        return FastJSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=conteudo)
+    return conteudo
@@ -1,7 +1,7 @@
 """
 Configurações do Dashboard Impulso Stone
 """
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
 
@@ -49,12 +49,81 @@ class Settings(BaseSettings):
     SQL_PASSWORD: str = ""
     SQL_DRIVER: str = "ODBC Driver 18 for SQL Server" 
     
+    # Réplica de leitura (opcional): busca, stats, consulta por ID e scripts de verificação.
+    # Connection string própria ou, sem ela, a primária com ApplicationIntent=ReadOnly
+    SQL_READ_CONNECTION_STRING: str = ""
+    SQL_READ_APPLICATION_INTENT: bool = False
+    READ_REPLICA_RETRY_SECONDS: float = 30.0  # após falha, leituras vão à primária por esse tempo
+    
+    # Pool de conexões (uma engine compartilhada por processo, ver core/database.py)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_PRE_PING: bool = True
+    # executemany em lote no driver (só SQL Server via pyodbc)
+    DB_FAST_EXECUTEMANY: bool = True
+    
+    # Pool de threads para acesso ao banco a partir das rotas async
+    # (acompanhar DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    DB_EXECUTOR_MAX_WORKERS: int = 20
+    
+    # Group commit dos inserts do webhook (janela curta ou N linhas por transação)
+    INSERT_COALESCER_ENABLED: bool = True
+    INSERT_COALESCER_WINDOW_MS: float = 10.0
+    INSERT_COALESCER_MAX_ROWS: int = 50
+    
+    # Idempotência por submissionID: filtro em memória na frente do banco
+    IDEMPOTENCY_CACHE_SIZE: int = 100000
+    IDEMPOTENCY_WARMUP_ROWS: int = 10000  # submissões recentes carregadas no startup
+    
+    # Importação em lote (/jotform/bulk): linhas por transação, transações em paralelo
+    # e registros por POST ao Sheets
+    BULK_CHUNK_SIZE: int = 500
+    BULK_MAX_CONCURRENCY: int = 4
+    BULK_SHEETS_BATCH_SIZE: int = 100
+    
+    # Cache de GET /empreendedores/{id} (LRU com TTL, mantido pelas escritas); com Redis,
+    # atualizações e remoções invalidam também as outras instâncias (pub/sub)
+    EMPREENDEDOR_CACHE_ENABLED: bool = True
+    EMPREENDEDOR_CACHE_SIZE: int = 10000
+    EMPREENDEDOR_CACHE_TTL_SECONDS: float = 60.0
+    EMPREENDEDOR_CACHE_REDIS_URL: str = ""  # ex.: redis://localhost:6379/0 (vazio = só local)
+    EMPREENDEDOR_CACHE_REDIS_CHANNEL: str = "impulso:empreendedores:invalidacao"
+    
+    # Health checks: ping ao banco servido de cache (probes não varrem a tabela)
+    HEALTH_PING_TTL_SECONDS: float = 5.0
+    HEALTH_PING_TIMEOUT_SECONDS: float = 3.0
+    
+    # Estatísticas em memória: reconciliação periódica com o banco e defasagem máxima aceita
+    STATS_RECONCILE_INTERVAL_SECONDS: float = 300.0
+    STATS_MAX_STALENESS_SECONDS: float = 900.0
+    
+    # Busca textual em nome/cidade/email: "auto" (full-text no SQL Server, se houver
+    # índice; senão trigramas em memória), "fulltext", "trigrama" ou "like"
+    SEARCH_BACKEND: str = "auto"
+    
+    # Busca: cache de contagens (modos "cache" e "estimada") por assinatura dos filtros
+    SEARCH_COUNT_CACHE_TTL_SECONDS: float = 60.0
+    SEARCH_COUNT_CACHE_SIZE: int = 1000
+    
     # Webhook externo (Sheets Stone) - POST ao receber dados do Jotform
     SHEETS_STONE_WEBHOOK_URL: str = "https://webhook.amcbots.com.br/webhook/63aa3143-57b4-4581-be6e-5a05383b72fb"
 
+    # Ingestão do webhook: "sync" (grava antes de responder) ou "spool" (202 + worker)
+    WEBHOOK_INGEST_MODE: str = "sync"
+    WEBHOOK_SPOOL_PATH: str = "spool/webhook_spool.db"
+    WEBHOOK_SPOOL_SYNCHRONOUS: str = "FULL"  # PRAGMA synchronous do SQLite (FULL = fsync por registro)
+    WEBHOOK_SPOOL_BATCH_SIZE: int = 50
+    WEBHOOK_SPOOL_POLL_INTERVAL: float = 1.0
+    WEBHOOK_SPOOL_MAX_TENTATIVAS: int = 8
+
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    LOG_STRUCTURED: bool = False  # True = uma linha JSON por registro
+    LOG_QUEUE_HANDLER: bool = True  # escrita dos logs em thread separada
+    LOG_PAYLOAD_SAMPLE_RATE: float = 0.05  # fração de payloads completos logados (apenas em DEBUG)
     
     @property
     def sql_connection_string(self) -> str:
@@ -77,6 +146,19 @@ class Settings(BaseSettings):
             f"&TrustServerCertificate=yes"
         )
     
+    @property
+    def sql_read_connection_string(self) -> Optional[str]:
+        """
+        Connection string da réplica de leitura (None = leituras na primária)
+        Prioridade: SQL_READ_CONNECTION_STRING, senão a primária com ApplicationIntent=ReadOnly
+        """
+        if self.SQL_READ_CONNECTION_STRING.strip():
+            return self.SQL_READ_CONNECTION_STRING.strip()
+        if self.SQL_READ_APPLICATION_INTENT:
+            conn = self.sql_connection_string
+            return f"{conn}{'&' if '?' in conn else '?'}ApplicationIntent=ReadOnly"
+        return None
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
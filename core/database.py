@@ -0,0 +1,161 @@
+"""
+Registro de engines do SQLAlchemy
+Uma engine (e um pool de conexões) por banco no processo, criada no startup e descartada no shutdown
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+import logging
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ENGINE_PRINCIPAL = "principal"
+ENGINE_LEITURA = "leitura"
+
+# Leituras que precisam ver as escritas recém-feitas vão à primária (read-your-writes)
+_ler_da_primaria: ContextVar[bool] = ContextVar("ler_da_primaria", default=False)
+
+
+def lendo_da_primaria() -> bool:
+    """Dentro de ler_da_primaria() (caches de leitura também devem ser ignorados)"""
+    return _ler_da_primaria.get()
+
+
+@contextmanager
+def ler_da_primaria() -> Iterator[None]:
+    """Dentro do bloco (e das threads do repositório chamadas nele), leituras ignoram a réplica"""
+    token = _ler_da_primaria.set(True)
+    try:
+        yield
+    finally:
+        _ler_da_primaria.reset(token)
+
+
+class EngineRegistry:
+    """
+    Engines compartilhadas por todos os repositórios
+
+    Repositórios recebem a engine por injeção ou pedem a do registro; nunca
+    criam a sua. Assim cada processo mantém um único pool por banco, com
+    tamanho definido em Settings (DB_POOL_*).
+    """
+
+    def __init__(self):
+        self._engines: Dict[str, Engine] = {}
+        self._urls: Dict[str, str] = {}
+        # Banco -> instante (monotonic) até o qual fica fora de uso após falha de conexão
+        self._suspensas: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, nome: str, url: str) -> None:
+        """Associar nome a uma URL de conexão (a engine é criada no primeiro uso)"""
+        with self._lock:
+            self._urls[nome] = url
+
+    def _criar(self, url: str) -> Engine:
+        opcoes: Dict[str, Any] = {}
+        dados = make_url(url)
+        if settings.DB_FAST_EXECUTEMANY and (dados.get_backend_name(), dados.get_driver_name()) == ("mssql", "pyodbc"):
+            # executemany sem RETURNING (ex.: preenchimento da migração) vai em um round-trip por lote
+            opcoes["fast_executemany"] = True
+        return create_engine(
+            url,
+            **opcoes,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            echo=settings.DEBUG
+        )
+
+    def obter(self, nome: str = ENGINE_PRINCIPAL) -> Engine:
+        """Engine compartilhada do banco `nome`"""
+        engine = self._engines.get(nome)
+        if engine is not None:
+            return engine
+        with self._lock:
+            engine = self._engines.get(nome)
+            if engine is None:
+                url = self._urls.get(nome)
+                if url is None:
+                    raise KeyError(f"Banco '{nome}' não registrado")
+                engine = self._criar(url)
+                self._engines[nome] = engine
+                logger.info(
+                    f"Engine '{nome}' criada (pool_size={settings.DB_POOL_SIZE}, "
+                    f"max_overflow={settings.DB_MAX_OVERFLOW})"
+                )
+            return engine
+
+    def registrado(self, nome: str) -> bool:
+        return nome in self._urls
+
+    def suspender(self, nome: str, segundos: Optional[float] = None) -> None:
+        """Tirar o banco `nome` de uso por `segundos` (READ_REPLICA_RETRY_SECONDS)"""
+        segundos = settings.READ_REPLICA_RETRY_SECONDS if segundos is None else segundos
+        self._suspensas[nome] = time.monotonic() + segundos
+
+    def disponivel(self, nome: str) -> bool:
+        """Registrado e fora de suspensão"""
+        return self.registrado(nome) and time.monotonic() >= self._suspensas.get(nome, 0.0)
+
+    def leitura(self) -> Optional[Engine]:
+        """
+        Engine da réplica de leitura, ou None para usar a primária
+
+        None quando não há réplica configurada, quando ela está suspensa após
+        uma falha ou dentro de ler_da_primaria().
+        """
+        if _ler_da_primaria.get() or not self.disponivel(ENGINE_LEITURA):
+            return None
+        return self.obter(ENGINE_LEITURA)
+
+    def iniciar(self) -> None:
+        """Criar as engines registradas (chamado no startup da aplicação)"""
+        for nome in list(self._urls):
+            self.obter(nome)
+
+    def fechar(self) -> None:
+        """Descartar pools e conexões (chamado no shutdown da aplicação)"""
+        with self._lock:
+            engines, self._engines = self._engines, {}
+        for nome, engine in engines.items():
+            engine.dispose()
+            logger.info(f"Engine '{nome}' descartada")
+
+    def status(self) -> Dict[str, Any]:
+        """Ocupação dos pools: conexões em uso, ociosas, overflow e saturação (0 a 1)"""
+        resultado: Dict[str, Any] = {}
+        for nome, engine in list(self._engines.items()):
+            pool = engine.pool
+            em_uso = getattr(pool, "checkedout", lambda: None)()
+            capacidade = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+            resultado[nome] = {
+                "tamanho": getattr(pool, "size", lambda: None)(),
+                "em_uso": em_uso,
+                "ociosas": getattr(pool, "checkedin", lambda: None)(),
+                "overflow": getattr(pool, "overflow", lambda: None)(),
+                "saturacao": round(em_uso / capacidade, 3) if em_uso is not None and capacidade else None,
+                "disponivel": self.disponivel(nome),
+            }
+        return resultado
+
+
+# Registro global (banco principal registrado a partir das configurações)
+engines = EngineRegistry()
+engines.registrar(ENGINE_PRINCIPAL, settings.sql_connection_string)
+if settings.sql_read_connection_string:
+    engines.registrar(ENGINE_LEITURA, settings.sql_read_connection_string)
+
+
+def get_engine(nome: str = ENGINE_PRINCIPAL) -> Engine:
+    """Engine compartilhada (atalho para engines.obter)"""
+    return engines.obter(nome)
@@ -2,6 +2,7 @@
 Dependências do FastAPI
 """
 from typing import Dict, Any, Optional
+from functools import lru_cache
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -13,12 +14,18 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
+@lru_cache(maxsize=None)
+def get_user_service() -> UserService:
+    """Serviço de usuários compartilhado (criado uma vez, reutiliza o pool de conexões)"""
+    return UserService()
+
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> Dict[str, Any]:
     """Obter usuário atual a partir do token JWT"""
     try:
-        user_service = UserService()
+        user_service = get_user_service()
         token_data = await user_service.verify_token(credentials.credentials)
         
         if not token_data:
@@ -0,0 +1,86 @@
+"""
+Codec JSON da aplicação
+Usa orjson quando instalado (parse direto de bytes, datetime nativo) e json da stdlib como fallback
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Union
+import json
+
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.types import Receive, Scope, Send
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+# Nome do backend em uso (exposto para logs e benchmarks)
+BACKEND = "orjson" if orjson is not None else "json"
+
+# orjson.JSONDecodeError herda de json.JSONDecodeError
+JSONDecodeError = json.JSONDecodeError
+
+
+def _default(obj: Any) -> Any:
+    """Serializar tipos que o encoder não conhece nativamente"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Objeto do tipo {type(obj).__name__} não é serializável em JSON")
+
+
+if orjson is not None:
+    _OPCOES_ORJSON = orjson.OPT_NON_STR_KEYS
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """Decodificar JSON direto de bytes (sem string UTF-8 intermediária)"""
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        """Codificar objeto em JSON (bytes UTF-8); datetime sai em ISO 8601"""
+        return orjson.dumps(obj, default=_default, option=_OPCOES_ORJSON)
+
+else:
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """Decodificar JSON (fallback stdlib)"""
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            try:
+                data = bytes(data).decode("utf-8")
+            except UnicodeDecodeError as e:
+                raise JSONDecodeError(f"UTF-8 inválido: {e}", "", 0) from e
+        return json.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        """Codificar objeto em JSON (fallback stdlib)"""
+        return json.dumps(
+            obj, default=_default, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Resposta JSON renderizada pelo codec da aplicação"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    Resposta NDJSON em streaming para endpoints que ainda leem o body
+
+    O StreamingResponse padrão (ASGI < 2.4) consome o canal de recepção
+    procurando desconexão, o que roubaria os chunks do body que o gerador
+    ainda está lendo; aqui apenas a resposta é transmitida.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
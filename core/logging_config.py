@@ -0,0 +1,135 @@
+"""
+Configuração de logging da aplicação
+Handler assíncrono (fila), formato JSON opcional, payloads preguiçosos e amostrados
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Iterator, Optional
+import atexit
+import json
+import logging
+import queue
+import random
+import time
+
+from core.config import settings
+
+# Tempos por etapa da requisição atual (preenchido pelo middleware de logging)
+_etapas_requisicao: ContextVar[Optional[Dict[str, float]]] = ContextVar("etapas_requisicao", default=None)
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatar cada registro como uma linha JSON compacta"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        requisicao = getattr(record, "requisicao", None)
+        if requisicao:
+            data.update(requisicao)
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str, separators=(",", ":"))
+
+
+class PayloadLog:
+    """
+    Payload para log com serialização preguiçosa
+
+    O json.dumps só roda se o registro for de fato emitido, por exemplo:
+    logger.debug("Payload: %s", PayloadLog(payload))
+    """
+
+    __slots__ = ("payload", "limite")
+
+    def __init__(self, payload: Any, limite: Optional[int] = None):
+        self.payload = payload
+        self.limite = limite
+
+    def __str__(self) -> str:
+        if isinstance(self.payload, (bytes, bytearray)):
+            texto = self.payload[:self.limite].decode("utf-8", errors="replace")
+        else:
+            texto = json.dumps(self.payload, indent=2, ensure_ascii=False, default=str)
+        return texto[:self.limite] if self.limite else texto
+
+
+def configurar_logging() -> None:
+    """
+    Configurar logging raiz com QueueHandler
+
+    Os registros são só enfileirados na thread que loga (event loop); a
+    formatação final e a escrita no stream rodam na thread do QueueListener.
+    """
+    global _listener
+
+    stream_handler = logging.StreamHandler()
+    if settings.LOG_STRUCTURED:
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(settings.LOG_FORMAT))
+
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, settings.LOG_LEVEL))
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    if not settings.LOG_QUEUE_HANDLER:
+        root.addHandler(stream_handler)
+        return
+
+    fila: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root.addHandler(QueueHandler(fila))
+
+    if _listener is not None:
+        _listener.stop()
+    _listener = QueueListener(fila, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(parar_logging)
+
+
+def parar_logging() -> None:
+    """Esvaziar a fila e parar o listener de logging"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def amostrar_payload(logger: logging.Logger) -> bool:
+    """
+    Indica se o payload completo desta requisição deve ir para o log
+
+    Só em DEBUG e apenas para a fração LOG_PAYLOAD_SAMPLE_RATE das requisições.
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return False
+    taxa = settings.LOG_PAYLOAD_SAMPLE_RATE
+    return taxa >= 1.0 or random.random() < taxa
+
+
+def iniciar_etapas() -> Dict[str, float]:
+    """Iniciar coleta de tempos por etapa para a requisição atual"""
+    etapas: Dict[str, float] = {}
+    _etapas_requisicao.set(etapas)
+    return etapas
+
+
+@contextmanager
+def medir_etapa(nome: str) -> Iterator[None]:
+    """Medir duração (ms) de uma etapa da requisição atual"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        etapas = _etapas_requisicao.get()
+        if etapas is not None:
+            etapas[nome] = round(etapas.get(nome, 0.0) + (time.perf_counter() - inicio) * 1000, 3)
@@ -0,0 +1,169 @@
+"""
+Repositório assíncrono para Empreendedores
+Ponte entre os endpoints async do FastAPI e o EmpreendedorRepository síncrono
+"""
+from typing import List, Optional, Dict, Any, Tuple, Callable, TypeVar, Sequence, Union
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
+import functools
+import logging
+
+from sqlalchemy.engine import Row
+
+from core.config import settings
+from data.empreendedor_repository import EmpreendedorRepository, LinhaPreparada, ResultadoBusca
+from models.impulso_models import Empreendedor
+from dto.webhook_dtos import (
+    EmpreendedorCreateRequest,
+    EmpreendedorUpdateRequest,
+    EmpreendedorSearchRequest
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncEmpreendedorRepository:
+    """
+    Repositório de empreendedores para uso em rotas async
+
+    Cada chamada ao banco roda em um pool de threads limitado, de modo que
+    o event loop do uvicorn nunca fica parado esperando o Azure SQL.
+    O tamanho do pool (DB_EXECUTOR_MAX_WORKERS) deve acompanhar o pool
+    de conexões do SQLAlchemy para não enfileirar threads sem conexão.
+    """
+
+    def __init__(
+        self,
+        repo: Optional[EmpreendedorRepository] = None,
+        max_workers: Optional[int] = None
+    ):
+        """Inicializar ponte com o repositório síncrono"""
+        self.sync = repo or EmpreendedorRepository()
+        self._max_workers = max_workers or settings.DB_EXECUTOR_MAX_WORKERS
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._max_workers,
+            thread_name_prefix="empreendedor-db"
+        )
+        logger.info(f"Repositório assíncrono inicializado (workers={self._max_workers})")
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Executar função síncrona de acesso a dados no pool de threads
+
+        O contexto (contextvars) da requisição é propagado para a thread.
+        """
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        call = functools.partial(ctx.run, func, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+
+    async def create_empreendedor(
+        self, data: EmpreendedorCreateRequest
+    ) -> Tuple[bool, Optional[Empreendedor], Optional[str]]:
+        """Criar novo empreendedor"""
+        return await self.run(self.sync.create_empreendedor, data)
+
+    async def create_empreendedores_batch(
+        self, empreendedores_data: List[EmpreendedorCreateRequest]
+    ) -> List[Tuple[bool, Optional[Empreendedor], Optional[str]]]:
+        """Criar vários empreendedores em uma única transação"""
+        return await self.run(self.sync.create_empreendedores_batch, empreendedores_data)
+
+    async def preparar_lote(
+        self, empreendedores_data: List[EmpreendedorCreateRequest]
+    ) -> List[LinhaPreparada]:
+        """Resolver duplicidade e telefones de um lote, sem gravar"""
+        return await self.run(self.sync.preparar_lote, empreendedores_data)
+
+    async def inserir_registros(self, registros: List[Dict[str, Any]]) -> List[Empreendedor]:
+        """Gravar registros já preparados em uma transação"""
+        return await self.run(self.sync.inserir_registros, registros)
+
+    async def carregar_indice_busca(self) -> int:
+        """Montar o índice de trigramas da busca textual (sem full-text no banco)"""
+        return await self.run(self.sync.carregar_indice_busca)
+
+    async def get_empreendedor_by_id(
+        self, empreendedor_id: int, campos: Optional[Sequence[str]] = None
+    ) -> Optional[Union[Empreendedor, Row]]:
+        """Buscar empreendedor por ID (com `campos`, só essas colunas)"""
+        return await self.run(self.sync.get_empreendedor_by_id, empreendedor_id, campos)
+
+    async def get_empreendedor_by_submission_id(self, submission_id: str) -> Optional[Empreendedor]:
+        """Buscar empreendedor pelo submissionID do Jotform"""
+        return await self.run(self.sync.get_empreendedor_by_submission_id, submission_id)
+
+    async def listar_submissoes_recentes(self, limite: int) -> List[Tuple[str, int]]:
+        """(submissionID, ID) dos cadastros mais recentes"""
+        return await self.run(self.sync.listar_submissoes_recentes, limite)
+
+    async def get_empreendedor_by_telefone(self, telefone: str) -> Optional[Empreendedor]:
+        """Buscar empreendedor por telefone"""
+        return await self.run(self.sync.get_empreendedor_by_telefone, telefone)
+
+    async def get_empreendedor_by_email(self, email: str) -> Optional[Empreendedor]:
+        """Buscar empreendedor por email"""
+        return await self.run(self.sync.get_empreendedor_by_email, email)
+
+    async def get_empreendedor_by_cpf(self, cpf: str) -> Optional[Empreendedor]:
+        """Buscar empreendedor por CPF"""
+        return await self.run(self.sync.get_empreendedor_by_cpf, cpf)
+
+    async def search_empreendedores(
+        self, filters: EmpreendedorSearchRequest, campos: Optional[Sequence[str]] = None
+    ) -> ResultadoBusca:
+        """Buscar empreendedores com filtros (com `campos`, só essas colunas)"""
+        return await self.run(self.sync.search_empreendedores, filters, campos)
+
+    async def update_empreendedor(
+        self, empreendedor_id: int, updates: EmpreendedorUpdateRequest
+    ) -> Tuple[bool, Optional[str]]:
+        """Atualizar empreendedor"""
+        return await self.run(self.sync.update_empreendedor, empreendedor_id, updates)
+
+    async def delete_empreendedor(self, empreendedor_id: int) -> Tuple[bool, Optional[str]]:
+        """Deletar empreendedor"""
+        return await self.run(self.sync.delete_empreendedor, empreendedor_id)
+
+    async def update_empreendedores(
+        self,
+        updates: EmpreendedorUpdateRequest,
+        ids: Optional[Sequence[int]] = None,
+        filtros: Optional[EmpreendedorSearchRequest] = None
+    ) -> Tuple[bool, int, Optional[str]]:
+        """Aplicar o mesmo patch a uma lista de IDs ou aos resultados dos filtros"""
+        return await self.run(self.sync.update_empreendedores, updates, ids, filtros)
+
+    async def delete_empreendedores(
+        self,
+        ids: Optional[Sequence[int]] = None,
+        filtros: Optional[EmpreendedorSearchRequest] = None
+    ) -> Tuple[bool, int, Optional[str]]:
+        """Deletar uma lista de IDs ou os resultados dos filtros"""
+        return await self.run(self.sync.delete_empreendedores, ids, filtros)
+
+    async def ping(self) -> None:
+        """Verificar conexão com o banco"""
+        await self.run(self.sync.ping)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Obter estatísticas gerais dos empreendedores"""
+        return await self.run(self.sync.get_stats)
+
+    async def get_contadores(self) -> Dict[str, Any]:
+        """Contadores brutos das estatísticas (totais, somas de NPS e distribuições)"""
+        return await self.run(self.sync.get_contadores)
+
+    async def bulk_create(
+        self, empreendedores_data: List[EmpreendedorCreateRequest], tamanho_bloco: Optional[int] = None
+    ) -> List[Tuple[bool, Optional[int], Optional[str]]]:
+        """Criar múltiplos empreendedores em lote (importação em massa)"""
+        return await self.run(self.sync.bulk_create, empreendedores_data, tamanho_bloco)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Encerrar pool de threads (chamado no shutdown da aplicação)"""
+        self._executor.shutdown(wait=wait)
+        logger.info("Pool de threads do repositório encerrado")
@@ -2,14 +2,25 @@
 Repositório para Empreendedores
 Camada de acesso a dados para tabela empreendedores
 """
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Set, NamedTuple, Iterable, Iterator, Callable, Sequence, Union
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime, timedelta
-from sqlalchemy import create_engine, and_, or_, func, text
+from sqlalchemy import and_, or_, func, text, insert, select, update, delete, case, literal_column, union_all, false
+from sqlalchemy.engine import Engine, Row
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy.exc import (
+    SQLAlchemyError, IntegrityError, InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+)
+import functools
 import logging
+import threading
+import time
+import zlib
 
 from core.config import settings
+from core.database import ENGINE_LEITURA, engines, get_engine
 from models.impulso_models import (
     Base, Empreendedor, Mentor, StatusMentoria, 
     Credito, NPSScore, LudosAtividade
@@ -19,29 +30,177 @@ from dto.webhook_dtos import (
     EmpreendedorUpdateRequest,
     EmpreendedorSearchRequest
 )
+from data.indice_trigramas import IndiceTrigramas
+from utils.texto import digitos_telefone, normalizar_busca
+from utils.paginacao import CAMPOS_PAGINACAO, assinatura_filtros, codificar_cursor, decodificar_cursor
 
 logger = logging.getLogger(__name__)
 
+ERRO_DUPLICADO_RECENTE = "Cadastro duplicado detectado nos últimos 2 minutos"
+ERRO_TELEFONE_UNICO = "Não foi possível gerar telefone único"
+ERRO_SUBMISSAO_REPETIDA = "Submissão do Jotform já processada"
+
+# Tamanho máximo de cada lista IN (SQL Server aceita até 2100 parâmetros por comando)
+MAX_PARAMETROS_IN = 1000
+
+# Telefones com sufixo: até 17 caracteres da base + "_N" cabem nos 20 da coluna
+TAMANHO_BASE_TELEFONE = 17
+TAMANHO_TELEFONE = 20
+
+# Travas em processo por base de telefone (distribuídas em faixas fixas)
+FAIXAS_TRAVA_TELEFONE = 64
+TIMEOUT_TRAVA_TELEFONE_MS = 10000
+
+
+# Campos agregados pelas estatísticas
+CAMPOS_NPS = ('nps_geral', 'nps_mentoria', 'nps_ludos')
+DISTRIBUICOES = (
+    ('total_por_comunidade', 'comunidade_originadora'),
+    ('total_por_estado', 'estado'),
+    ('total_por_segmento', 'segmento_atuacao'),
+)
+
+# Eventos de escrita repassados aos observadores do repositório
+EVENTO_CRIADO = "criado"
+EVENTO_ATUALIZADO = "atualizado"
+EVENTO_REMOVIDO = "removido"
+
+# observador(evento, antes, depois): valores das colunas antes e depois da escrita
+Observador = Callable[[str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]], None]
+
+
+# Engine das sessões abertas por um método @leitura em andamento (réplica), se houver
+_engine_leitura: ContextVar[Optional[Engine]] = ContextVar("engine_leitura", default=None)
+
+
+def leitura(metodo):
+    """
+    Método de consulta roteado para a réplica de leitura (se configurada)
+    
+    Falha de conexão na réplica suspende seu uso por READ_REPLICA_RETRY_SECONDS
+    e repete a consulta na primária. Repositórios com engine injetada e
+    chamadas dentro de ler_da_primaria() usam sempre a primária.
+    """
+    @functools.wraps(metodo)
+    def executar(self, *args, **kwargs):
+        replica = engines.leitura() if self._engine is None else None
+        if replica is None:
+            return metodo(self, *args, **kwargs)
+        
+        token = _engine_leitura.set(replica)
+        try:
+            return metodo(self, *args, **kwargs)
+        except (OperationalError, InterfaceError, PoolTimeoutError) as e:
+            engines.suspender(ENGINE_LEITURA)
+            logger.warning(f"Réplica de leitura indisponível, consultando a primária: {e}")
+        finally:
+            _engine_leitura.reset(token)
+        return metodo(self, *args, **kwargs)
+    
+    return executar
+
+
+def montar_estatisticas(contadores: Dict[str, Any]) -> Dict[str, Any]:
+    """Estatísticas (formato de EmpreendedorStatsResponse) a partir dos contadores brutos"""
+    stats = {
+        chave: valor for chave, valor in contadores.items()
+        if not chave.startswith(('soma_', 'contagem_'))
+    }
+    for campo in CAMPOS_NPS:
+        contagem = contadores[f'contagem_{campo}']
+        stats[f'media_{campo}'] = contadores[f'soma_{campo}'] / contagem if contagem else None
+    return stats
+
+
+# Busca textual: campo do filtro -> coluna normalizada
+CAMPOS_BUSCA = {'nome': 'nome_busca', 'cidade': 'cidade_busca', 'email': 'email_busca'}
+
+# Colunas que podem ser pedidas em projeções (fields=); as derivadas, só para busca, ficam de fora
+COLUNAS_DERIVADAS = {*CAMPOS_BUSCA.values(), 'telefone_digitos', 'telefone_digitos_reverso'}
+CAMPOS_PROJECAO = tuple(
+    attr.key for attr in Empreendedor.__mapper__.column_attrs if attr.key not in COLUNAS_DERIVADAS
+)
+
+# Backends da busca textual (SEARCH_BACKEND)
+BUSCA_AUTO = "auto"
+BUSCA_FULLTEXT = "fulltext"
+BUSCA_TRIGRAMA = "trigrama"
+BUSCA_LIKE = "like"
+
+# Modos de contagem da busca (EmpreendedorSearchRequest.contagem)
+CONTAGEM_EXATA = "exata"
+CONTAGEM_CACHE = "cache"
+CONTAGEM_ESTIMADA = "estimada"
+CONTAGEM_NENHUMA = "nenhuma"
+
+
+class ResultadoBusca(NamedTuple):
+    """Página da busca de empreendedores"""
+    empreendedores: List[Union[Empreendedor, Row]]  # Row quando a busca tem projeção
+    total: Optional[int]  # None com contagem "nenhuma"
+    proximo_cursor: Optional[str]  # None na última página
+
+
+class LinhaPreparada(NamedTuple):
+    """Linha de um lote após as checagens de duplicidade"""
+    registro: Optional[Dict[str, Any]]  # valores das colunas, se a linha deve ser gravada
+    erro: Optional[str] = None
+    existente: Optional[Empreendedor] = None  # cadastro original, em reenvios do Jotform
+
 
 class EmpreendedorRepository:
     """Repositório para operações com empreendedores"""
     
-    def __init__(self):
-        """Inicializar repositório e criar engine"""
-        self.engine = create_engine(
-            settings.sql_connection_string,
-            pool_size=10,
-            max_overflow=20,
-            pool_timeout=30,
-            pool_recycle=3600,
-            echo=settings.DEBUG
-        )
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+    def __init__(self, engine: Optional[Engine] = None):
+        """
+        Inicializar repositório
+        
+        Args:
+            engine: engine a usar; por padrão, a engine principal compartilhada
+        """
+        self._engine = engine
+        # expire_on_commit=False: entidades retornadas continuam legíveis após fechar a sessão
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False)
+        self._observadores: List[Observador] = []
+        # Cache de contagens da busca: assinatura dos filtros -> (expira_em, total)
+        self._contagens: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._lock_contagens = threading.Lock()
+        # Busca textual: backend resolvido na primeira busca e índice de trigramas (fallback sem full-text)
+        self._backend: Optional[str] = None
+        self.indice_busca = IndiceTrigramas(list(CAMPOS_BUSCA.values()))
+        self._travas_telefone = [threading.Lock() for _ in range(FAIXAS_TRAVA_TELEFONE)]
         logger.info("Repositório de empreendedores inicializado (usando tabelas existentes)")
     
+    @property
+    def engine(self) -> Engine:
+        """Engine injetada ou a principal do registro (pool criado no startup)"""
+        return self._engine or get_engine()
+    
     def get_session(self) -> Session:
-        """Obter sessão do banco"""
-        return self.SessionLocal()
+        """Obter sessão do banco (na réplica, dentro de um método @leitura)"""
+        return self.SessionLocal(bind=_engine_leitura.get() or self.engine)
+    
+    def adicionar_observador(self, observador: Observador) -> None:
+        """Registrar função chamada após cada escrita confirmada (criação, atualização, remoção)"""
+        self._observadores.append(observador)
+    
+    @staticmethod
+    def _valores(empreendedor: Empreendedor) -> Dict[str, Any]:
+        """Valores das colunas de uma entidade (instantâneo para os observadores)"""
+        return {attr.key: getattr(empreendedor, attr.key) for attr in Empreendedor.__mapper__.column_attrs}
+    
+    def _notificar(self, evento: str, antes: Optional[Dict[str, Any]], depois: Optional[Dict[str, Any]]) -> None:
+        """Repassar escrita aos observadores; falha de um observador não afeta a escrita"""
+        for observador in self._observadores:
+            try:
+                observador(evento, antes, depois)
+            except Exception as e:
+                logger.error(f"Erro no observador do repositório ({evento}): {e}")
+    
+    def _notificar_criados(self, criados: Iterable[Empreendedor]) -> None:
+        if self._observadores:
+            for empreendedor in criados:
+                self._notificar(EVENTO_CRIADO, None, self._valores(empreendedor))
     
     def safe_str(self, value: Any, max_length: int) -> Optional[str]:
         """Truncar string no tamanho máximo"""
@@ -52,124 +211,447 @@ class EmpreendedorRepository:
             return None
         return str_value[:max_length] if len(str_value) > max_length else str_value
     
-    def create_empreendedor(self, data: EmpreendedorCreateRequest) -> Tuple[bool, Optional[Empreendedor], Optional[str]]:
+    @staticmethod
+    def _mesmo_telefone(telefone: str):
+        """Condição de mesmo telefone, em qualquer formatação (índice em telefone_digitos)"""
+        digitos = digitos_telefone(telefone)
+        if digitos is None:
+            return Empreendedor.telefone == telefone
+        return Empreendedor.telefone_digitos == digitos
+    
+    def _buscar_duplicado_recente(
+        self, session: Session, data: EmpreendedorCreateRequest
+    ) -> Optional[Empreendedor]:
         """
-        Criar novo empreendedor
+        Buscar cadastro com o mesmo submissionID (a qualquer tempo) ou com
+        mesmo telefone + CPF ou email nos últimos 2 minutos, em uma consulta
+        """
+        dois_minutos_atras = datetime.now() - timedelta(minutes=2)
+        
+        janela = and_(
+            self._mesmo_telefone(data.telefone),
+            Empreendedor.data_inscricao >= dois_minutos_atras,
+            or_(
+                (data.cpf and Empreendedor.cpf == data.cpf),
+                (data.email and Empreendedor.email == data.email)
+            )
+        )
+        if data.submission_id:
+            # Reenvio do Jotform tem prioridade sobre a janela de 2 minutos
+            return session.query(Empreendedor).filter(
+                or_(Empreendedor.submission_id == data.submission_id, janela)
+            ).order_by(case((Empreendedor.submission_id == data.submission_id, 0), else_=1)).first()
+        
+        return session.query(Empreendedor).filter(janela).first()
+    
+    def _buscar_por_submission_id(self, session: Session, submission_id: str) -> Optional[Empreendedor]:
+        """Buscar cadastro pelo submissionID do Jotform (índice único filtrado)"""
+        return session.scalars(
+            select(Empreendedor).where(Empreendedor.submission_id == submission_id)
+        ).first()
+    
+    @staticmethod
+    def _escapar_like(valor: str) -> str:
+        """Escapar curingas do LIKE (inclui [ do SQL Server) usando \\ como escape"""
+        return (
+            valor.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_").replace("[", "\\[")
+        )
+    
+    @staticmethod
+    def _proximo_telefone_livre(telefone: str, usados: Set[str]) -> Optional[str]:
+        """Primeiro telefone livre entre telefone, base_1, base_2, ... (calculado em memória)"""
+        if telefone not in usados:
+            return telefone
+        
+        telefone_base = telefone[:TAMANHO_BASE_TELEFONE]  # Limitar para permitir sufixos
+        contador = 1
+        while True:
+            telefone_final = f"{telefone_base}_{contador}"
+            if len(telefone_final) > TAMANHO_TELEFONE:  # Limite do campo
+                return None
+            if telefone_final not in usados:
+                return telefone_final
+            contador += 1
+    
+    def _buscar_variantes_telefone(self, session: Session, telefones: Set[str]) -> Set[str]:
+        """
+        Telefones já gravados iguais aos dados ou com sufixo das suas bases (base_N)
+        
+        Uma consulta por bloco de telefones; o LIKE 'base\\_%' usa o índice de telefone.
+        """
+        telefones_lista = sorted(telefones)
+        # Cada telefone gera duas condições (igualdade e LIKE); blocos menores mantêm
+        # o OR encadeado abaixo do limite de profundidade de expressão do SQLite (1000)
+        tamanho_bloco = MAX_PARAMETROS_IN // 4
+        usados: Set[str] = set()
+        
+        for inicio in range(0, len(telefones_lista), tamanho_bloco):
+            condicoes = []
+            for telefone in telefones_lista[inicio:inicio + tamanho_bloco]:
+                condicoes.append(Empreendedor.telefone == telefone)
+                condicoes.append(Empreendedor.telefone.like(
+                    self._escapar_like(telefone[:TAMANHO_BASE_TELEFONE]) + "\\_%", escape="\\"
+                ))
+            usados.update(session.scalars(select(Empreendedor.telefone).where(or_(*condicoes))))
+        
+        return usados
+    
+    def _gerar_telefone_unico(
+        self, session: Session, telefone: str, reservados: Optional[Set[str]] = None
+    ) -> Optional[str]:
+        """
+        Gerar telefone sem conflito, adicionando sufixo _1, _2, ... se necessário
+        
+        Uma única consulta traz o telefone e todas as variantes com sufixo; o
+        próximo sufixo livre é calculado em memória. Deve ser chamado com a
+        trava do telefone (ver _travar_telefones) para ser seguro sob concorrência.
+        
+        Args:
+            reservados: telefones já alocados na mesma transação (ainda não gravados)
         
         Returns:
-            Tuple[bool, Optional[Empreendedor], Optional[str]]: (sucesso, empreendedor, erro)
+            Telefone final ou None se não for possível gerar um telefone único
         """
-        session = self.get_session()
+        usados = self._buscar_variantes_telefone(session, {telefone})
+        if reservados:
+            usados |= reservados
+        return self._proximo_telefone_livre(telefone, usados)
+    
+    @contextmanager
+    def _travar_telefones(self, session: Session, telefones: Iterable[str]) -> Iterator[None]:
+        """
+        Serializar alocação de telefone (e checagem de duplicidade) por base de telefone
+        
+        Em processo: travas em faixas, adquiridas em ordem para não haver deadlock.
+        No SQL Server: sp_getapplock por base, liberado no commit/rollback da
+        transação, o que protege também contra outras instâncias da API.
+        """
+        bases = sorted({telefone[:TAMANHO_BASE_TELEFONE] for telefone in telefones})
+        faixas = sorted({zlib.crc32(base.encode("utf-8")) % FAIXAS_TRAVA_TELEFONE for base in bases})
+        travas = [self._travas_telefone[faixa] for faixa in faixas]
+        
+        for trava in travas:
+            trava.acquire()
         try:
-            # Verificar duplicidade em 2 minutos (mesmo telefone + mesmo CPF ou email)
-            dois_minutos_atras = datetime.now() - timedelta(minutes=2)
-            
-            # Buscar por telefone nos últimos 2 minutos
-            duplicado_recente = session.query(Empreendedor).filter(
-                and_(
-                    Empreendedor.telefone == data.telefone,
-                    Empreendedor.data_inscricao >= dois_minutos_atras,
-                    or_(
-                        (data.cpf and Empreendedor.cpf == data.cpf),
-                        (data.email and Empreendedor.email == data.email)
+            if bases and session.get_bind().dialect.name == "mssql":
+                # Em blocos de MAX_PARAMETROS_IN (limite de parâmetros por comando no SQL Server)
+                for inicio in range(0, len(bases), MAX_PARAMETROS_IN):
+                    bloco = bases[inicio:inicio + MAX_PARAMETROS_IN]
+                    comandos = "\n".join(
+                        f"EXEC @r = sp_getapplock @Resource = :r{i}, @LockMode = 'Exclusive', "
+                        f"@LockOwner = 'Transaction', @LockTimeout = {TIMEOUT_TRAVA_TELEFONE_MS}; "
+                        f"IF @r < 0 THROW 51000, 'Timeout na trava de telefone', 1;"
+                        for i in range(len(bloco))
+                    )
+                    session.execute(
+                        text(f"DECLARE @r INT;\n{comandos}"),
+                        {f"r{i}": f"empreendedores.telefone:{base}" for i, base in enumerate(bloco)}
                     )
+            yield
+        finally:
+            for trava in reversed(travas):
+                trava.release()
+    
+    def _chaves_duplicidade(self, telefone: str, cpf: Optional[str], email: Optional[str]) -> Set[Tuple[str, str, str]]:
+        """Chaves do critério de duplicidade: telefone (dígitos) + CPF ou telefone + email"""
+        telefone = digitos_telefone(telefone) or telefone
+        chaves = set()
+        if cpf:
+            chaves.add((telefone, "cpf", cpf))
+        if email:
+            chaves.add((telefone, "email", email))
+        return chaves
+    
+    def _buscar_chaves_recentes(self, session: Session, telefones: Set[str]) -> Set[Tuple[str, str, str]]:
+        """Chaves de duplicidade dos cadastros dos últimos 2 minutos com os telefones dados"""
+        dois_minutos_atras = datetime.now() - timedelta(minutes=2)
+        digitos = {digitos_telefone(telefone) for telefone in telefones}
+        sem_digitos = {telefone for telefone in telefones if digitos_telefone(telefone) is None}
+        digitos.discard(None)
+        chaves: Set[Tuple[str, str, str]] = set()
+        
+        for coluna, valores in (
+            (Empreendedor.telefone_digitos, list(digitos)),
+            (Empreendedor.telefone, list(sem_digitos))
+        ):
+            for inicio in range(0, len(valores), MAX_PARAMETROS_IN):
+                linhas = session.query(
+                    Empreendedor.telefone, Empreendedor.cpf, Empreendedor.email
+                ).filter(
+                    coluna.in_(valores[inicio:inicio + MAX_PARAMETROS_IN]),
+                    Empreendedor.data_inscricao >= dois_minutos_atras
+                ).all()
+                for telefone, cpf, email in linhas:
+                    chaves |= self._chaves_duplicidade(telefone, cpf, email)
+        
+        return chaves
+    
+    def _buscar_telefones_existentes(self, session: Session, telefones: Set[str]) -> Set[str]:
+        """Telefones (sem sufixo) que já existem na tabela"""
+        telefones_lista = list(telefones)
+        existentes: Set[str] = set()
+        
+        for inicio in range(0, len(telefones_lista), MAX_PARAMETROS_IN):
+            existentes.update(session.scalars(
+                select(Empreendedor.telefone).where(
+                    Empreendedor.telefone.in_(telefones_lista[inicio:inicio + MAX_PARAMETROS_IN])
                 )
-            ).first()
-            
-            if duplicado_recente:
-                logger.warning(
-                    f"Tentativa de cadastro duplicado detectada: "
-                    f"telefone={data.telefone}, CPF={data.cpf}, email={data.email}, "
-                    f"ID existente={duplicado_recente.id}"
+            ))
+        
+        return existentes
+    
+    def _buscar_submissoes(self, session: Session, submission_ids: Set[str]) -> Dict[str, Empreendedor]:
+        """Cadastros já gravados com os submissionIDs dados"""
+        ids_lista = list(submission_ids)
+        encontrados: Dict[str, Empreendedor] = {}
+        
+        for inicio in range(0, len(ids_lista), MAX_PARAMETROS_IN):
+            for empreendedor in session.scalars(
+                select(Empreendedor).where(
+                    Empreendedor.submission_id.in_(ids_lista[inicio:inicio + MAX_PARAMETROS_IN])
                 )
-                return False, None, "Cadastro duplicado detectado nos últimos 2 minutos"
+            ):
+                encontrados[empreendedor.submission_id] = empreendedor
+        
+        return encontrados
+    
+    def _preparar_lote(
+        self, session: Session, empreendedores_data: List[EmpreendedorCreateRequest]
+    ) -> List[LinhaPreparada]:
+        """
+        Resolver duplicidade e telefone final de um lote com consultas por conjunto
+        
+        Uma consulta (por bloco de MAX_PARAMETROS_IN valores) traz os
+        submissionIDs já gravados, outra as chaves recentes e outra os telefones
+        já usados; os sufixos dos telefones em conflito vêm de mais uma consulta
+        e são alocados em memória.
+        
+        Reenvios de um submissionID gravado voltam com o cadastro original em
+        `existente`; repetições dentro do próprio lote voltam com `existente`
+        vazio e devem ser resolvidas pelo chamador após a gravação.
+        
+        Returns:
+            Lista de LinhaPreparada, na mesma ordem da entrada
+        """
+        contagem_telefones = Counter(data.telefone for data in empreendedores_data)
+        telefones = set(contagem_telefones)
+        submissoes = {data.submission_id for data in empreendedores_data if data.submission_id}
+        gravadas = self._buscar_submissoes(session, submissoes) if submissoes else {}
+        chaves_recentes = self._buscar_chaves_recentes(session, telefones)
+        telefones_usados = self._buscar_telefones_existentes(session, telefones)
+        
+        # Só telefones em conflito (no banco ou repetidos no lote) precisam das
+        # variantes com sufixo, trazidas em uma consulta para todos
+        em_conflito = telefones_usados | {t for t, total in contagem_telefones.items() if total > 1}
+        if em_conflito:
+            telefones_usados |= self._buscar_variantes_telefone(session, em_conflito)
+        submissoes_lote: Set[str] = set()
+        
+        preparados: List[LinhaPreparada] = []
+        for data in empreendedores_data:
+            if data.submission_id and (data.submission_id in gravadas or data.submission_id in submissoes_lote):
+                preparados.append(LinhaPreparada(
+                    None, ERRO_SUBMISSAO_REPETIDA, gravadas.get(data.submission_id)
+                ))
+                continue
             
-            # Verificar se telefone já existe (lógica antiga para sufixos)
-            telefone_base = data.telefone[:17]  # Limitar para permitir sufixos
-            telefone_final = data.telefone
+            # Mesmo critério da janela de 2 minutos, aplicado também às linhas do próprio lote
+            chaves = self._chaves_duplicidade(data.telefone, data.cpf, data.email)
+            if chaves & chaves_recentes:
+                logger.warning(f"Tentativa de cadastro duplicado detectada no lote: telefone={data.telefone}")
+                preparados.append(LinhaPreparada(None, ERRO_DUPLICADO_RECENTE))
+                continue
             
-            # Se telefone existe, adicionar sufixo
-            contador = 1
-            while session.query(Empreendedor).filter(
-                Empreendedor.telefone == telefone_final
-            ).first():
-                telefone_final = f"{telefone_base}_{contador}"
-                contador += 1
-                if len(telefone_final) > 20:  # Limite do campo
-                    return False, None, "Não foi possível gerar telefone único"
+            telefone_final = self._proximo_telefone_livre(data.telefone, telefones_usados)
+            if telefone_final is None:
+                preparados.append(LinhaPreparada(None, ERRO_TELEFONE_UNICO))
+                continue
             
-            # Criar empreendedor
-            empreendedor = Empreendedor(
-                # Campos obrigatórios
-                nome=self.safe_str(data.nome, 100),
-                telefone=telefone_final[:20],
-                
-                # Campos principais
-                email=self.safe_str(data.email, 100),
-                comunidade_originadora=self.safe_str(data.comunidade_originadora, 50),
-                data_inscricao=data.data_inscricao or datetime.now(),
+            chaves_recentes |= chaves
+            telefones_usados.add(telefone_final)
+            if data.submission_id:
+                submissoes_lote.add(data.submission_id)
+            preparados.append(LinhaPreparada(self._montar_registro(data, telefone_final)))
+        
+        return preparados
+    
+    def preparar_lote(
+        self, empreendedores_data: List[EmpreendedorCreateRequest]
+    ) -> List[LinhaPreparada]:
+        """
+        Validar duplicidade e alocar telefones de um lote, sem gravar
+        
+        Returns:
+            Lista de LinhaPreparada, na mesma ordem da entrada
+        """
+        if not empreendedores_data:
+            return []
+        
+        session = self.get_session()
+        try:
+            return self._preparar_lote(session, empreendedores_data)
+        finally:
+            session.close()
+    
+    def inserir_registros(self, registros: List[Dict[str, Any]]) -> List[Empreendedor]:
+        """
+        Gravar registros já preparados em uma transação (INSERT multi-linha com RETURNING)
+        
+        Raises:
+            SQLAlchemyError: a transação é desfeita e o erro repassado
+        """
+        session = self.get_session()
+        try:
+            criados = session.scalars(
+                insert(Empreendedor).returning(Empreendedor, sort_by_parameter_order=True),
+                registros
+            ).all()
+            session.commit()
+            self._notificar_criados(criados)
+            return criados
+        except SQLAlchemyError:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
+    @staticmethod
+    def _colunas_telefone(telefone: Optional[str]) -> Dict[str, Optional[str]]:
+        """Colunas derivadas do telefone: dígitos e dígitos invertidos"""
+        digitos = digitos_telefone(telefone)
+        return {
+            'telefone_digitos': digitos,
+            'telefone_digitos_reverso': digitos[::-1] if digitos else None,
+        }
+    
+    def _montar_registro(self, data: EmpreendedorCreateRequest, telefone_final: str) -> Dict[str, Any]:
+        """Montar valores das colunas de empreendedores a partir do DTO"""
+        return dict(
+            # Campos obrigatórios
+            nome=self.safe_str(data.nome, 100),
+            telefone=telefone_final[:20],
+            
+            # Campos principais
+            email=self.safe_str(data.email, 100),
+            comunidade_originadora=self.safe_str(data.comunidade_originadora, 50),
+            data_inscricao=data.data_inscricao or datetime.now(),
+            
+            # Campos do formulário
+            apelido=self.safe_str(data.apelido, 100),
+            cpf=self.safe_str(data.cpf, 14),
+            cidade=self.safe_str(data.cidade, 100),
+            estado=self.safe_str(data.estado, 50),
+            idade=self.safe_str(data.idade, 20),
+            genero=self.safe_str(data.genero, 50),
+            raca_cor=self.safe_str(data.raca_cor, 50),
+            escolaridade=self.safe_str(data.escolaridade, 100),
+            faixa_renda=self.safe_str(data.faixa_renda, 100),
+            fonte_renda=data.fonte_renda,
+            tempo_funcionamento=self.safe_str(data.tempo_funcionamento, 50),
+            segmento_atuacao=self.safe_str(data.segmento_atuacao, 100),
+            segmento_outros=self.safe_str(data.segmento_outros, 100),
+            organizacao_stone=self.safe_str(data.organizacao_stone, 100),
+            formulario_tipo=self.safe_str(data.formulario_tipo, 50) or "Webhook Jotform",
+            
+            # Campos Ludos
+            ludos_id=data.ludos_id,
+            ludos_login=self.safe_str(data.ludos_login, 100),
+            ludos_status=self.safe_str(data.ludos_status, 20),
+            ludos_pontos=data.ludos_pontos,
+            ludos_moedas=data.ludos_moedas,
+            ludos_nivel=data.ludos_nivel,
+            ludos_primeiro_login=data.ludos_primeiro_login,
+            ludos_ultimo_login=data.ludos_ultimo_login,
+            
+            # Campos MGM
+            mgm_user_name=self.safe_str(data.mgm_user_name, 100),
+            mgm_whatsapp=self.safe_str(data.mgm_whatsapp, 20),
+            mgm_total_mensagens=data.mgm_total_mensagens,
+            mgm_total_reacoes=data.mgm_total_reacoes,
+            mgm_total_interacoes=data.mgm_total_interacoes,
+            mgm_ultima_mensagem=data.mgm_ultima_mensagem,
+            mgm_ultima_reacao=data.mgm_ultima_reacao,
+            mgm_engajamento_percent=data.mgm_engajamento_percent,
+            
+            # Status Flags
+            esta_na_comunidade=data.esta_na_comunidade,
+            esta_no_grupo_mentoria=data.esta_no_grupo_mentoria,
+            esta_no_papo_impulso=data.esta_no_papo_impulso,
+            interacao_nos_grupos=data.interacao_nos_grupos,
+            ativo_na_ludos=data.ativo_na_ludos,
+            fazendo_mentoria=data.fazendo_mentoria,
+            solicitou_credito=data.solicitou_credito,
+            
+            # NPS Scores
+            nps_geral=data.nps_geral,
+            nps_mentoria=data.nps_mentoria,
+            nps_ludos=data.nps_ludos,
+            
+            # Idempotência
+            submission_id=self.safe_str(data.submission_id, 64),
+            
+            # Busca (normalizados na gravação)
+            nome_busca=normalizar_busca(data.nome, 100),
+            cidade_busca=normalizar_busca(data.cidade, 100),
+            email_busca=normalizar_busca(data.email, 100),
+            **self._colunas_telefone(telefone_final)
+        )
+    
+    def create_empreendedor(self, data: EmpreendedorCreateRequest) -> Tuple[bool, Optional[Empreendedor], Optional[str]]:
+        """
+        Criar novo empreendedor
+        
+        Returns:
+            Tuple[bool, Optional[Empreendedor], Optional[str]]: (sucesso, empreendedor, erro)
+        """
+        session = self.get_session()
+        try:
+            # Trava da base do telefone até o commit: checagem de duplicidade e
+            # sufixo não competem com inserts concorrentes do mesmo telefone
+            with self._travar_telefones(session, [data.telefone]):
+                # Verificar duplicidade em 2 minutos (mesmo telefone + mesmo CPF ou email)
+                duplicado_recente = self._buscar_duplicado_recente(session, data)
                 
-                # Campos do formulário
-                apelido=self.safe_str(data.apelido, 100),
-                cpf=self.safe_str(data.cpf, 14),
-                cidade=self.safe_str(data.cidade, 100),
-                estado=self.safe_str(data.estado, 50),
-                idade=self.safe_str(data.idade, 20),
-                genero=self.safe_str(data.genero, 50),
-                raca_cor=self.safe_str(data.raca_cor, 50),
-                escolaridade=self.safe_str(data.escolaridade, 100),
-                faixa_renda=self.safe_str(data.faixa_renda, 100),
-                fonte_renda=data.fonte_renda,
-                tempo_funcionamento=self.safe_str(data.tempo_funcionamento, 50),
-                segmento_atuacao=self.safe_str(data.segmento_atuacao, 100),
-                segmento_outros=self.safe_str(data.segmento_outros, 100),
-                organizacao_stone=self.safe_str(data.organizacao_stone, 100),
-                formulario_tipo=self.safe_str(data.formulario_tipo, 50) or "Webhook Jotform",
+                if duplicado_recente and data.submission_id and duplicado_recente.submission_id == data.submission_id:
+                    logger.info(
+                        f"Reenvio do Jotform: submissionID={data.submission_id}, "
+                        f"ID existente={duplicado_recente.id}"
+                    )
+                    return False, duplicado_recente, ERRO_SUBMISSAO_REPETIDA
                 
-                # Campos Ludos
-                ludos_id=data.ludos_id,
-                ludos_login=self.safe_str(data.ludos_login, 100),
-                ludos_status=self.safe_str(data.ludos_status, 20),
-                ludos_pontos=data.ludos_pontos,
-                ludos_moedas=data.ludos_moedas,
-                ludos_nivel=data.ludos_nivel,
-                ludos_primeiro_login=data.ludos_primeiro_login,
-                ludos_ultimo_login=data.ludos_ultimo_login,
+                if duplicado_recente:
+                    logger.warning(
+                        f"Tentativa de cadastro duplicado detectada: "
+                        f"telefone={data.telefone}, CPF={data.cpf}, email={data.email}, "
+                        f"ID existente={duplicado_recente.id}"
+                    )
+                    return False, None, ERRO_DUPLICADO_RECENTE
                 
-                # Campos MGM
-                mgm_user_name=self.safe_str(data.mgm_user_name, 100),
-                mgm_whatsapp=self.safe_str(data.mgm_whatsapp, 20),
-                mgm_total_mensagens=data.mgm_total_mensagens,
-                mgm_total_reacoes=data.mgm_total_reacoes,
-                mgm_total_interacoes=data.mgm_total_interacoes,
-                mgm_ultima_mensagem=data.mgm_ultima_mensagem,
-                mgm_ultima_reacao=data.mgm_ultima_reacao,
-                mgm_engajamento_percent=data.mgm_engajamento_percent,
+                # Telefone livre (com sufixo, se necessário) em uma consulta
+                telefone_final = self._gerar_telefone_unico(session, data.telefone)
+                if telefone_final is None:
+                    return False, None, ERRO_TELEFONE_UNICO
                 
-                # Status Flags
-                esta_na_comunidade=data.esta_na_comunidade,
-                esta_no_grupo_mentoria=data.esta_no_grupo_mentoria,
-                esta_no_papo_impulso=data.esta_no_papo_impulso,
-                interacao_nos_grupos=data.interacao_nos_grupos,
-                ativo_na_ludos=data.ativo_na_ludos,
-                fazendo_mentoria=data.fazendo_mentoria,
-                solicitou_credito=data.solicitou_credito,
+                # Criar empreendedor: id e defaults voltam no próprio INSERT
+                # (OUTPUT INSERTED no SQL Server, RETURNING nos demais), sem refresh
+                empreendedor = session.scalars(
+                    insert(Empreendedor).returning(Empreendedor),
+                    [self._montar_registro(data, telefone_final)]
+                ).one()
+                session.commit()
                 
-                # NPS Scores
-                nps_geral=data.nps_geral,
-                nps_mentoria=data.nps_mentoria,
-                nps_ludos=data.nps_ludos
-            )
-            
-            session.add(empreendedor)
-            session.commit()
-            session.refresh(empreendedor)
-            
+            self._notificar_criados([empreendedor])
             logger.info(f"Empreendedor criado: ID={empreendedor.id}, Nome={empreendedor.nome}")
             return True, empreendedor, None
             
         except IntegrityError as e:
             session.rollback()
+            # Reenvio concorrente: outra requisição gravou o mesmo submissionID primeiro
+            if data.submission_id:
+                original = self._buscar_por_submission_id(session, data.submission_id)
+                if original:
+                    logger.info(f"Reenvio concorrente do Jotform: submissionID={data.submission_id}")
+                    return False, original, ERRO_SUBMISSAO_REPETIDA
             logger.error(f"Erro de integridade ao criar empreendedor: {e}")
             return False, None, "Dados duplicados ou inválidos"
         
@@ -186,26 +668,141 @@ class EmpreendedorRepository:
         finally:
             session.close()
     
-    def get_empreendedor_by_id(self, empreendedor_id: int) -> Optional[Empreendedor]:
-        """Buscar empreendedor por ID"""
+    def create_empreendedores_batch(
+        self, empreendedores_data: List[EmpreendedorCreateRequest]
+    ) -> List[Tuple[bool, Optional[Empreendedor], Optional[str]]]:
+        """
+        Criar vários empreendedores em uma única transação (group commit)
+        
+        As verificações de duplicidade e os telefones são resolvidos por
+        conjunto (ver _preparar_lote), considerando também as linhas do próprio
+        lote. As linhas válidas são gravadas em um único INSERT multi-linha com
+        RETURNING. Se o lote falhar no banco, cada linha é regravada
+        individualmente para isolar o erro.
+        
+        Returns:
+            Lista de (sucesso, empreendedor, erro), na mesma ordem da entrada
+        """
+        resultados: List[Tuple[bool, Optional[Empreendedor], Optional[str]]] = [
+            (False, None, None)
+        ] * len(empreendedores_data)
+        if not empreendedores_data:
+            return resultados
+        
         session = self.get_session()
         try:
+            registros: List[Dict[str, Any]] = []
+            indices: List[int] = []
+            reenvios: List[int] = []
+            criados: List[Empreendedor] = []
+            
+            with self._travar_telefones(session, [data.telefone for data in empreendedores_data]):
+                for idx, linha in enumerate(self._preparar_lote(session, empreendedores_data)):
+                    if linha.registro is None:
+                        resultados[idx] = (False, linha.existente, linha.erro)
+                        if linha.erro == ERRO_SUBMISSAO_REPETIDA and linha.existente is None:
+                            reenvios.append(idx)
+                        continue
+                    registros.append(linha.registro)
+                    indices.append(idx)
+                
+                if registros:
+                    criados = session.scalars(
+                        insert(Empreendedor).returning(Empreendedor, sort_by_parameter_order=True),
+                        registros
+                    ).all()
+                session.commit()
+            
+            if criados:
+                self._notificar_criados(criados)
+                for idx, empreendedor in zip(indices, criados):
+                    resultados[idx] = (True, empreendedor, None)
+                
+                logger.info(f"Lote gravado: {len(criados)} empreendedores em uma transação")
+            
+            # Reenvios dentro do próprio lote apontam para a linha gravada agora
+            por_submissao = {e.submission_id: e for e in criados if e.submission_id}
+            for idx in reenvios:
+                original = por_submissao.get(empreendedores_data[idx].submission_id)
+                resultados[idx] = (False, original, ERRO_SUBMISSAO_REPETIDA)
+            
+            return resultados
+            
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(f"Erro ao gravar lote de empreendedores, regravando individualmente: {e}")
+        
+        finally:
+            session.close()
+        
+        return [self.create_empreendedor(data) for data in empreendedores_data]
+    
+    @staticmethod
+    def _colunas_projecao(campos: Sequence[str]) -> List[Any]:
+        """Colunas de uma projeção (o ID vem sempre primeiro)"""
+        return [Empreendedor.id, *(getattr(Empreendedor, campo) for campo in campos if campo != 'id')]
+    
+    @leitura
+    def get_empreendedor_by_id(
+        self, empreendedor_id: int, campos: Optional[Sequence[str]] = None
+    ) -> Optional[Union[Empreendedor, Row]]:
+        """
+        Buscar empreendedor por ID
+        
+        Args:
+            campos: colunas a carregar (ver CAMPOS_PROJECAO); com elas, retorna uma
+                linha leve (Row) em vez da entidade completa
+        """
+        session = self.get_session()
+        try:
+            if campos:
+                return session.execute(
+                    select(*self._colunas_projecao(campos)).where(Empreendedor.id == empreendedor_id)
+                ).first()
             return session.query(Empreendedor).filter(
                 Empreendedor.id == empreendedor_id
             ).first()
         finally:
             session.close()
     
+    def get_empreendedor_by_submission_id(self, submission_id: str) -> Optional[Empreendedor]:
+        """Buscar empreendedor pelo submissionID do Jotform"""
+        session = self.get_session()
+        try:
+            return self._buscar_por_submission_id(session, submission_id)
+        finally:
+            session.close()
+    
+    def listar_submissoes_recentes(self, limite: int) -> List[Tuple[str, int]]:
+        """(submissionID, ID) dos cadastros mais recentes, para aquecer o filtro em memória"""
+        session = self.get_session()
+        try:
+            return [
+                (submission_id, empreendedor_id)
+                for submission_id, empreendedor_id in session.execute(
+                    select(Empreendedor.submission_id, Empreendedor.id)
+                    .where(Empreendedor.submission_id.isnot(None))
+                    .order_by(Empreendedor.id.desc())
+                    .limit(limite)
+                )
+            ]
+        finally:
+            session.close()
+    
+    @leitura
     def get_empreendedor_by_telefone(self, telefone: str) -> Optional[Empreendedor]:
-        """Buscar empreendedor por telefone"""
+        """Buscar empreendedor por telefone, em qualquer formatação (o cadastro com o número exato primeiro)"""
         session = self.get_session()
         try:
             return session.query(Empreendedor).filter(
-                Empreendedor.telefone == telefone
+                self._mesmo_telefone(telefone)
+            ).order_by(
+                case((Empreendedor.telefone == telefone, 0), else_=1), Empreendedor.id
             ).first()
         finally:
             session.close()
     
+    @leitura
     def get_empreendedor_by_email(self, email: str) -> Optional[Empreendedor]:
         """Buscar empreendedor por email"""
         session = self.get_session()
@@ -216,6 +813,7 @@ class EmpreendedorRepository:
         finally:
             session.close()
     
+    @leitura
     def get_empreendedor_by_cpf(self, cpf: str) -> Optional[Empreendedor]:
         """Buscar empreendedor por CPF"""
         session = self.get_session()
@@ -226,68 +824,307 @@ class EmpreendedorRepository:
         finally:
             session.close()
     
+    def _backend_busca(self) -> str:
+        """Backend da busca textual (SEARCH_BACKEND, com "auto" resolvido na primeira busca)"""
+        if self._backend is not None:
+            return self._backend
+        backend = settings.SEARCH_BACKEND
+        if backend == BUSCA_AUTO:
+            backend = BUSCA_TRIGRAMA
+            if self.engine.dialect.name == "mssql":
+                try:
+                    with self.engine.connect() as conn:
+                        ativo = conn.execute(
+                            text("SELECT OBJECTPROPERTY(OBJECT_ID(:tabela), 'TableHasActiveFulltextIndex')"),
+                            {"tabela": Empreendedor.__tablename__}
+                        ).scalar()
+                    if ativo:
+                        backend = BUSCA_FULLTEXT
+                except SQLAlchemyError as e:
+                    logger.warning(f"Não foi possível verificar o índice full-text: {e}")
+        logger.info(f"Busca textual: {backend}")
+        self._backend = backend
+        return backend
+    
+    @staticmethod
+    def _expressao_fulltext(termo: str) -> str:
+        """Termo normalizado -> CONTAINS com prefixo em cada palavra ("ana sou" -> '"ana*" AND "sou*"')"""
+        palavras = [palavra.replace('"', '') for palavra in termo.split()]
+        return " AND ".join(f'"{palavra}*"' for palavra in palavras if palavra)
+    
+    def _filtrar_texto(self, query, coluna: str, termo: str):
+        """Filtrar coluna normalizada (*_busca) pelo termo, conforme o backend de busca"""
+        termo = normalizar_busca(termo)
+        if not termo:
+            return query
+        atributo = getattr(Empreendedor, coluna)
+        backend = self._backend_busca()
+        
+        if backend == BUSCA_FULLTEXT:
+            expressao = self._expressao_fulltext(termo)
+            if expressao:
+                return query.filter(func.CONTAINS(atributo, expressao))
+        
+        if backend == BUSCA_TRIGRAMA and self.indice_busca.carregado:
+            candidatos = self.indice_busca.candidatos(coluna, termo)
+            if candidatos is not None:
+                if not candidatos:
+                    return query.filter(false())
+                # Termos pouco seletivos (muitos candidatos) ficam só com o LIKE
+                if len(candidatos) <= MAX_PARAMETROS_IN:
+                    query = query.filter(Empreendedor.id.in_(candidatos))
+        
+        # Conferência final (e backend "like"): substring na coluna já normalizada
+        return query.filter(atributo.like(f"%{self._escapar_like(termo)}%", escape="\\"))
+    
+    def carregar_indice_busca(self) -> int:
+        """Montar o índice de trigramas a partir do banco (apenas com o backend "trigrama")"""
+        if self._backend_busca() != BUSCA_TRIGRAMA or self.indice_busca.carregado:
+            return 0
+        # Observador antes da carga: escritas concorrentes não se perdem (indexar de novo é inócuo)
+        self.adicionar_observador(self.indice_busca.observar)
+        session = self.get_session()
+        try:
+            linhas = session.execute(
+                select(Empreendedor.id, *(getattr(Empreendedor, coluna) for coluna in self.indice_busca.colunas))
+                .execution_options(yield_per=10000)
+            )
+            total = self.indice_busca.carregar(linhas)
+            logger.info(f"Índice de busca carregado: {total} empreendedores")
+            return total
+        finally:
+            session.close()
+    
+    def _filtrar_busca(self, query, filters: EmpreendedorSearchRequest):
+        """Aplicar os filtros da busca a uma query de Empreendedor"""
+        for campo in CAMPOS_BUSCA:
+            termo = getattr(filters, campo)
+            if termo:
+                query = self._filtrar_texto(query, CAMPOS_BUSCA[campo], termo)
+        
+        if filters.telefone:
+            digitos = digitos_telefone(filters.telefone)
+            if digitos:
+                # Números completos ou só os últimos dígitos: prefixo do reverso (índice)
+                query = query.filter(Empreendedor.telefone_digitos_reverso.like(f"{digitos[::-1]}%"))
+            else:
+                query = query.filter(Empreendedor.telefone.like(f"%{filters.telefone}%"))
+        
+        if filters.cpf:
+            query = query.filter(Empreendedor.cpf == filters.cpf)
+        
+        if filters.estado:
+            query = query.filter(Empreendedor.estado == filters.estado)
+        
+        if filters.comunidade_originadora:
+            query = query.filter(
+                Empreendedor.comunidade_originadora == filters.comunidade_originadora
+            )
+        
+        if filters.formulario_tipo:
+            query = query.filter(Empreendedor.formulario_tipo == filters.formulario_tipo)
+        
+        if filters.data_inscricao_inicio:
+            query = query.filter(Empreendedor.data_inscricao >= filters.data_inscricao_inicio)
+        
+        if filters.data_inscricao_fim:
+            query = query.filter(Empreendedor.data_inscricao <= filters.data_inscricao_fim)
+        
+        if filters.ativo_na_ludos is not None:
+            query = query.filter(Empreendedor.ativo_na_ludos == filters.ativo_na_ludos)
+        
+        if filters.fazendo_mentoria is not None:
+            query = query.filter(Empreendedor.fazendo_mentoria == filters.fazendo_mentoria)
+        
+        return query
+    
+    def _contar_busca(self, session: Session, query, modo: str, assinatura: str, sem_filtros: bool) -> Optional[int]:
+        """
+        Total da busca conforme o modo de contagem
+        
+        - exata: COUNT a cada chamada
+        - cache: COUNT reaproveitado por SEARCH_COUNT_CACHE_TTL_SECONDS para os mesmos filtros
+        - estimada: sem filtros, linhas da tabela pelo catálogo do SQL Server; senão, como "cache"
+        - nenhuma: não conta
+        """
+        if modo == CONTAGEM_NENHUMA:
+            return None
+        if modo == CONTAGEM_EXATA:
+            return query.count()
+        
+        if modo == CONTAGEM_ESTIMADA and sem_filtros and session.get_bind().dialect.name == "mssql":
+            return session.execute(
+                text(
+                    "SELECT SUM(row_count) FROM sys.dm_db_partition_stats "
+                    "WHERE object_id = OBJECT_ID(:tabela) AND index_id IN (0, 1)"
+                ),
+                {"tabela": Empreendedor.__tablename__}
+            ).scalar()
+        
+        agora = time.monotonic()
+        with self._lock_contagens:
+            em_cache = self._contagens.get(assinatura)
+            if em_cache and em_cache[0] > agora:
+                self._contagens.move_to_end(assinatura)
+                return em_cache[1]
+        
+        total = query.count()
+        with self._lock_contagens:
+            self._contagens[assinatura] = (agora + settings.SEARCH_COUNT_CACHE_TTL_SECONDS, total)
+            self._contagens.move_to_end(assinatura)
+            if len(self._contagens) > settings.SEARCH_COUNT_CACHE_SIZE:
+                self._contagens.popitem(last=False)
+        return total
+    
+    @leitura
     def search_empreendedores(
         self, 
-        filters: EmpreendedorSearchRequest
-    ) -> Tuple[List[Empreendedor], int]:
+        filters: EmpreendedorSearchRequest,
+        campos: Optional[Sequence[str]] = None
+    ) -> ResultadoBusca:
         """
         Buscar empreendedores com filtros
         
+        Ordem: ID decrescente (mais recentes primeiro). Com `cursor`, a página
+        começa depois do último ID da anterior (keyset, sem OFFSET); sem ele,
+        vale `page` (OFFSET, para clientes antigos). Em ambos os casos o
+        resultado traz o cursor da próxima página.
+        
+        Com `campos`, seleciona só essas colunas (mais o ID) e retorna linhas
+        leves (Row) em vez de entidades completas.
+        
+        Raises:
+            CursorInvalidoError: cursor malformado ou de outros filtros
+        
         Returns:
-            Tuple[List[Empreendedor], int]: (lista de empreendedores, total)
+            ResultadoBusca: (empreendedores, total ou None, próximo cursor ou None)
         """
+        filtros = filters.model_dump(exclude=CAMPOS_PAGINACAO, exclude_none=True)
+        assinatura = assinatura_filtros(filtros)
+        ultimo_id = decodificar_cursor(filters.cursor, assinatura) if filters.cursor else None
+        modo = filters.contagem or (CONTAGEM_NENHUMA if filters.cursor else CONTAGEM_EXATA)
+        
         session = self.get_session()
         try:
-            query = session.query(Empreendedor)
-            
-            # Aplicar filtros
-            if filters.nome:
-                query = query.filter(Empreendedor.nome.ilike(f"%{filters.nome}%"))
-            
-            if filters.telefone:
-                query = query.filter(Empreendedor.telefone.like(f"%{filters.telefone}%"))
-            
-            if filters.email:
-                query = query.filter(Empreendedor.email.ilike(f"%{filters.email}%"))
+            query = session.query(*self._colunas_projecao(campos)) if campos else session.query(Empreendedor)
+            query = self._filtrar_busca(query, filters)
+            total = self._contar_busca(session, query, modo, assinatura, not filtros)
             
-            if filters.cpf:
-                query = query.filter(Empreendedor.cpf == filters.cpf)
-            
-            if filters.cidade:
-                query = query.filter(Empreendedor.cidade.ilike(f"%{filters.cidade}%"))
-            
-            if filters.estado:
-                query = query.filter(Empreendedor.estado == filters.estado)
-            
-            if filters.comunidade_originadora:
-                query = query.filter(
-                    Empreendedor.comunidade_originadora == filters.comunidade_originadora
-                )
+            pagina = query.order_by(Empreendedor.id.desc())
+            if ultimo_id is not None:
+                pagina = pagina.filter(Empreendedor.id < ultimo_id)
+            else:
+                pagina = pagina.offset((filters.page - 1) * filters.page_size)
             
-            if filters.formulario_tipo:
-                query = query.filter(Empreendedor.formulario_tipo == filters.formulario_tipo)
+            # Uma linha a mais indica se existe próxima página
+            empreendedores = pagina.limit(filters.page_size + 1).all()
+            proximo_cursor = None
+            if len(empreendedores) > filters.page_size:
+                empreendedores = empreendedores[:filters.page_size]
+                proximo_cursor = codificar_cursor(empreendedores[-1].id, assinatura)
             
-            if filters.data_inscricao_inicio:
-                query = query.filter(Empreendedor.data_inscricao >= filters.data_inscricao_inicio)
+            return ResultadoBusca(empreendedores, total, proximo_cursor)
             
-            if filters.data_inscricao_fim:
-                query = query.filter(Empreendedor.data_inscricao <= filters.data_inscricao_fim)
+        finally:
+            session.close()
+    
+    def _valores_atualizacao(self, updates: EmpreendedorUpdateRequest) -> Dict[str, Any]:
+        """Colunas do SET a partir do patch (limites de tamanho e colunas derivadas de busca/telefone)"""
+        max_lengths = {
+            'nome': 100, 'telefone': 20, 'email': 100,
+            'apelido': 100, 'cidade': 100, 'estado': 50
+        }
+        valores: Dict[str, Any] = {}
+        for key, value in updates.model_dump(exclude_unset=True).items():
+            if key not in Empreendedor.__table__.c:
+                continue
+            # Aplicar safe_str em strings
+            if isinstance(value, str) and key in max_lengths:
+                value = self.safe_str(value, max_lengths[key])
             
-            if filters.ativo_na_ludos is not None:
-                query = query.filter(Empreendedor.ativo_na_ludos == filters.ativo_na_ludos)
+            valores[key] = value
+            if key in CAMPOS_BUSCA:
+                valores[CAMPOS_BUSCA[key]] = normalizar_busca(value, 100)
+            elif key == 'telefone':
+                valores.update(self._colunas_telefone(value))
+        return valores
+    
+    def _condicao_lote(self, ids: Optional[Sequence[int]], filtros: Optional[EmpreendedorSearchRequest]):
+        """WHERE de uma operação em lote: lista de IDs ou os filtros da busca (subconsulta de IDs)"""
+        if ids is not None:
+            return Empreendedor.id.in_(ids)
+        return Empreendedor.id.in_(self._filtrar_busca(select(Empreendedor.id), filtros))
+    
+    def _executar_escrita(self, session: Session, comando, condicao) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Executar UPDATE/DELETE em um comando e devolver (linhas afetadas, linhas como estavam antes)
+        
+        As linhas anteriores só são lidas com observadores registrados: no SQL
+        Server no próprio comando (OUTPUT deleted.*); nos demais dialetos, DELETE
+        com RETURNING e UPDATE precedido de um SELECT na mesma transação.
+        """
+        if not self._observadores:
+            return session.execute(comando).rowcount, []
+        
+        tabela = Empreendedor.__table__
+        dialeto = session.get_bind().dialect
+        if dialeto.name == "mssql":
+            quote = dialeto.identifier_preparer.quote
+            saida = [literal_column(f"deleted.{quote(coluna.name)}").label(coluna.name) for coluna in tabela.c]
+            antes = [dict(linha._mapping) for linha in session.execute(comando.returning(*saida))]
+        elif comando.is_delete and dialeto.delete_returning:
+            antes = [dict(linha._mapping) for linha in session.execute(comando.returning(*tabela.c))]
+        else:
+            antes = [
+                dict(linha._mapping)
+                for linha in session.execute(select(*tabela.c).where(condicao).with_for_update())
+            ]
+            session.execute(comando)
+        return len(antes), antes
+    
+    def _atualizar(self, condicao, updates: EmpreendedorUpdateRequest) -> Tuple[int, Optional[str]]:
+        """UPDATE ... WHERE condicao em um comando; retorna (linhas atualizadas, erro)"""
+        valores = self._valores_atualizacao(updates)
+        session = self.get_session()
+        try:
+            if not valores:
+                # Patch vazio: nada a gravar, só a contagem das linhas alcançadas
+                return session.scalar(select(func.count()).select_from(Empreendedor).where(condicao)), None
             
-            if filters.fazendo_mentoria is not None:
-                query = query.filter(Empreendedor.fazendo_mentoria == filters.fazendo_mentoria)
+            comando = update(Empreendedor.__table__).where(condicao).values(valores)
+            total, antes = self._executar_escrita(session, comando, condicao)
+            session.commit()
             
-            # Contar total
-            total = query.count()
+            # Valores do SET são literais: a linha nova é a anterior com o patch aplicado
+            for linha in antes:
+                self._notificar(EVENTO_ATUALIZADO, linha, {**linha, **valores})
+            return total, None
             
-            # Aplicar paginação
-            offset = (filters.page - 1) * filters.page_size
-            empreendedores = query.offset(offset).limit(filters.page_size).all()
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(f"Erro ao atualizar empreendedores: {e}")
+            return 0, str(e)
+        
+        finally:
+            session.close()
+    
+    def _remover(self, condicao) -> Tuple[int, Optional[str]]:
+        """DELETE ... WHERE condicao em um comando; retorna (linhas removidas, erro)"""
+        session = self.get_session()
+        try:
+            comando = delete(Empreendedor.__table__).where(condicao)
+            total, antes = self._executar_escrita(session, comando, condicao)
+            session.commit()
             
-            return empreendedores, total
+            for linha in antes:
+                self._notificar(EVENTO_REMOVIDO, linha, None)
+            return total, None
             
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(f"Erro ao deletar empreendedores: {e}")
+            return 0, str(e)
+        
         finally:
             session.close()
     
@@ -297,155 +1134,248 @@ class EmpreendedorRepository:
         updates: EmpreendedorUpdateRequest
     ) -> Tuple[bool, Optional[str]]:
         """
-        Atualizar empreendedor
+        Atualizar empreendedor (um UPDATE; a contagem de linhas indica se o ID existe)
         
         Returns:
             Tuple[bool, Optional[str]]: (sucesso, erro)
         """
-        session = self.get_session()
-        try:
-            empreendedor = session.query(Empreendedor).filter(
-                Empreendedor.id == empreendedor_id
-            ).first()
-            
-            if not empreendedor:
-                return False, "Empreendedor não encontrado"
-            
-            # Atualizar campos
-            update_data = updates.dict(exclude_unset=True)
-            for key, value in update_data.items():
-                if hasattr(empreendedor, key):
-                    # Aplicar safe_str em strings
-                    if isinstance(value, str) and key in [
-                        'nome', 'telefone', 'email', 'apelido', 'cidade', 'estado'
-                    ]:
-                        max_lengths = {
-                            'nome': 100, 'telefone': 20, 'email': 100,
-                            'apelido': 100, 'cidade': 100, 'estado': 50
-                        }
-                        value = self.safe_str(value, max_lengths.get(key, 100))
-                    
-                    setattr(empreendedor, key, value)
-            
-            session.commit()
-            logger.info(f"Empreendedor atualizado: ID={empreendedor_id}")
-            return True, None
-            
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"Erro ao atualizar empreendedor: {e}")
-            return False, str(e)
+        total, erro = self._atualizar(Empreendedor.id == empreendedor_id, updates)
+        if erro:
+            return False, erro
+        if not total:
+            return False, "Empreendedor não encontrado"
         
-        finally:
-            session.close()
+        logger.info(f"Empreendedor atualizado: ID={empreendedor_id}")
+        return True, None
     
     def delete_empreendedor(self, empreendedor_id: int) -> Tuple[bool, Optional[str]]:
         """
-        Deletar empreendedor
+        Deletar empreendedor (um DELETE; a contagem de linhas indica se o ID existe)
         
         Returns:
             Tuple[bool, Optional[str]]: (sucesso, erro)
         """
-        session = self.get_session()
-        try:
-            empreendedor = session.query(Empreendedor).filter(
-                Empreendedor.id == empreendedor_id
-            ).first()
-            
-            if not empreendedor:
-                return False, "Empreendedor não encontrado"
-            
-            session.delete(empreendedor)
-            session.commit()
-            
-            logger.info(f"Empreendedor deletado: ID={empreendedor_id}")
-            return True, None
-            
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"Erro ao deletar empreendedor: {e}")
-            return False, str(e)
+        total, erro = self._remover(Empreendedor.id == empreendedor_id)
+        if erro:
+            return False, erro
+        if not total:
+            return False, "Empreendedor não encontrado"
         
-        finally:
-            session.close()
+        logger.info(f"Empreendedor deletado: ID={empreendedor_id}")
+        return True, None
     
-    def get_stats(self) -> Dict[str, Any]:
-        """Obter estatísticas gerais dos empreendedores"""
+    def update_empreendedores(
+        self,
+        updates: EmpreendedorUpdateRequest,
+        ids: Optional[Sequence[int]] = None,
+        filtros: Optional[EmpreendedorSearchRequest] = None
+    ) -> Tuple[bool, int, Optional[str]]:
+        """
+        Aplicar o mesmo patch a uma lista de IDs ou aos empreendedores que atendem aos filtros, em um UPDATE
+        
+        Returns:
+            Tuple[bool, int, Optional[str]]: (sucesso, linhas atualizadas, erro)
+        """
+        total, erro = self._atualizar(self._condicao_lote(ids, filtros), updates)
+        if erro:
+            return False, 0, erro
+        
+        logger.info(f"Empreendedores atualizados em lote: {total}")
+        return True, total, None
+    
+    def delete_empreendedores(
+        self,
+        ids: Optional[Sequence[int]] = None,
+        filtros: Optional[EmpreendedorSearchRequest] = None
+    ) -> Tuple[bool, int, Optional[str]]:
+        """
+        Deletar uma lista de IDs ou os empreendedores que atendem aos filtros, em um DELETE
+        
+        Returns:
+            Tuple[bool, int, Optional[str]]: (sucesso, linhas removidas, erro)
+        """
+        total, erro = self._remover(self._condicao_lote(ids, filtros))
+        if erro:
+            return False, 0, erro
+        
+        logger.info(f"Empreendedores deletados em lote: {total}")
+        return True, total, None
+    
+    def ping(self) -> None:
+        """Verificar conexão com o banco (SELECT 1); levanta exceção se indisponível"""
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    
+    @leitura
+    def get_contadores(self) -> Dict[str, Any]:
+        """
+        Contadores brutos das estatísticas: totais, soma e contagem de cada NPS
+        e as três distribuições
+        
+        Duas idas ao banco: totais e somas em uma varredura (agregação
+        condicional) e as três distribuições em um único UNION ALL.
+        """
         session = self.get_session()
         try:
-            stats = {
-                'total_empreendedores': session.query(func.count(Empreendedor.id)).scalar(),
-                'total_ativos_ludos': session.query(func.count(Empreendedor.id)).filter(
-                    Empreendedor.ativo_na_ludos == True
-                ).scalar(),
-                'total_em_mentoria': session.query(func.count(Empreendedor.id)).filter(
-                    Empreendedor.fazendo_mentoria == True
-                ).scalar(),
-                'media_nps_geral': session.query(func.avg(Empreendedor.nps_geral)).filter(
-                    Empreendedor.nps_geral.isnot(None)
-                ).scalar(),
-                'media_nps_mentoria': session.query(func.avg(Empreendedor.nps_mentoria)).filter(
-                    Empreendedor.nps_mentoria.isnot(None)
-                ).scalar(),
-                'media_nps_ludos': session.query(func.avg(Empreendedor.nps_ludos)).filter(
-                    Empreendedor.nps_ludos.isnot(None)
-                ).scalar(),
+            totais = session.execute(
+                select(
+                    func.count(Empreendedor.id),
+                    func.coalesce(func.sum(case((Empreendedor.ativo_na_ludos == True, 1), else_=0)), 0),
+                    func.coalesce(func.sum(case((Empreendedor.fazendo_mentoria == True, 1), else_=0)), 0),
+                    *(
+                        agregado
+                        for campo in CAMPOS_NPS
+                        for agregado in (
+                            func.sum(getattr(Empreendedor, campo)),
+                            func.count(getattr(Empreendedor, campo))
+                        )
+                    )
+                )
+            ).one()
+            contadores: Dict[str, Any] = {
+                'total_empreendedores': totais[0],
+                'total_ativos_ludos': totais[1],
+                'total_em_mentoria': totais[2],
             }
+            for posicao, campo in enumerate(CAMPOS_NPS):
+                contadores[f'soma_{campo}'] = totais[3 + 2 * posicao] or 0
+                contadores[f'contagem_{campo}'] = totais[4 + 2 * posicao]
             
-            # Total por comunidade
-            stats['total_por_comunidade'] = dict(
-                session.query(
-                    Empreendedor.comunidade_originadora,
-                    func.count(Empreendedor.id)
-                ).filter(
-                    Empreendedor.comunidade_originadora.isnot(None)
-                ).group_by(Empreendedor.comunidade_originadora).all()
-            )
-            
-            # Total por estado
-            stats['total_por_estado'] = dict(
-                session.query(
-                    Empreendedor.estado,
-                    func.count(Empreendedor.id)
-                ).filter(
-                    Empreendedor.estado.isnot(None)
-                ).group_by(Empreendedor.estado).all()
-            )
-            
-            # Total por segmento
-            stats['total_por_segmento'] = dict(
-                session.query(
-                    Empreendedor.segmento_atuacao,
-                    func.count(Empreendedor.id)
-                ).filter(
-                    Empreendedor.segmento_atuacao.isnot(None)
-                ).group_by(Empreendedor.segmento_atuacao).all()
-            )
+            # Totais por comunidade, estado e segmento (a primeira coluna indica a distribuição)
+            for chave, _ in DISTRIBUICOES:
+                contadores[chave] = {}
+            consulta = union_all(*(
+                select(
+                    literal_column(f"'{chave}'").label('chave'),
+                    getattr(Empreendedor, campo).label('valor'),
+                    func.count(Empreendedor.id).label('total')
+                )
+                .where(getattr(Empreendedor, campo).isnot(None))
+                .group_by(getattr(Empreendedor, campo))
+                for chave, campo in DISTRIBUICOES
+            ))
+            for chave, valor, total in session.execute(consulta):
+                contadores[chave][valor] = total
             
-            return stats
+            return contadores
             
         finally:
             session.close()
     
+    def get_stats(self) -> Dict[str, Any]:
+        """Obter estatísticas gerais dos empreendedores (direto do banco, ver get_contadores)"""
+        return montar_estatisticas(self.get_contadores())
+    
+    def _inserir_bloco(self, session: Session, registros: List[Dict[str, Any]]) -> List[int]:
+        """
+        INSERT multi-linha com RETURNING id, telefone; IDs na ordem dos registros
+        
+        O telefone final é único no lote (alocado por _preparar_lote), então
+        pareia cada ID com seu registro sem exigir RETURNING ordenado, que em
+        alguns dialetos (ex.: SQLite) volta a um INSERT por linha.
+        """
+        # Tabela (Core) em vez da entidade: dispensa a preparação do bulk insert do ORM
+        tabela = Empreendedor.__table__
+        linhas = session.execute(
+            insert(tabela).returning(tabela.c.id, tabela.c.telefone),
+            registros
+        ).all()
+        por_telefone = {telefone: empreendedor_id for empreendedor_id, telefone in linhas}
+        return [por_telefone[registro['telefone']] for registro in registros]
+    
     def bulk_create(
-        self, 
-        empreendedores_data: List[EmpreendedorCreateRequest]
-    ) -> Tuple[int, int, List[str]]:
+        self,
+        empreendedores_data: List[EmpreendedorCreateRequest],
+        tamanho_bloco: Optional[int] = None
+    ) -> List[Tuple[bool, Optional[int], Optional[str]]]:
         """
-        Criar múltiplos empreendedores em lote
+        Criar múltiplos empreendedores em lote (importação em massa)
+        
+        Duplicidade, reenvios e sufixos de telefone de todas as linhas são
+        resolvidos uma vez, em memória, contra os conjuntos carregados por
+        _preparar_lote. As linhas válidas são gravadas em blocos de
+        `tamanho_bloco` linhas (BULK_CHUNK_SIZE), cada um em um SAVEPOINT da
+        mesma transação; o SQLAlchemy divide cada bloco em INSERTs multi-linha
+        dentro do limite de parâmetros do dialeto. Se um bloco falhar, suas
+        linhas são regravadas uma a uma para isolar o erro.
         
         Returns:
-            Tuple[int, int, List[str]]: (total_sucesso, total_erro, lista_de_erros)
+            Lista de (sucesso, id, erro), na mesma ordem da entrada
         """
-        sucesso = 0
-        erros = []
+        resultados: List[Tuple[bool, Optional[int], Optional[str]]] = [
+            (False, None, None)
+        ] * len(empreendedores_data)
+        if not empreendedores_data:
+            return resultados
+        tamanho_bloco = tamanho_bloco or settings.BULK_CHUNK_SIZE
         
-        for idx, data in enumerate(empreendedores_data):
-            success, _, error = self.create_empreendedor(data)
-            if success:
-                sucesso += 1
-            else:
-                erros.append(f"Registro {idx + 1}: {error}")
+        session = self.get_session()
+        try:
+            registros: List[Dict[str, Any]] = []
+            indices: List[int] = []
+            reenvios: List[int] = []
+            gravados: List[Tuple[int, Dict[str, Any]]] = []
+            
+            with self._travar_telefones(session, [data.telefone for data in empreendedores_data]):
+                for idx, linha in enumerate(self._preparar_lote(session, empreendedores_data)):
+                    if linha.registro is None:
+                        existente = linha.existente.id if linha.existente is not None else None
+                        resultados[idx] = (False, existente, linha.erro)
+                        if linha.erro == ERRO_SUBMISSAO_REPETIDA and linha.existente is None:
+                            reenvios.append(idx)
+                        continue
+                    registros.append(linha.registro)
+                    indices.append(idx)
+                
+                for inicio in range(0, len(registros), tamanho_bloco):
+                    bloco = registros[inicio:inicio + tamanho_bloco]
+                    bloco_indices = indices[inicio:inicio + tamanho_bloco]
+                    try:
+                        with session.begin_nested():
+                            ids = self._inserir_bloco(session, bloco)
+                    except SQLAlchemyError as e:
+                        logger.warning(f"Bloco da importação falhou, regravando linha a linha: {e}")
+                        ids = []
+                        for idx, registro in zip(bloco_indices, bloco):
+                            try:
+                                with session.begin_nested():
+                                    ids.extend(self._inserir_bloco(session, [registro]))
+                            except IntegrityError as erro:
+                                logger.error(f"Erro de integridade na linha {idx + 1} da importação: {erro}")
+                                ids.append(None)
+                                resultados[idx] = (False, None, "Dados duplicados ou inválidos")
+                            except SQLAlchemyError as erro:
+                                ids.append(None)
+                                resultados[idx] = (False, None, str(erro))
+                    
+                    for idx, registro, empreendedor_id in zip(bloco_indices, bloco, ids):
+                        if empreendedor_id is not None:
+                            resultados[idx] = (True, empreendedor_id, None)
+                            gravados.append((empreendedor_id, registro))
+                session.commit()
+        
+        except SQLAlchemyError as e:
+            session.rollback()
+            logger.error(f"Erro na importação em lote: {e}")
+            return [(False, None, str(e))] * len(empreendedores_data)
+        
+        finally:
+            session.close()
+        
+        if self._observadores:
+            colunas = dict.fromkeys(attr.key for attr in Empreendedor.__mapper__.column_attrs)
+            for empreendedor_id, registro in gravados:
+                self._notificar(EVENTO_CRIADO, None, {**colunas, **registro, 'id': empreendedor_id})
+        
+        # Reenvios dentro do próprio lote apontam para a linha gravada agora
+        por_submissao = {
+            registro['submission_id']: empreendedor_id
+            for empreendedor_id, registro in gravados if registro['submission_id']
+        }
+        for idx in reenvios:
+            original = por_submissao.get(empreendedores_data[idx].submission_id)
+            resultados[idx] = (False, original, ERRO_SUBMISSAO_REPETIDA)
         
-        return sucesso, len(erros), erros
+        logger.info(f"Importação em lote: {len(gravados)} de {len(empreendedores_data)} empreendedores gravados")
+        return resultados
 
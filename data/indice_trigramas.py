@@ -0,0 +1,100 @@
+"""
+Índice invertido de trigramas em memória
+Busca por substring sem varrer a tabela quando o banco não tem full-text (ex.: SQLite de testes)
+"""
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Sequence, Set, Tuple
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+TAMANHO_GRAMA = 3
+
+
+def trigramas(texto: str) -> Set[str]:
+    """Trigramas de um texto já normalizado"""
+    return {texto[i:i + TAMANHO_GRAMA] for i in range(len(texto) - TAMANHO_GRAMA + 1)}
+
+
+class IndiceTrigramas:
+    """
+    Trigrama -> IDs, por coluna
+
+    Os candidatos de um termo são a interseção das listas dos seus
+    trigramas; a consulta ainda confere o LIKE nas linhas candidatas, então
+    falsos positivos do índice nunca chegam ao resultado. Mantido pelos
+    eventos do repositório (escritas deste processo).
+    """
+
+    def __init__(self, colunas: Sequence[str]):
+        self.colunas = tuple(colunas)
+        self._listas: Dict[str, Dict[str, Set[int]]] = {coluna: defaultdict(set) for coluna in self.colunas}
+        self._lock = threading.Lock()
+        self.carregado = False
+        self.linhas = 0
+
+    def _indexar(self, empreendedor_id: int, valores: Dict[str, Any], adicionar: bool) -> None:
+        for coluna in self.colunas:
+            texto = valores.get(coluna)
+            if not texto:
+                continue
+            listas = self._listas[coluna]
+            for grama in trigramas(texto):
+                if adicionar:
+                    listas[grama].add(empreendedor_id)
+                else:
+                    ids = listas.get(grama)
+                    if ids is not None:
+                        ids.discard(empreendedor_id)
+                        if not ids:
+                            del listas[grama]
+
+    def carregar(self, linhas: Iterable[Tuple[Any, ...]]) -> int:
+        """Indexar linhas (id, *colunas) e marcar o índice como pronto para uso"""
+        total = 0
+        with self._lock:
+            for linha in linhas:
+                self._indexar(linha[0], dict(zip(self.colunas, linha[1:])), True)
+                total += 1
+            self.linhas += total
+            self.carregado = True
+        return total
+
+    def observar(self, evento: str, antes: Optional[Dict[str, Any]], depois: Optional[Dict[str, Any]]) -> None:
+        """Observador do repositório: remove os valores antigos e indexa os novos"""
+        with self._lock:
+            if antes is not None:
+                self._indexar(antes["id"], antes, False)
+                self.linhas -= 1
+            if depois is not None:
+                self._indexar(depois["id"], depois, True)
+                self.linhas += 1
+
+    def candidatos(self, coluna: str, termo: str) -> Optional[Set[int]]:
+        """
+        IDs que contêm todos os trigramas do termo normalizado
+
+        Returns:
+            None se o termo for curto demais para o índice (a busca usa só o LIKE)
+        """
+        gramas = trigramas(termo)
+        if not gramas:
+            return None
+        with self._lock:
+            listas = self._listas[coluna]
+            conjuntos = sorted((listas.get(grama, set()) for grama in gramas), key=len)
+            resultado = set(conjuntos[0])
+            for conjunto in conjuntos[1:]:
+                if not resultado:
+                    break
+                resultado &= conjunto
+            return resultado
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "carregado": self.carregado,
+                "linhas": self.linhas,
+                "trigramas": {coluna: len(self._listas[coluna]) for coluna in self.colunas},
+            }
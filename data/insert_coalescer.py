@@ -0,0 +1,84 @@
+"""
+Coalescedor de inserts de empreendedores (group commit)
+Agrupa cadastros concorrentes em uma única transação no banco
+"""
+from typing import List, Optional, Tuple
+import asyncio
+import logging
+
+from core.config import settings
+from data.async_empreendedor_repository import AsyncEmpreendedorRepository
+from models.impulso_models import Empreendedor
+from dto.webhook_dtos import EmpreendedorCreateRequest
+
+logger = logging.getLogger(__name__)
+
+ResultadoInsert = Tuple[bool, Optional[Empreendedor], Optional[str]]
+
+
+class InsertCoalescer:
+    """
+    Junta EmpreendedorCreateRequest pendentes durante uma janela curta
+
+    O lote é gravado quando a janela (INSERT_COALESCER_WINDOW_MS) expira ou
+    quando atinge INSERT_COALESCER_MAX_ROWS linhas. Cada chamador recebe o
+    próprio resultado (sucesso, empreendedor com ID gerado, erro da linha).
+    """
+
+    def __init__(
+        self,
+        repo: AsyncEmpreendedorRepository,
+        janela_ms: Optional[float] = None,
+        max_linhas: Optional[int] = None
+    ):
+        self.repo = repo
+        self.janela = (janela_ms if janela_ms is not None else settings.INSERT_COALESCER_WINDOW_MS) / 1000
+        self.max_linhas = max_linhas or settings.INSERT_COALESCER_MAX_ROWS
+        self._pendentes: List[Tuple[EmpreendedorCreateRequest, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tarefas: set = set()
+
+    async def create_empreendedor(self, data: EmpreendedorCreateRequest) -> ResultadoInsert:
+        """Enfileirar cadastro no próximo lote e aguardar seu resultado"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pendentes.append((data, future))
+
+        if len(self._pendentes) >= self.max_linhas:
+            self._disparar()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.janela, self._disparar)
+
+        return await future
+
+    def _disparar(self) -> None:
+        """Fechar o lote atual e iniciar sua gravação"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        lote, self._pendentes = self._pendentes, []
+        if not lote:
+            return
+
+        tarefa = asyncio.create_task(self._gravar(lote))
+        self._tarefas.add(tarefa)
+        tarefa.add_done_callback(self._tarefas.discard)
+
+    async def _gravar(self, lote: List[Tuple[EmpreendedorCreateRequest, asyncio.Future]]) -> None:
+        """Gravar lote em uma transação e entregar o resultado de cada linha"""
+        try:
+            resultados = await self.repo.create_empreendedores_batch([data for data, _ in lote])
+        except Exception as e:
+            logger.error(f"Erro ao gravar lote de {len(lote)} empreendedores: {e}")
+            resultados = [(False, None, str(e))] * len(lote)
+
+        for (_, future), resultado in zip(lote, resultados):
+            if not future.done():
+                future.set_result(resultado)
+
+    async def flush(self) -> None:
+        """Gravar imediatamente o lote pendente e aguardar gravações em andamento"""
+        self._disparar()
+        if self._tarefas:
+            await asyncio.gather(*self._tarefas, return_exceptions=True)
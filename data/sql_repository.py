@@ -5,12 +5,14 @@ Camada de acesso a dados para SQL Server
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime
-from sqlalchemy import create_engine, text, and_, or_, desc, asc
+from sqlalchemy import text, and_, or_, desc, asc
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 
 from app.core.config import settings
+from app.core.database import get_engine
 from app.models.domain import (
     User, Resume, Company, JobDescription, CompatibilityAnalysis,
     CoverLetter, Skill, UserSkill, Notification, UserSession, DataLakeFile
@@ -22,15 +24,9 @@ logger = logging.getLogger(__name__)
 class SQLRepository:
     """Repositório base para SQL Server"""
     
-    def __init__(self):
-        self.engine = create_engine(
-            settings.sql_connection_string,
-            pool_size=10,
-            max_overflow=20,
-            pool_timeout=30,
-            pool_recycle=3600,
-            echo=settings.DEBUG
-        )
+    def __init__(self, engine: Optional[Engine] = None):
+        # Engine compartilhada do processo (nunca um pool próprio por repositório)
+        self.engine = engine or get_engine()
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
     
     def get_session(self) -> Session:
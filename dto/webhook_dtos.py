@@ -3,8 +3,8 @@ DTOs para Webhook do Jotform
 Data Transfer Objects para receber e processar dados do formulário
 """
 from datetime import datetime
-from typing import Optional, List, Dict, Any, Union
-from pydantic import BaseModel, Field, EmailStr, field_validator
+from typing import Optional, List, Dict, Any, Union, Literal
+from pydantic import BaseModel, Field, EmailStr, field_validator, model_validator
 
 
 # ===== JOTFORM REQUEST DTOs =====
@@ -156,6 +156,9 @@ class EmpreendedorCreateRequest(BaseModel):
     nps_geral: Optional[int] = Field(None, ge=0, le=10)
     nps_mentoria: Optional[int] = Field(None, ge=0, le=10)
     nps_ludos: Optional[int] = Field(None, ge=0, le=10)
+    
+    # Idempotência (submissionID do Jotform)
+    submission_id: Optional[str] = Field(None, max_length=64)
 
 
 # ===== RESPONSE DTOs =====
@@ -213,6 +216,11 @@ class EmpreendedorSearchRequest(BaseModel):
     fazendo_mentoria: Optional[bool] = None
     page: int = Field(default=1, ge=1)
     page_size: int = Field(default=20, ge=1, le=100)
+    # Paginação por cursor: next_cursor da resposta anterior (ignora page)
+    cursor: Optional[str] = Field(None, max_length=200)
+    # Total: "exata", "cache", "estimada" ou "nenhuma"
+    # (padrão: "exata" por página, "nenhuma" com cursor)
+    contagem: Optional[Literal["exata", "cache", "estimada", "nenhuma"]] = None
 
 
 class EmpreendedorUpdateRequest(BaseModel):
@@ -238,6 +246,35 @@ class EmpreendedorUpdateRequest(BaseModel):
     nps_ludos: Optional[int] = Field(None, ge=0, le=10)
 
 
+class EmpreendedorLoteRequest(BaseModel):
+    """DTO para remoção em lote: lista de IDs ou filtros da busca (um dos dois)"""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=1000)
+    filtros: Optional[EmpreendedorSearchRequest] = None
+    
+    @model_validator(mode='after')
+    def validar_alvo(self):
+        """Exigir exatamente um alvo; filtros vazios alcançariam a tabela inteira"""
+        if (self.ids is None) == (self.filtros is None):
+            raise ValueError("Informe ids ou filtros (apenas um)")
+        paginacao = {'page', 'page_size', 'cursor', 'contagem'}
+        if self.filtros is not None and not self.filtros.model_dump(exclude=paginacao, exclude_none=True):
+            raise ValueError("Filtros sem nenhum critério")
+        return self
+
+
+class EmpreendedorUpdateLoteRequest(EmpreendedorLoteRequest):
+    """DTO para atualização em lote: o mesmo patch aplicado a todos os alvos"""
+    updates: EmpreendedorUpdateRequest
+    
+    @field_validator('updates')
+    @classmethod
+    def validar_updates(cls, v):
+        """Telefone é único por cadastro: não pode ser o mesmo em várias linhas"""
+        if 'telefone' in v.model_fields_set:
+            raise ValueError("Telefone não pode ser alterado em lote")
+        return v
+
+
 class EmpreendedorStatsResponse(BaseModel):
     """DTO para estatísticas de empreendedores"""
     total_empreendedores: int
@@ -4,21 +4,22 @@ API para receber e processar dados de empreendedores do Jotform
 """
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import logging
 import time
 from datetime import datetime
 
 from core.config import settings
+from core.database import engines, ler_da_primaria
+from core.json_codec import FastJSONResponse
+from core.logging_config import configurar_logging, parar_logging, iniciar_etapas
 from api import webhook
+from services.submission_filter import submission_filter
 
-# Configurar logging
-logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL),
-    format=settings.LOG_FORMAT
-)
+# Configurar logging (handler em fila: I/O de log fora do event loop)
+configurar_logging()
 logger = logging.getLogger(__name__)
+request_logger = logging.getLogger("api.requests")
 
 
 @asynccontextmanager
@@ -38,11 +39,51 @@ async def lifespan(app: FastAPI):
     logger.info("📡 Endpoint: POST /api/v1/webhook/jotform")
     logger.info("="*80)
     
+    # Pool de conexões único do processo, compartilhado por todos os repositórios
+    engines.iniciar()
+    
+    # Aquecer filtro de idempotência com as submissões mais recentes
+    try:
+        carregadas = submission_filter.carregar(
+            await webhook.repo.listar_submissoes_recentes(settings.IDEMPOTENCY_WARMUP_ROWS)
+        )
+        logger.info(f"🔁 Filtro de idempotência aquecido com {carregadas} submissões")
+    except Exception as e:
+        logger.warning(f"⚠️ Não foi possível aquecer o filtro de idempotência: {e}")
+    
+    # Índice de trigramas da busca textual (só quando o banco não tem full-text)
+    try:
+        indexados = await webhook.repo.carregar_indice_busca()
+        if indexados:
+            logger.info(f"🔎 Índice de busca carregado com {indexados} empreendedores")
+    except Exception as e:
+        logger.warning(f"⚠️ Não foi possível carregar o índice de busca: {e}")
+    
+    # Contadores de estatísticas: carga inicial e reconciliação periódica com o banco
+    webhook.estatisticas.iniciar()
+    
+    # Cache de consulta por ID: assinatura das invalidações entre instâncias (com Redis)
+    if webhook.cache_empreendedores is not None:
+        await webhook.cache_empreendedores.iniciar()
+    
+    # Worker que drena o spool de ingestão (registros pendentes sobrevivem a reinícios)
+    webhook.spool_worker.iniciar()
+    
     yield
     
     # Shutdown
     logger.info("="*80)
     logger.info("🔄 Encerrando Dashboard Impulso Stone API...")
+    await webhook.spool_worker.parar()
+    await webhook.estatisticas.parar()
+    if webhook.cache_empreendedores is not None:
+        await webhook.cache_empreendedores.parar()
+    await webhook.coalescer.flush()
+    await webhook.bulk_service.aguardar_encaminhamentos()
+    webhook.spool.fechar()
+    webhook.repo.shutdown()
+    engines.fechar()
+    parar_logging()
     logger.info("✅ API encerrada com sucesso!")
     logger.info("="*80)
 
@@ -54,6 +95,7 @@ app = FastAPI(
     description="API para receber e processar dados de empreendedores do formulário Jotform",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=FastJSONResponse,
     lifespan=lifespan
 )
 
@@ -66,27 +108,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Read-your-writes: quem acabou de gravar pode pedir que as consultas ignorem a réplica
+@app.middleware("http")
+async def consistencia_leitura(request: Request, call_next):
+    """Com o header X-Read-Your-Writes: true, as leituras da requisição vão ao banco primário"""
+    if request.headers.get("X-Read-Your-Writes", "").lower() in ("1", "true"):
+        with ler_da_primaria():
+            return await call_next(request)
+    return await call_next(request)
+
 # Middleware de logging de requisições
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log de todas as requisições"""
-    start_time = time.time()
-    
-    # Log da requisição
-    logger.info(f"Request: {request.method} {request.url}")
+    """Log de todas as requisições (uma linha por requisição, com tempos por etapa)"""
+    start_time = time.perf_counter()
+    etapas = iniciar_etapas()
     
     try:
         response = await call_next(request)
         
         # Calcular tempo de processamento
-        process_time = time.time() - start_time
+        process_time = time.perf_counter() - start_time
         
         # Log da resposta
-        logger.info(
-            f"Response: {response.status_code} - "
-            f"Time: {process_time:.3f}s - "
-            f"Path: {request.url.path}"
-        )
+        if settings.LOG_STRUCTURED:
+            request_logger.info(
+                "request",
+                extra={"requisicao": {
+                    "method": request.method,
+                    "path": request.url.path,
+                    "status": response.status_code,
+                    "duration_ms": round(process_time * 1000, 3),
+                    "etapas_ms": etapas,
+                }}
+            )
+        else:
+            request_logger.info(
+                "%s %s - %s - Time: %.3fs - Etapas: %s",
+                request.method, request.url.path, response.status_code, process_time, etapas
+            )
         
         # Adicionar header de tempo de processamento
         response.headers["X-Process-Time"] = str(process_time)
@@ -94,7 +154,7 @@ async def log_requests(request: Request, call_next):
         return response
         
     except Exception as e:
-        process_time = time.time() - start_time
+        process_time = time.perf_counter() - start_time
         logger.error(f"Request failed: {request.method} {request.url} - Error: {e} - Time: {process_time:.3f}s")
         raise
 
@@ -103,7 +163,7 @@ async def log_requests(request: Request, call_next):
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handler para exceções HTTP"""
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
@@ -119,7 +179,7 @@ async def general_exception_handler(request: Request, exc: Exception):
     """Handler para exceções gerais"""
     logger.error(f"Erro não tratado: {exc}", exc_info=True)
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -145,41 +205,44 @@ async def root():
         "description": "API de Webhook para processar dados de empreendedores do Jotform",
         "docs": "/docs",
         "health": "/health",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow()
     }
 
 
+@app.get("/health/live")
+async def liveness():
+    """Liveness probe - o processo responde (nenhum I/O)"""
+    return webhook.health.vivo()
+
+
+@app.get("/health/ready")
+async def readiness():
+    """
+    Readiness probe - ping ao banco em cache (HEALTH_PING_TTL_SECONDS) e ocupação do pool
+    
+    Retorna 503 enquanto o banco estiver inacessível.
+    """
+    pronto = await webhook.health.pronto()
+    if pronto["status"] != "ready":
+        return FastJSONResponse(status_code=503, content=pronto)
+    return pronto
+
+
 @app.get("/health")
 async def health_check():
-    """Health check da aplicação"""
-    try:
-        # Testar conexão com banco
-        from data.empreendedor_repository import EmpreendedorRepository
-        repo = EmpreendedorRepository()
-        stats = repo.get_stats()
-        
-        return {
-            "status": "healthy",
-            "api": "Dashboard Impulso Stone",
-            "version": "1.0.0",
-            "database": "connected",
-            "total_empreendedores": stats['total_empreendedores'],
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        
-    except Exception as e:
-        logger.error(f"Health check falhou: {e}")
-        return JSONResponse(
-            status_code=503,
-            content={
-                "status": "unhealthy",
-                "api": "Dashboard Impulso Stone",
-                "version": "1.0.0",
-                "database": "disconnected",
-                "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        )
+    """Health check da aplicação (mesmo ping em cache do readiness; estatísticas em /api/v1/webhook/empreendedores/stats)"""
+    pronto = await webhook.health.pronto()
+    conteudo = {
+        "status": "healthy" if pronto["status"] == "ready" else "unhealthy",
+        "api": "Dashboard Impulso Stone",
+        "version": "1.0.0",
+        "database": pronto["database"],
+        "timestamp": datetime.utcnow()
+    }
+    if pronto["status"] != "ready":
+        conteudo["error"] = pronto.get("error")
+        return FastJSONResponse(status_code=503, content=conteudo)
+    return conteudo
 
 
 if __name__ == "__main__":
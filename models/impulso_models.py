@@ -2,7 +2,7 @@
 Modelos SQLAlchemy para Dashboard Impulso Stone
 Tabelas: empreendedores, mentores, status_mentoria, creditos, nps_scores, ludos_atividades
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey, Index, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -74,12 +74,39 @@ class Empreendedor(Base):
     nps_mentoria = Column(Integer)  # 0-10
     nps_ludos = Column(Integer)  # 0-10
     
+    # Idempotência: submissionID do Jotform (reenvios retornam o cadastro original)
+    submission_id = Column(String(64))
+    
+    # Busca: nome, cidade e email normalizados (minúsculas, sem acentos), preenchidos na gravação
+    nome_busca = Column(String(100))
+    cidade_busca = Column(String(100))
+    email_busca = Column(String(100))
+    
+    # Telefone só com dígitos (sem sufixo _N) e invertido, para busca pelos últimos N dígitos
+    telefone_digitos = Column(String(20))
+    telefone_digitos_reverso = Column(String(20))
+    
     # Relacionamentos
     status_mentorias = relationship("StatusMentoria", back_populates="empreendedor")
     creditos = relationship("Credito", back_populates="empreendedor")
     nps_scores = relationship("NPSScore", back_populates="empreendedor")
     ludos_atividades = relationship("LudosAtividade", back_populates="empreendedor")
     
+    __table_args__ = (
+        # Busca de telefone exato e das variantes com sufixo (LIKE 'base\_%')
+        Index("ix_empreendedores_telefone", "telefone"),
+        # Telefone em qualquer formato (igualdade) e pelos últimos dígitos (prefixo do reverso)
+        Index("ix_empreendedores_telefone_digitos", "telefone_digitos"),
+        Index("ix_empreendedores_telefone_digitos_reverso", "telefone_digitos_reverso"),
+        # Único apenas quando preenchido (cadastros antigos/manuais ficam com NULL)
+        Index(
+            "ix_empreendedores_submission_id", "submission_id", unique=True,
+            mssql_where=text("submission_id IS NOT NULL"),
+            sqlite_where=text("submission_id IS NOT NULL"),
+            postgresql_where=text("submission_id IS NOT NULL"),
+        ),
+    )
+    
     def __repr__(self):
         return f"<Empreendedor(id={self.id}, nome='{self.nome}', telefone='{self.telefone}')>"
 
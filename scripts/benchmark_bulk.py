@@ -0,0 +1,89 @@
+"""
+Benchmark da importação em massa (EmpreendedorRepository.bulk_create)
+Compara linhas/s do laço anterior (create_empreendedor por linha) com a gravação
+em blocos atual, em um banco SQLite de teste recriado a cada execução
+
+Uso:
+    python scripts/benchmark_bulk.py [--linhas 50000] [--linhas-anterior 2000] [--banco /tmp/benchmark_bulk.db]
+"""
+import sys
+import os
+import argparse
+import random
+import time
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, event
+
+from data.empreendedor_repository import EmpreendedorRepository
+from dto.webhook_dtos import EmpreendedorCreateRequest
+from models.impulso_models import Base
+
+ESTADOS = ["SP", "RJ", "MG", "BA", "PE", "RS", "PR", "CE", "PA", "AM"]
+
+
+def gerar(linhas: int, deslocamento: int) -> list:
+    """Cadastros sintéticos; 1 em cada 50 repete o telefone de outro (exercita os sufixos)"""
+    aleatorio = random.Random(deslocamento)
+    return [
+        EmpreendedorCreateRequest(
+            nome=f"Empreendedor {i}",
+            telefone=f"(11) 9{(i - i % 50 if i % 50 == 1 else i):08d}",
+            email=f"empreendedor{i}@exemplo.com",
+            cidade="São Paulo",
+            estado=aleatorio.choice(ESTADOS),
+            nps_geral=aleatorio.randint(0, 10),
+            submission_id=f"bench-{i}",
+        )
+        for i in range(deslocamento, deslocamento + linhas)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da importação em massa de empreendedores")
+    parser.add_argument("--linhas", type=int, default=50_000)
+    parser.add_argument("--linhas-anterior", type=int, default=2_000)
+    parser.add_argument("--banco", default="/tmp/benchmark_bulk.db")
+    args = parser.parse_args()
+
+    if os.path.exists(args.banco):
+        os.remove(args.banco)
+    engine = create_engine(f"sqlite:///{args.banco}")
+    Base.metadata.create_all(engine)
+    consultas = {"total": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def contar(*_):
+        consultas["total"] += 1
+
+    repo = EmpreendedorRepository(engine=engine)
+
+    # Implementação anterior: uma transação (e várias consultas) por linha
+    dados = gerar(args.linhas_anterior, 0)
+    consultas["total"] = 0
+    inicio = time.perf_counter()
+    gravados_anterior = sum(repo.create_empreendedor(data)[0] for data in dados)
+    tempo_anterior = time.perf_counter() - inicio
+    consultas_anterior = consultas["total"]
+
+    dados = gerar(args.linhas, 10_000_000)
+    consultas["total"] = 0
+    inicio = time.perf_counter()
+    resultados = repo.bulk_create(dados)
+    tempo_atual = time.perf_counter() - inicio
+    consultas_atual = consultas["total"]
+    gravados_atual = sum(sucesso for sucesso, _, _ in resultados)
+
+    taxa_anterior = gravados_anterior / tempo_anterior
+    taxa_atual = gravados_atual / tempo_atual
+    print(f"\n{'':<10} {'linhas':>8} {'comandos':>10} {'tempo':>10} {'linhas/s':>10}")
+    print(f"{'anterior':<10} {gravados_anterior:>8} {consultas_anterior:>10} {tempo_anterior:>8.2f} s {taxa_anterior:>10.0f}")
+    print(f"{'atual':<10} {gravados_atual:>8} {consultas_atual:>10} {tempo_atual:>8.2f} s {taxa_atual:>10.0f}")
+    print(f"ganho: {taxa_atual / taxa_anterior:.1f}x")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
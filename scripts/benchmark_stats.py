@@ -0,0 +1,144 @@
+"""
+Benchmark de /empreendedores/stats
+Compara as nove consultas da implementação anterior com as duas atuais, em um banco
+SQLite de teste populado com N empreendedores (1 milhão por padrão)
+
+Uso:
+    python scripts/benchmark_stats.py [--linhas 1000000] [--banco /tmp/benchmark_stats.db] [--repeticoes 5]
+"""
+import sys
+import os
+import argparse
+import random
+import time
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, event, func, insert
+from sqlalchemy.orm import Session
+
+from data.empreendedor_repository import EmpreendedorRepository
+from models.impulso_models import Base, Empreendedor
+
+COMUNIDADES = ["Impulso Stone", "Banco Pérola", "Gerando Falcões", "CUFA", None]
+ESTADOS = ["SP", "RJ", "MG", "BA", "PE", "RS", "PR", "CE", "PA", "AM", None]
+SEGMENTOS = ["Alimentação", "Beleza", "Moda", "Serviços", "Comércio", "Artesanato", None]
+
+
+def popular(engine, linhas: int, tamanho_lote: int = 20000) -> None:
+    """Criar a tabela e inserir `linhas` empreendedores com distribuição variada"""
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        existentes = session.query(func.count(Empreendedor.id)).scalar()
+    if existentes >= linhas:
+        print(f"Banco já populado ({existentes} linhas)")
+        return
+
+    aleatorio = random.Random(42)
+    inicio = time.perf_counter()
+    with engine.begin() as conn:
+        for base in range(existentes, linhas, tamanho_lote):
+            conn.execute(insert(Empreendedor), [
+                {
+                    "nome": f"Empreendedor {i}",
+                    "telefone": f"(11) 9{i:08d}",
+                    "comunidade_originadora": aleatorio.choice(COMUNIDADES),
+                    "estado": aleatorio.choice(ESTADOS),
+                    "segmento_atuacao": aleatorio.choice(SEGMENTOS),
+                    "ativo_na_ludos": aleatorio.random() < 0.3,
+                    "fazendo_mentoria": aleatorio.random() < 0.2,
+                    "nps_geral": aleatorio.choice([None, *range(11)]),
+                    "nps_mentoria": aleatorio.choice([None, None, *range(11)]),
+                    "nps_ludos": aleatorio.choice([None, None, None, *range(11)]),
+                }
+                for i in range(base, min(base + tamanho_lote, linhas))
+            ])
+    print(f"Banco populado com {linhas} linhas em {time.perf_counter() - inicio:.1f} s")
+
+
+def stats_anterior(session: Session) -> dict:
+    """Implementação anterior: seis consultas escalares e três GROUP BY"""
+    stats = {
+        'total_empreendedores': session.query(func.count(Empreendedor.id)).scalar(),
+        'total_ativos_ludos': session.query(func.count(Empreendedor.id)).filter(
+            Empreendedor.ativo_na_ludos == True
+        ).scalar(),
+        'total_em_mentoria': session.query(func.count(Empreendedor.id)).filter(
+            Empreendedor.fazendo_mentoria == True
+        ).scalar(),
+        'media_nps_geral': session.query(func.avg(Empreendedor.nps_geral)).filter(
+            Empreendedor.nps_geral.isnot(None)
+        ).scalar(),
+        'media_nps_mentoria': session.query(func.avg(Empreendedor.nps_mentoria)).filter(
+            Empreendedor.nps_mentoria.isnot(None)
+        ).scalar(),
+        'media_nps_ludos': session.query(func.avg(Empreendedor.nps_ludos)).filter(
+            Empreendedor.nps_ludos.isnot(None)
+        ).scalar(),
+    }
+    for chave, coluna in [
+        ('total_por_comunidade', Empreendedor.comunidade_originadora),
+        ('total_por_estado', Empreendedor.estado),
+        ('total_por_segmento', Empreendedor.segmento_atuacao),
+    ]:
+        stats[chave] = dict(
+            session.query(coluna, func.count(Empreendedor.id)).filter(coluna.isnot(None)).group_by(coluna).all()
+        )
+    return stats
+
+
+def medir(func, repeticoes: int) -> float:
+    """Melhor tempo em milissegundos"""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return min(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark das estatísticas de empreendedores")
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--banco", default="/tmp/benchmark_stats.db")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{args.banco}")
+    consultas = {"total": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def contar(*_):
+        consultas["total"] += 1
+
+    popular(engine, args.linhas)
+    repo = EmpreendedorRepository(engine=engine)
+
+    with Session(engine) as session:
+        anterior = stats_anterior(session)
+    atual = repo.get_stats()
+    if anterior != atual:
+        print("⚠️ Resultados divergentes entre as implementações")
+
+    def rodar_anterior():
+        with Session(engine) as session:
+            stats_anterior(session)
+
+    consultas["total"] = 0
+    tempo_anterior = medir(rodar_anterior, args.repeticoes)
+    consultas_anterior = consultas["total"] // args.repeticoes
+
+    consultas["total"] = 0
+    tempo_atual = medir(repo.get_stats, args.repeticoes)
+    consultas_atual = consultas["total"] // args.repeticoes
+
+    print(f"\n{'':<12} {'consultas':>10} {'tempo':>12}")
+    print(f"{'anterior':<12} {consultas_anterior:>10} {tempo_anterior:>9.1f} ms")
+    print(f"{'atual':<12} {consultas_atual:>10} {tempo_atual:>9.1f} ms")
+    print(f"ganho: {tempo_anterior / tempo_atual:.2f}x")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
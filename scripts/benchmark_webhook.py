@@ -0,0 +1,206 @@
+"""
+Microbenchmarks do caminho quente do webhook Jotform
+Compara o custo por requisição da implementação anterior com a atual, usando payloads realistas
+
+Uso:
+    python scripts/benchmark_webhook.py [--iteracoes 20000]
+"""
+import sys
+import os
+import argparse
+import json
+import timeit
+from datetime import datetime
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.responses import JSONResponse
+
+from core import json_codec
+from core.json_codec import FastJSONResponse
+from dto.webhook_dtos import JotformWebhookPayload, EmpreendedorCreateRequest, EmpreendedorResponse
+from utils.jotform_field_mapper import field_mapper
+from utils.jotform_processor import JotformProcessor
+
+
+def montar_raw_request() -> dict:
+    """rawRequest típico do formulário Impulso Stone (campos qN_*)"""
+    return {
+        "slug": "submit/242871234567890",
+        "jsExecutionTracker": "build-date-1728561234567=>init-started:1728561234600",
+        "submitSource": "form",
+        "submitDate": "1728561300000",
+        "buildDate": "1728561234567",
+        "uploadServerUrl": "https://upload.jotform.com/upload",
+        "eventObserver": "1",
+        "q2_nome": {"first": "Maria Aparecida", "last": "dos Santos Oliveira"},
+        "q3_email": "maria.aparecida.oliveira@gmail.com",
+        "q4_telefone": {"area": "11", "phone": "98765-4321"},
+        "q5_aquiVoce": "123.456.789-09",
+        "q6_cidade": "São Paulo",
+        "q7_estado": "SP",
+        "q8_idade": "35 a 44 anos",
+        "q9_genero": "Feminino",
+        "q11_racacor": "Parda",
+        "q12_escolaridade": "Ensino Médio completo",
+        "q20_faixaDe": "Entre 1 e 2 salários mínimos",
+        "q21_quaisSao": ["Meu próprio negócio informal", "Bolsa Família / Auxílio"],
+        "q22_tempoDe": "1 a 3 anos",
+        "q23_segmentoDe": "Alimentação",
+        "q24_seOutros": "",
+        "insirauma58": ["Banco Pérola"],
+        "q30_comoConheceu": "Indicação de amigos",
+        "q31_termos": "Aceito",
+        "event_id": "1728561234567_242871234567890_abcdef",
+        "timeToSubmit": "183",
+        "validatedNewRequiredFieldIDs": "{\"new\":1}",
+        "path": "/submit/242871234567890",
+    }
+
+
+def montar_body_jotform() -> bytes:
+    """Body JSON como enviado pelo Jotform (rawRequest é uma string JSON aninhada)"""
+    body = {
+        "formID": "242871234567890",
+        "submissionID": "6012345678901234567",
+        "webhookURL": "https://api.exemplo.com/api/v1/webhook/jotform",
+        "ip": "200.100.50.25",
+        "formTitle": "Impulso Stone - Inscrição",
+        "pretty": "Nome:Maria Aparecida dos Santos Oliveira, E-mail:maria.aparecida.oliveira@gmail.com",
+        "username": "impulsostone",
+        "rawRequest": json.dumps(montar_raw_request(), ensure_ascii=False),
+        "type": "WEB",
+    }
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def montar_resposta(data_inscricao: datetime, isoformat: bool) -> dict:
+    """Conteúdo da resposta 201 do webhook"""
+    return {
+        "success": True,
+        "message": "Empreendedor cadastrado com sucesso",
+        "empreendedor_id": 123456,
+        "data": {
+            "id": 123456,
+            "nome": "Maria Aparecida dos Santos Oliveira",
+            "telefone": "(11) 98765-4321",
+            "email": "maria.aparecida.oliveira@gmail.com",
+            "cpf": "12345678909",
+            "cidade": "São Paulo",
+            "estado": "SP",
+            "data_inscricao": data_inscricao.isoformat() if isoformat else data_inscricao,
+            "formulario_tipo": "Webhook Jotform",
+        },
+        "tempo_processamento_ms": 12.345,
+    }
+
+
+def medir(func, iteracoes: int) -> float:
+    """Tempo médio por chamada em microssegundos (melhor de 5 rodadas)"""
+    return min(timeit.repeat(func, number=iteracoes, repeat=5)) / iteracoes * 1e6
+
+
+def imprimir(titulo: str, anterior: float, atual: float) -> None:
+    ganho = anterior / atual if atual else float("inf")
+    print(f"  {titulo:<38} {anterior:>9.2f} µs {atual:>9.2f} µs {ganho:>7.2f}x")
+
+
+def benchmark_codec(iteracoes: int) -> None:
+    """Parse do body (bytes -> dict -> rawRequest) e renderização da resposta"""
+    body = montar_body_jotform()
+    agora = datetime.now()
+    resposta_iso = montar_resposta(agora, isoformat=True)
+    resposta_dt = montar_resposta(agora, isoformat=False)
+    resposta_stdlib = JSONResponse(content=None)
+    resposta_codec = FastJSONResponse(content=None)
+
+    def parse_anterior():
+        payload = json.loads(body.decode("utf-8"))
+        return json.loads(payload["rawRequest"])
+
+    def parse_atual():
+        payload = json_codec.loads(body)
+        return json_codec.loads(payload["rawRequest"])
+
+    print(f"\nCodec JSON (backend: {json_codec.BACKEND}, body: {len(body)} bytes)")
+    print(f"  {'etapa':<38} {'anterior':>12} {'atual':>12} {'ganho':>8}")
+    imprimir("parse body + rawRequest", medir(parse_anterior, iteracoes), medir(parse_atual, iteracoes))
+    imprimir(
+        "render resposta 201",
+        medir(lambda: resposta_stdlib.render(resposta_iso), iteracoes),
+        medir(lambda: resposta_codec.render(resposta_dt), iteracoes),
+    )
+
+
+def benchmark_validacao(iteracoes: int) -> None:
+    """Validação e conversão do payload mapeado até o EmpreendedorCreateRequest"""
+    mapeado, _ = field_mapper.mapear_submissao(json_codec.loads(montar_body_jotform()))
+    empreendedor = JotformProcessor.converter_payload(mapeado)
+
+    def conversao_anterior(payload: JotformWebhookPayload) -> EmpreendedorCreateRequest:
+        # Implementação anterior: defaults de Ludos/MGM/flags repassados explicitamente
+        return EmpreendedorCreateRequest(
+            nome=JotformProcessor.processar_nome(payload),
+            telefone=JotformProcessor.processar_telefone(payload),
+            email=JotformProcessor.processar_email(payload),
+            comunidade_originadora="Impulso Stone",
+            data_inscricao=datetime.now(),
+            apelido=payload.apelido,
+            cpf=JotformProcessor.limpar_cpf(payload.CPF or payload.cpf),
+            cidade=payload.Cidade or payload.cidade,
+            estado=payload.Estado or payload.estado,
+            idade=payload.Idade or payload.idade,
+            genero=payload.Genero or payload.genero,
+            raca_cor=payload.raca_cor,
+            escolaridade=payload.Escolaridade or payload.escolaridade,
+            faixa_renda=payload.faixa_renda,
+            fonte_renda=JotformProcessor.processar_fontes_renda(payload),
+            tempo_funcionamento=payload.tempo_funcionamento,
+            segmento_atuacao=payload.segmento_atuacao,
+            segmento_outros=payload.segmento_outros,
+            organizacao_stone=JotformProcessor.padronizar_organizacao(payload.organizacao_stone),
+            formulario_tipo="Webhook Jotform",
+            ludos_pontos=0, ludos_moedas=0, ludos_nivel=1,
+            mgm_total_mensagens=0, mgm_total_reacoes=0, mgm_total_interacoes=0,
+            mgm_engajamento_percent=0.0,
+            esta_na_comunidade=False, esta_no_grupo_mentoria=False, esta_no_papo_impulso=False,
+            interacao_nos_grupos=0, ativo_na_ludos=False, fazendo_mentoria=False,
+            solicitou_credito=False,
+        )
+
+    def validacao_anterior():
+        try:
+            payload = JotformWebhookPayload(**mapeado)
+        except Exception:
+            payload = JotformWebhookPayload(**mapeado)
+        if not JotformProcessor.validar_payload(mapeado):
+            return None
+        dados = conversao_anterior(payload)
+        # Resposta montada e descartada no handler
+        EmpreendedorResponse(
+            id=1, nome=dados.nome, telefone=dados.telefone, email=dados.email, cpf=dados.cpf,
+            cidade=dados.cidade, estado=dados.estado, data_inscricao=dados.data_inscricao,
+            formulario_tipo=dados.formulario_tipo
+        )
+        return dados
+
+    def validacao_atual():
+        return JotformProcessor.converter_payload(mapeado)
+
+    print(f"\nValidação e conversão ({len(mapeado)} campos mapeados, {len(empreendedor.model_fields_set)} preenchidos)")
+    print(f"  {'etapa':<38} {'anterior':>12} {'atual':>12} {'ganho':>8}")
+    imprimir("payload -> EmpreendedorCreateRequest", medir(validacao_anterior, iteracoes), medir(validacao_atual, iteracoes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks do webhook Jotform")
+    parser.add_argument("--iteracoes", type=int, default=20000)
+    args = parser.parse_args()
+
+    benchmark_codec(args.iteracoes)
+    benchmark_validacao(args.iteracoes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+Script de migração do schema das tabelas existentes
+Adiciona colunas e índices novos sem recriar tabelas (idempotente: pode rodar várias vezes)
+
+Uso:
+    python scripts/migrar_schema.py
+"""
+import sys
+import os
+from typing import Any, Callable, Dict, List, Tuple
+
+# Adicionar diretório pai ao path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import bindparam, inspect, select, text, update
+from sqlalchemy.engine import Connection
+
+from core.database import engines, get_engine
+from data.empreendedor_repository import CAMPOS_BUSCA, EmpreendedorRepository
+from models.impulso_models import Empreendedor
+from utils.texto import normalizar_busca
+import logging
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+TABELA = Empreendedor.__tablename__
+
+# Preenchimento das colunas novas: linhas por lote
+LOTE_PREENCHIMENTO = 5000
+
+CATALOGO_FULLTEXT = "ft_impulso"
+
+
+def coluna_existe(conn: Connection, tabela: str, coluna: str) -> bool:
+    return any(c["name"] == coluna for c in inspect(conn).get_columns(tabela))
+
+
+def indice_existe(conn: Connection, tabela: str, indice: str) -> bool:
+    return any(i["name"] == indice for i in inspect(conn).get_indexes(tabela))
+
+
+def adicionar_coluna(conn: Connection, tabela: str, coluna: str) -> None:
+    """Adicionar coluna do modelo (tipo compilado para o dialeto do banco), se não existir"""
+    if coluna_existe(conn, tabela, coluna):
+        logger.info(f"  = {tabela}.{coluna} já existe")
+        return
+    tipo = Empreendedor.__table__.c[coluna].type.compile(dialect=conn.dialect)
+    add = "ADD" if conn.dialect.name == "mssql" else "ADD COLUMN"
+    conn.execute(text(f"ALTER TABLE {tabela} {add} {coluna} {tipo} NULL"))
+    logger.info(f"  + {tabela}.{coluna} ({tipo})")
+
+
+def criar_indice(conn: Connection, tabela: str, indice: str, ddl: str) -> None:
+    """Criar índice, se não existir"""
+    if indice_existe(conn, tabela, indice):
+        logger.info(f"  = índice {indice} já existe")
+        return
+    conn.execute(text(ddl))
+    logger.info(f"  + índice {indice}")
+
+
+def migrar_submission_id(conn: Connection) -> None:
+    """submissionID do Jotform com índice único filtrado (idempotência de reenvios)"""
+    adicionar_coluna(conn, TABELA, "submission_id")
+    criar_indice(
+        conn, TABELA, "ix_empreendedores_submission_id",
+        f"CREATE UNIQUE INDEX ix_empreendedores_submission_id ON {TABELA} (submission_id) "
+        f"WHERE submission_id IS NOT NULL"
+    )
+
+
+def migrar_indice_telefone(conn: Connection) -> None:
+    """Índice em telefone (alocação de sufixo em uma consulta e checagem de duplicidade)"""
+    criar_indice(
+        conn, TABELA, "ix_empreendedores_telefone",
+        f"CREATE INDEX ix_empreendedores_telefone ON {TABELA} (telefone)"
+    )
+
+
+def migrar_busca_colunas(conn: Connection) -> None:
+    """Colunas normalizadas da busca textual (nome, cidade e email sem acentos e em minúsculas)"""
+    for coluna in CAMPOS_BUSCA.values():
+        adicionar_coluna(conn, TABELA, coluna)
+
+
+def preencher_colunas(
+    conn: Connection,
+    origem: List[str],
+    pendente: str,
+    calcular: Callable[..., Dict[str, Any]]
+) -> int:
+    """
+    Preencher colunas derivadas dos cadastros existentes, em lotes por ID (um commit por lote)
+
+    Args:
+        origem: colunas lidas e passadas a `calcular`, na ordem
+        pendente: coluna derivada que, nula, indica cadastro ainda não preenchido
+        calcular: valores das colunas de origem -> colunas derivadas
+    """
+    tabela = Empreendedor.__table__
+    atualizar = None
+    ultimo_id, total = 0, 0
+    while True:
+        linhas = conn.execute(
+            select(tabela.c.id, *(tabela.c[coluna] for coluna in origem))
+            .where(tabela.c.id > ultimo_id, tabela.c[pendente].is_(None))
+            .order_by(tabela.c.id)
+            .limit(LOTE_PREENCHIMENTO)
+        ).all()
+        if not linhas:
+            break
+        valores = [calcular(*linha[1:]) for linha in linhas]
+        if atualizar is None:
+            atualizar = (
+                update(tabela)
+                .where(tabela.c.id == bindparam("b_id"))
+                .values({coluna: bindparam(f"b_{coluna}") for coluna in valores[0]})
+            )
+        conn.execute(atualizar, [
+            {"b_id": linha[0], **{f"b_{coluna}": valor for coluna, valor in derivados.items()}}
+            for linha, derivados in zip(linhas, valores)
+        ])
+        ultimo_id = linhas[-1][0]
+        total += len(linhas)
+        logger.info(f"  ~ {total} cadastros preenchidos")
+    return total
+
+
+def preencher_busca(conn: Connection) -> None:
+    """Preencher as colunas de busca dos cadastros existentes"""
+    total = preencher_colunas(
+        conn, list(CAMPOS_BUSCA), "nome_busca",
+        lambda *valores: {
+            coluna: normalizar_busca(valor, 100) for coluna, valor in zip(CAMPOS_BUSCA.values(), valores)
+        }
+    )
+    logger.info(f"  = colunas de busca preenchidas ({total} cadastros)")
+
+
+def migrar_busca_fulltext(conn: Connection) -> None:
+    """Catálogo e índice full-text do SQL Server nas colunas de busca (se o serviço estiver instalado)"""
+    if conn.dialect.name != "mssql":
+        logger.info("  = full-text não se aplica a este banco (busca usa trigramas em memória)")
+        return
+    if not conn.execute(text("SELECT FULLTEXTSERVICEPROPERTY('IsFullTextInstalled')")).scalar():
+        logger.info("  = full-text não instalado no servidor (busca usa trigramas em memória)")
+        return
+    if not conn.execute(
+        text("SELECT 1 FROM sys.fulltext_catalogs WHERE name = :nome"), {"nome": CATALOGO_FULLTEXT}
+    ).scalar():
+        conn.execute(text(f"CREATE FULLTEXT CATALOG {CATALOGO_FULLTEXT}"))
+        logger.info(f"  + catálogo full-text {CATALOGO_FULLTEXT}")
+    if conn.execute(
+        text("SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID(:tabela)"), {"tabela": TABELA}
+    ).scalar():
+        logger.info("  = índice full-text já existe")
+        return
+    chave = conn.execute(
+        text("SELECT name FROM sys.indexes WHERE object_id = OBJECT_ID(:tabela) AND is_primary_key = 1"),
+        {"tabela": TABELA}
+    ).scalar()
+    colunas = ", ".join(f"{coluna} LANGUAGE 1046" for coluna in CAMPOS_BUSCA.values())
+    conn.execute(text(
+        f"CREATE FULLTEXT INDEX ON {TABELA} ({colunas}) KEY INDEX {chave} "
+        f"ON {CATALOGO_FULLTEXT} WITH CHANGE_TRACKING AUTO"
+    ))
+    logger.info(f"  + índice full-text ({', '.join(CAMPOS_BUSCA.values())})")
+
+
+def migrar_telefone_digitos_colunas(conn: Connection) -> None:
+    """Telefone só com dígitos e invertido (igualdade em qualquer formato e busca pelos últimos dígitos)"""
+    adicionar_coluna(conn, TABELA, "telefone_digitos")
+    adicionar_coluna(conn, TABELA, "telefone_digitos_reverso")
+
+
+def preencher_telefone_digitos(conn: Connection) -> None:
+    """Preencher dígitos do telefone dos cadastros existentes"""
+    total = preencher_colunas(
+        conn, ["telefone"], "telefone_digitos", EmpreendedorRepository._colunas_telefone
+    )
+    logger.info(f"  = dígitos de telefone preenchidos ({total} cadastros)")
+
+
+def migrar_telefone_digitos_indices(conn: Connection) -> None:
+    """Índices de telefone_digitos e do reverso (criados depois do preenchimento)"""
+    for coluna in ("telefone_digitos", "telefone_digitos_reverso"):
+        criar_indice(
+            conn, TABELA, f"ix_empreendedores_{coluna}",
+            f"CREATE INDEX ix_empreendedores_{coluna} ON {TABELA} ({coluna})"
+        )
+
+
+# Ordem de aplicação; cada passo é idempotente. O terceiro item indica se o passo roda
+# em uma transação (DDL de full-text e preenchimentos em lote rodam em autocommit)
+MIGRACOES: List[Tuple[str, Callable[[Connection], None], bool]] = [
+    ("submission_id", migrar_submission_id, True),
+    ("indice_telefone", migrar_indice_telefone, True),
+    ("busca_colunas", migrar_busca_colunas, True),
+    ("busca_preenchimento", preencher_busca, False),
+    ("busca_fulltext", migrar_busca_fulltext, False),
+    ("telefone_digitos_colunas", migrar_telefone_digitos_colunas, True),
+    ("telefone_digitos_preenchimento", preencher_telefone_digitos, False),
+    ("telefone_digitos_indices", migrar_telefone_digitos_indices, True),
+]
+
+
+def main():
+    """Aplicar migrações pendentes"""
+    # Engine do registro: mesmas opções da API (fast_executemany no preenchimento em lote)
+    engine = get_engine()
+    try:
+        for nome, migracao, transacao in MIGRACOES:
+            logger.info(f"Migração: {nome}")
+            if transacao:
+                # Uma transação por passo: colunas novas ficam visíveis para os índices do passo seguinte
+                with engine.begin() as conn:
+                    migracao(conn)
+            else:
+                with engine.connect() as conn:
+                    migracao(conn.execution_options(isolation_level="AUTOCOMMIT"))
+        logger.info("✅ Schema atualizado")
+    except Exception as e:
+        logger.error(f"❌ Erro ao migrar schema: {e}")
+        sys.exit(1)
+    finally:
+        engines.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -156,11 +156,12 @@ def main():
         engine = create_engine(settings.sql_connection_string)
         
         with engine.connect() as conn:
+            # Últimos dígitos: prefixo do telefone invertido (usa o índice, sem varrer a tabela)
             result = conn.execute(text("""
                 SELECT id, nome, telefone, email, data_inscricao
                 FROM empreendedores 
-                WHERE telefone LIKE '%3353535353%'
-            """))
+                WHERE telefone_digitos_reverso LIKE :reverso
+            """), {"reverso": "3353535353"[::-1] + "%"})
             
             rows = result.fetchall()
             
@@ -214,7 +214,7 @@ def buscar_por_nome(repo):
         page_size=10
     )
     
-    empreendedores, total = repo.search_empreendedores(filtros)
+    empreendedores, total, _ = repo.search_empreendedores(filtros)
     
     if empreendedores:
         print_success(f"Encontrados {total} empreendedor(es)")
@@ -251,7 +251,7 @@ def listar_ultimos(repo):
         page_size=limite
     )
     
-    empreendedores, total = repo.search_empreendedores(filtros)
+    empreendedores, total, _ = repo.search_empreendedores(filtros)
     
     if empreendedores:
         print_success(f"Total no banco: {total} empreendedor(es)")
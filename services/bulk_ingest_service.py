@@ -0,0 +1,195 @@
+"""
+Importação em lote de cadastros do Jotform
+Valida tudo antes, resolve duplicidade por conjunto e grava em transações paralelas por bloco
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from core.config import settings
+from data.async_empreendedor_repository import AsyncEmpreendedorRepository
+from data.empreendedor_repository import ERRO_SUBMISSAO_REPETIDA
+from dto.webhook_dtos import EmpreendedorCreateRequest, JotformWebhookPayload
+from models.impulso_models import Empreendedor
+from services.sheets_webhook_service import forward_to_sheets_webhook, montar_sheets_payload
+from services.submission_filter import submission_filter
+from utils.jotform_field_mapper import field_mapper
+from utils.jotform_processor import JotformProcessor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ItemBulk:
+    """Registro do lote já validado (ou com o erro de validação)"""
+    dados: Optional[EmpreendedorCreateRequest] = None
+    sheets_base: Optional[Dict[str, Any]] = None
+    erro: Optional[str] = None
+
+
+@dataclass
+class ResultadoBulk:
+    """Resultado de um registro do lote, na posição original"""
+    sucesso: bool
+    empreendedor: Optional[Empreendedor] = None
+    erro: Optional[str] = None
+    invalido: bool = False  # falhou na validação, antes de chegar ao banco
+    reenvio: bool = False  # submissionID já processado; empreendedor é o cadastro original
+
+
+class BulkIngestService:
+    """
+    Motor de importação em lote
+
+    1. Valida e mapeia todos os registros antes de tocar no banco
+    2. Resolve reenvios (submissionID), duplicidade e telefones do lote com
+       consultas por conjunto
+    3. Grava blocos de BULK_CHUNK_SIZE linhas (INSERT multi-linha), até
+       BULK_MAX_CONCURRENCY transações em paralelo
+    4. Encaminha ao Sheets em listas de BULK_SHEETS_BATCH_SIZE, em segundo plano
+    """
+
+    def __init__(
+        self,
+        repo: AsyncEmpreendedorRepository,
+        tamanho_bloco: Optional[int] = None,
+        concorrencia: Optional[int] = None,
+        tamanho_lote_sheets: Optional[int] = None
+    ):
+        self.repo = repo
+        self.tamanho_bloco = tamanho_bloco or settings.BULK_CHUNK_SIZE
+        self.concorrencia = concorrencia or settings.BULK_MAX_CONCURRENCY
+        self.tamanho_lote_sheets = tamanho_lote_sheets or settings.BULK_SHEETS_BATCH_SIZE
+        self._tarefas: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def preparar_item(payload: JotformWebhookPayload) -> ItemBulk:
+        """Mapear (se vier com rawRequest) e converter um registro do lote"""
+        try:
+            # Registros no formato form-data (rawRequest) usam o mesmo mapeamento do webhook
+            if payload.model_extra and "rawRequest" in payload.model_extra:
+                mapped_payload, _ = field_mapper.mapear_submissao(payload.model_extra)
+                return ItemBulk(JotformProcessor.converter_payload(mapped_payload), mapped_payload)
+            return ItemBulk(
+                JotformProcessor.payload_to_empreendedor(payload),
+                payload.model_dump(by_alias=True, exclude_none=True)
+            )
+        except ValueError as e:
+            return ItemBulk(erro=str(e) or "Campos obrigatórios ausentes")
+
+    async def importar(self, payloads: List[JotformWebhookPayload]) -> List[ResultadoBulk]:
+        """
+        Importar registros em lote
+
+        Returns:
+            Lista de ResultadoBulk, na mesma ordem da entrada
+        """
+        itens = [self.preparar_item(payload) for payload in payloads]
+        resultados: List[Optional[ResultadoBulk]] = [
+            None if item.dados is not None else ResultadoBulk(False, erro=item.erro, invalido=True)
+            for item in itens
+        ]
+
+        validos = [idx for idx, item in enumerate(itens) if item.dados is not None]
+        if not validos:
+            return resultados
+
+        # Duplicidade e telefones resolvidos de uma vez para todo o lote, de modo que
+        # os blocos possam ser gravados em paralelo sem disputar sufixos entre si
+        preparados = await self.repo.preparar_lote([itens[idx].dados for idx in validos])
+
+        pendentes: List[int] = []
+        registros: List[Dict[str, Any]] = []
+        reenvios: List[int] = []
+        for idx, linha in zip(validos, preparados):
+            if linha.registro is not None:
+                pendentes.append(idx)
+                registros.append(linha.registro)
+            elif linha.erro == ERRO_SUBMISSAO_REPETIDA:
+                resultados[idx] = ResultadoBulk(True, linha.existente, reenvio=True)
+                if linha.existente is None:
+                    reenvios.append(idx)
+            else:
+                resultados[idx] = ResultadoBulk(False, erro=linha.erro)
+
+        semaforo = asyncio.Semaphore(self.concorrencia)
+
+        async def gravar_bloco(inicio: int) -> None:
+            indices = pendentes[inicio:inicio + self.tamanho_bloco]
+            async with semaforo:
+                criados = await self._gravar_bloco(
+                    registros[inicio:inicio + self.tamanho_bloco],
+                    [itens[idx].dados for idx in indices]
+                )
+            for idx, resultado in zip(indices, criados):
+                resultados[idx] = resultado
+            self._encaminhar_sheets([
+                montar_sheets_payload(itens[idx].sheets_base, resultado.empreendedor)
+                for idx, resultado in zip(indices, criados) if resultado.sucesso and not resultado.reenvio
+            ])
+
+        await asyncio.gather(*(
+            gravar_bloco(inicio) for inicio in range(0, len(pendentes), self.tamanho_bloco)
+        ))
+
+        # Submissões repetidas dentro do próprio lote apontam para a linha gravada
+        por_submissao = {
+            resultado.empreendedor.submission_id: resultado.empreendedor
+            for resultado in resultados
+            if resultado.sucesso and resultado.empreendedor is not None and resultado.empreendedor.submission_id
+        }
+        for idx in reenvios:
+            original = por_submissao.get(itens[idx].dados.submission_id)
+            resultados[idx] = (
+                ResultadoBulk(True, original, reenvio=True) if original
+                else ResultadoBulk(False, erro=ERRO_SUBMISSAO_REPETIDA)
+            )
+
+        for resultado in resultados:
+            if resultado.sucesso and resultado.empreendedor is not None:
+                submission_filter.registrar(resultado.empreendedor.submission_id, resultado.empreendedor.id)
+
+        total_sucesso = sum(1 for resultado in resultados if resultado.sucesso and not resultado.reenvio)
+        logger.info(f"Importação em lote: {total_sucesso}/{len(payloads)} registros gravados")
+        return resultados
+
+    async def _gravar_bloco(
+        self, registros: List[Dict[str, Any]], dados: List[EmpreendedorCreateRequest]
+    ) -> List[ResultadoBulk]:
+        """Gravar um bloco em uma transação; se falhar, regravar linha a linha para isolar o erro"""
+        try:
+            criados = await self.repo.inserir_registros(registros)
+            return [ResultadoBulk(True, empreendedor) for empreendedor in criados]
+        except SQLAlchemyError as e:
+            logger.error(f"Erro ao gravar bloco de {len(registros)} linhas, regravando individualmente: {e}")
+
+        resultados = []
+        for data in dados:
+            success, empreendedor, error = await self.repo.create_empreendedor(data)
+            if error == ERRO_SUBMISSAO_REPETIDA:
+                resultados.append(ResultadoBulk(True, empreendedor, reenvio=True))
+            else:
+                resultados.append(ResultadoBulk(success, empreendedor, error))
+        return resultados
+
+    def _encaminhar_sheets(self, payloads: List[Dict[str, Any]]) -> None:
+        """Enviar ao Sheets em listas, sem bloquear a importação"""
+        for inicio in range(0, len(payloads), self.tamanho_lote_sheets):
+            tarefa = asyncio.create_task(
+                forward_to_sheets_webhook(payloads[inicio:inicio + self.tamanho_lote_sheets])
+            )
+            self._tarefas.add(tarefa)
+            tarefa.add_done_callback(self._tarefas.discard)
+
+    async def aguardar_encaminhamentos(self, maximo: int = 0) -> None:
+        """
+        Aguardar até restarem no máximo `maximo` envios ao Sheets pendentes
+
+        Com maximo=0 espera todos (shutdown); importações em streaming usam um
+        limite para não acumular envios se o Sheets estiver mais lento que o banco.
+        """
+        while len(self._tarefas) > maximo:
+            await asyncio.wait(list(self._tarefas), return_when=asyncio.FIRST_COMPLETED)
@@ -0,0 +1,288 @@
+"""
+Cache de empreendedores por ID
+LRU com TTL em memória, mantido pelas escritas do repositório; invalidação entre instâncias opcional via Redis (pub/sub)
+"""
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from core.config import settings
+from data.async_empreendedor_repository import AsyncEmpreendedorRepository
+from data.empreendedor_repository import EVENTO_ATUALIZADO, EVENTO_CRIADO, EVENTO_REMOVIDO
+from dto.webhook_dtos import EmpreendedorResponse
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # pragma: no cover - depende do ambiente
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+INTERVALO_RECONEXAO_SEGUNDOS = 5.0
+
+
+class InvalidacaoRedis:
+    """
+    Invalidações propagadas entre instâncias por pub/sub do Redis
+
+    Funciona com qualquer servidor que fale o protocolo do Redis. Cada
+    mensagem leva a origem (instância), para que ninguém processe as próprias.
+    Invalidações publicadas enquanto a assinatura está fora do ar se perdem:
+    o cache não é usado nesse intervalo e é esvaziado a cada (re)conexão.
+    """
+
+    def __init__(self, url: str, canal: str):
+        if redis_asyncio is None:
+            raise RuntimeError("Pacote redis não instalado (necessário com EMPREENDEDOR_CACHE_REDIS_URL)")
+        self.url = url
+        self.canal = canal
+        self.origem = uuid.uuid4().hex
+        self.conectado = False
+        self.publicadas = 0
+        self.recebidas = 0
+        self.falhas = 0
+        self._cliente = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._fila: Optional["asyncio.Queue[int]"] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def iniciar(self, ao_receber: Callable[[int], None], ao_conectar: Callable[[], None]) -> None:
+        """Assinar o canal e começar a publicar as invalidações enfileiradas"""
+        self._loop = asyncio.get_running_loop()
+        self._fila = asyncio.Queue()
+        self._cliente = redis_asyncio.from_url(self.url)
+        self._tasks = [
+            asyncio.create_task(self._escutar(ao_receber, ao_conectar)),
+            asyncio.create_task(self._publicar_pendentes()),
+        ]
+
+    async def parar(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self.conectado = False
+        if self._cliente is not None:
+            await self._cliente.close()
+            self._cliente = None
+
+    def publicar(self, empreendedor_id: int) -> None:
+        """Enfileirar invalidação (pode ser chamado das threads do repositório)"""
+        if self._loop is not None and self._fila is not None:
+            self._loop.call_soon_threadsafe(self._fila.put_nowait, empreendedor_id)
+
+    async def _publicar_pendentes(self) -> None:
+        while True:
+            empreendedor_id = await self._fila.get()
+            try:
+                await self._cliente.publish(self.canal, f"{self.origem}:{empreendedor_id}")
+                self.publicadas += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # As outras instâncias ficam com a versão antiga até o TTL
+                self.falhas += 1
+                logger.error(f"Erro ao publicar invalidação do cache (ID={empreendedor_id}): {e}")
+
+    async def _escutar(self, ao_receber: Callable[[int], None], ao_conectar: Callable[[], None]) -> None:
+        while True:
+            pubsub = self._cliente.pubsub()
+            try:
+                await pubsub.subscribe(self.canal)
+                ao_conectar()
+                self.conectado = True
+                logger.info(f"Invalidações do cache assinadas no canal {self.canal}")
+                async for mensagem in pubsub.listen():
+                    if mensagem["type"] != "message":
+                        continue
+                    origem, _, empreendedor_id = mensagem["data"].decode().partition(":")
+                    if origem != self.origem:
+                        self.recebidas += 1
+                        ao_receber(int(empreendedor_id))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.falhas += 1
+                logger.warning(f"Assinatura de invalidações do cache perdida: {e}")
+            finally:
+                self.conectado = False
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+            await asyncio.sleep(INTERVALO_RECONEXAO_SEGUNDOS)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "tipo": "redis",
+            "canal": self.canal,
+            "conectado": self.conectado,
+            "publicadas": self.publicadas,
+            "recebidas": self.recebidas,
+            "falhas": self.falhas,
+        }
+
+
+class CacheEmpreendedores:
+    """
+    EmpreendedorResponse por ID (LRU com TTL)
+
+    Preenchido pelas consultas que não acharam o ID e pelas criações do
+    repositório; atualizações gravam o valor novo por cima (write-through) e
+    remoções apagam a entrada. Com backend compartilhado, atualizações e
+    remoções também invalidam a entrada nas demais instâncias.
+
+    Uma consulta ao banco que começou antes de uma atualização não grava no
+    cache (ver `versao`), para não sobrescrever o valor novo com o antigo.
+    """
+
+    def __init__(
+        self,
+        repo: AsyncEmpreendedorRepository,
+        capacidade: Optional[int] = None,
+        ttl: Optional[float] = None,
+        backend: Optional[InvalidacaoRedis] = None
+    ):
+        self.capacidade = capacidade or settings.EMPREENDEDOR_CACHE_SIZE
+        self.ttl = ttl or settings.EMPREENDEDOR_CACHE_TTL_SECONDS
+        self.backend = backend
+        self._itens: "OrderedDict[int, Tuple[float, EmpreendedorResponse]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Incrementada a cada atualização/remoção (local ou remota)
+        self.versao = 0
+        self.acertos = 0
+        self.faltas = 0
+        self.expirados = 0
+        self.descartados = 0
+        self.invalidacoes = 0
+        repo.sync.adicionar_observador(self.observar)
+
+    @property
+    def ativo(self) -> bool:
+        """Sem a assinatura do backend compartilhado, o cache pode estar desatualizado e não é usado"""
+        return self.backend is None or self.backend.conectado
+
+    def obter(self, empreendedor_id: int) -> Optional[EmpreendedorResponse]:
+        """Resposta em cache, se houver e não tiver expirado"""
+        if not self.ativo:
+            return None
+        with self._lock:
+            item = self._itens.get(empreendedor_id)
+            if item is None:
+                self.faltas += 1
+                return None
+            expira_em, resposta = item
+            if time.monotonic() >= expira_em:
+                del self._itens[empreendedor_id]
+                self.expirados += 1
+                self.faltas += 1
+                return None
+            self._itens.move_to_end(empreendedor_id)
+            self.acertos += 1
+            return resposta
+
+    def guardar(self, resposta: EmpreendedorResponse, versao: Optional[int] = None) -> None:
+        """
+        Guardar resposta lida do banco
+
+        Args:
+            versao: valor de `versao` antes da consulta; se mudou, a leitura pode
+                ser anterior a uma atualização e é descartada
+        """
+        if not self.ativo:
+            return
+        with self._lock:
+            if versao is not None and versao != self.versao:
+                return
+            self._guardar(resposta)
+
+    def _guardar(self, resposta: EmpreendedorResponse) -> None:
+        self._itens[resposta.id] = (time.monotonic() + self.ttl, resposta)
+        self._itens.move_to_end(resposta.id)
+        if len(self._itens) > self.capacidade:
+            self._itens.popitem(last=False)
+            self.descartados += 1
+
+    def invalidar(self, empreendedor_id: int) -> None:
+        """Remover a entrada (invalidação recebida de outra instância)"""
+        with self._lock:
+            self.versao += 1
+            self.invalidacoes += 1
+            self._itens.pop(empreendedor_id, None)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self.versao += 1
+            self._itens.clear()
+
+    def observar(self, evento: str, antes: Optional[Dict[str, Any]], depois: Optional[Dict[str, Any]]) -> None:
+        """Observador do repositório (roda na thread de banco que fez a escrita)"""
+        if evento == EVENTO_CRIADO and depois is not None:
+            try:
+                resposta = EmpreendedorResponse.model_validate(depois)
+            except ValidationError:
+                return
+            with self._lock:
+                self._guardar(resposta)
+            return
+
+        if evento not in (EVENTO_ATUALIZADO, EVENTO_REMOVIDO):
+            return
+        empreendedor_id = (antes or depois)["id"]
+        with self._lock:
+            self.versao += 1
+            self.invalidacoes += 1
+            self._itens.pop(empreendedor_id, None)
+            if evento == EVENTO_ATUALIZADO and depois is not None:
+                try:
+                    self._guardar(EmpreendedorResponse.model_validate(depois))
+                except ValidationError:
+                    pass
+        if self.backend is not None:
+            self.backend.publicar(empreendedor_id)
+
+    def status(self) -> Dict[str, Any]:
+        """Tamanho, acertos/faltas e invalidações"""
+        consultas = self.acertos + self.faltas
+        return {
+            "ativo": self.ativo,
+            "itens": len(self._itens),
+            "capacidade": self.capacidade,
+            "ttl_segundos": self.ttl,
+            "acertos": self.acertos,
+            "faltas": self.faltas,
+            "taxa_acerto": round(self.acertos / consultas, 4) if consultas else None,
+            "expirados": self.expirados,
+            "descartados": self.descartados,
+            "invalidacoes": self.invalidacoes,
+            "backend": self.backend.status() if self.backend is not None else None,
+        }
+
+    async def iniciar(self) -> None:
+        """Conectar ao backend compartilhado, se configurado"""
+        if self.backend is not None:
+            await self.backend.iniciar(self.invalidar, self.limpar)
+
+    async def parar(self) -> None:
+        if self.backend is not None:
+            await self.backend.parar()
+
+
+def criar_cache(repo: AsyncEmpreendedorRepository) -> Optional[CacheEmpreendedores]:
+    """Cache conforme Settings (None se desabilitado)"""
+    if not settings.EMPREENDEDOR_CACHE_ENABLED:
+        return None
+    backend = None
+    if settings.EMPREENDEDOR_CACHE_REDIS_URL:
+        backend = InvalidacaoRedis(settings.EMPREENDEDOR_CACHE_REDIS_URL, settings.EMPREENDEDOR_CACHE_REDIS_CHANNEL)
+    return CacheEmpreendedores(repo, backend=backend)
@@ -0,0 +1,90 @@
+"""
+Serviço de health check
+Ping ao banco com cache curto, para que probes não consultem o banco a cada chamada
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, TypeVar
+
+from core.config import settings
+from core.database import engines
+from data.async_empreendedor_repository import AsyncEmpreendedorRepository
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CacheTTL(Generic[T]):
+    """
+    Resultado de uma corrotina guardado por `ttl` segundos
+
+    Chamadas concorrentes com o cache vencido aguardam uma única execução
+    (nenhuma rajada de probes vira rajada de consultas).
+    """
+
+    def __init__(self, carregar: Callable[[], Awaitable[T]], ttl: float):
+        self._carregar = carregar
+        self.ttl = ttl
+        self._valor: Optional[T] = None
+        self._expira_em = 0.0
+        self.atualizado_em: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+
+    async def obter(self) -> T:
+        if time.monotonic() < self._expira_em:
+            return self._valor
+        async with self._lock:
+            if time.monotonic() >= self._expira_em:
+                self._valor = await self._carregar()
+                self._expira_em = time.monotonic() + self.ttl
+                self.atualizado_em = datetime.utcnow()
+            return self._valor
+
+    def invalidar(self) -> None:
+        self._expira_em = 0.0
+
+
+class HealthService:
+    """Liveness e readiness (ping + pool)"""
+
+    def __init__(self, repo: AsyncEmpreendedorRepository):
+        self.repo = repo
+        self.iniciado_em = time.monotonic()
+        self._ping = CacheTTL(self._verificar_banco, settings.HEALTH_PING_TTL_SECONDS)
+
+    def vivo(self) -> Dict[str, Any]:
+        """Liveness: o processo responde (sem I/O)"""
+        return {
+            "status": "alive",
+            "uptime_segundos": round(time.monotonic() - self.iniciado_em, 1),
+        }
+
+    async def _verificar_banco(self) -> Dict[str, Any]:
+        """SELECT 1 com timeout; falhas também ficam em cache pelo TTL"""
+        inicio = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.repo.ping(), settings.HEALTH_PING_TIMEOUT_SECONDS)
+            return {
+                "database": "connected",
+                "latencia_ms": round((time.perf_counter() - inicio) * 1000, 2),
+                "verificado_em": datetime.utcnow(),
+            }
+        except Exception as e:
+            logger.error(f"Ping ao banco falhou: {e!r}")
+            return {
+                "database": "disconnected",
+                "error": str(e) or type(e).__name__,
+                "verificado_em": datetime.utcnow(),
+            }
+
+    async def pronto(self) -> Dict[str, Any]:
+        """Readiness: último ping ao banco (cache de HEALTH_PING_TTL_SECONDS) e ocupação do pool"""
+        banco = await self._ping.obter()
+        return {
+            "status": "ready" if banco["database"] == "connected" else "unavailable",
+            **banco,
+            "pool": engines.status(),
+        }
@@ -0,0 +1,218 @@
+"""
+Spool local e durável para ingestão de webhooks do Jotform
+Permite responder 202 imediatamente e gravar no banco em segundo plano
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Callback de processamento: recebe o payload e retorna (sucesso, erro, retentar)
+ProcessadorSpool = Callable[[Dict[str, Any]], Awaitable[Tuple[bool, Optional[str], bool]]]
+
+STATUS_PENDENTE = "pendente"
+STATUS_FALHA = "falha"
+
+
+class IngestSpool:
+    """
+    Fila append-only em arquivo SQLite (modo WAL)
+
+    Cada payload aceito é gravado antes da resposta ao Jotform, de modo que
+    sobrevive a reinícios do processo. Registros processados são removidos;
+    os que esgotam as tentativas ficam com status 'falha' para inspeção.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """Configurar spool (o arquivo só é aberto no primeiro uso)"""
+        self.path = path or settings.WEBHOOK_SPOOL_PATH
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._novo_registro = asyncio.Event()
+
+    def existe(self) -> bool:
+        """Indica se o arquivo do spool já foi criado"""
+        return self._conn is not None or os.path.exists(self.path)
+
+    def _conexao(self) -> sqlite3.Connection:
+        """Abrir conexão e criar tabela do spool (chamar com o lock adquirido)"""
+        if self._conn is None:
+            diretorio = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(diretorio, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={settings.WEBHOOK_SPOOL_SYNCHRONOUS}")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS spool (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    payload TEXT NOT NULL,
+                    recebido_em REAL NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pendente',
+                    tentativas INTEGER NOT NULL DEFAULT 0,
+                    proxima_tentativa REAL NOT NULL,
+                    erro TEXT
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_spool_status_proxima "
+                "ON spool (status, proxima_tentativa)"
+            )
+            self._conn = conn
+            logger.info(f"Spool de ingestão aberto: {self.path}")
+        return self._conn
+
+    def enfileirar(self, payload: Dict[str, Any]) -> int:
+        """Gravar payload no spool e retornar o ID do registro"""
+        agora = time.time()
+        with self._lock:
+            cursor = self._conexao().execute(
+                "INSERT INTO spool (payload, recebido_em, proxima_tentativa) VALUES (?, ?, ?)",
+                (json.dumps(payload, ensure_ascii=False, default=str), agora, agora)
+            )
+            return cursor.lastrowid
+
+    async def enfileirar_async(self, payload: Dict[str, Any]) -> int:
+        """Gravar payload sem bloquear o event loop e acordar o worker"""
+        spool_id = await asyncio.to_thread(self.enfileirar, payload)
+        self._novo_registro.set()
+        return spool_id
+
+    def proximos(self, limite: int) -> List[Tuple[int, Dict[str, Any], int]]:
+        """Obter registros pendentes prontos para processamento"""
+        with self._lock:
+            rows = self._conexao().execute(
+                "SELECT id, payload, tentativas FROM spool "
+                "WHERE status = ? AND proxima_tentativa <= ? ORDER BY id LIMIT ?",
+                (STATUS_PENDENTE, time.time(), limite)
+            ).fetchall()
+        return [(row[0], json.loads(row[1]), row[2]) for row in rows]
+
+    def concluir(self, spool_id: int) -> None:
+        """Remover registro processado com sucesso"""
+        with self._lock:
+            self._conexao().execute("DELETE FROM spool WHERE id = ?", (spool_id,))
+
+    def registrar_erro(self, spool_id: int, tentativas: int, erro: Optional[str], retentar: bool) -> None:
+        """Reagendar registro com backoff ou marcá-lo como falha definitiva"""
+        tentativas += 1
+        if retentar and tentativas < settings.WEBHOOK_SPOOL_MAX_TENTATIVAS:
+            atraso = min(2 ** tentativas, 300)
+            with self._lock:
+                self._conexao().execute(
+                    "UPDATE spool SET tentativas = ?, proxima_tentativa = ?, erro = ? WHERE id = ?",
+                    (tentativas, time.time() + atraso, erro, spool_id)
+                )
+            return
+
+        logger.error(f"Registro {spool_id} do spool marcado como falha: {erro}")
+        with self._lock:
+            self._conexao().execute(
+                "UPDATE spool SET status = ?, tentativas = ?, erro = ? WHERE id = ?",
+                (STATUS_FALHA, tentativas, erro, spool_id)
+            )
+
+    def status(self) -> Dict[str, Any]:
+        """Profundidade, atraso (lag) e falhas do spool"""
+        if not self.existe():
+            return {"profundidade": 0, "lag_segundos": 0.0, "falhas": 0, "path": self.path}
+
+        with self._lock:
+            conn = self._conexao()
+            profundidade, mais_antigo = conn.execute(
+                "SELECT COUNT(*), MIN(recebido_em) FROM spool WHERE status = ?",
+                (STATUS_PENDENTE,)
+            ).fetchone()
+            falhas = conn.execute(
+                "SELECT COUNT(*) FROM spool WHERE status = ?", (STATUS_FALHA,)
+            ).fetchone()[0]
+
+        return {
+            "profundidade": profundidade,
+            "lag_segundos": round(time.time() - mais_antigo, 3) if mais_antigo else 0.0,
+            "falhas": falhas,
+            "path": self.path
+        }
+
+    async def aguardar_novos(self, timeout: float) -> None:
+        """Esperar novo registro ou o intervalo de polling"""
+        try:
+            await asyncio.wait_for(self._novo_registro.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._novo_registro.clear()
+
+    def fechar(self) -> None:
+        """Fechar conexão com o arquivo do spool"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class SpoolWorker:
+    """Worker em segundo plano que drena o spool para o banco"""
+
+    def __init__(self, spool: IngestSpool, processar: ProcessadorSpool):
+        self.spool = spool
+        self.processar = processar
+        self._task: Optional[asyncio.Task] = None
+
+    def iniciar(self) -> None:
+        """Iniciar loop de drenagem"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+            logger.info("Worker do spool de ingestão iniciado")
+
+    async def parar(self) -> None:
+        """Parar loop de drenagem (registros pendentes continuam no spool)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Worker do spool de ingestão parado")
+
+    async def drenar(self) -> int:
+        """Processar um lote de registros pendentes; retorna quantos foram processados"""
+        if not self.spool.existe():
+            return 0
+
+        registros = await asyncio.to_thread(self.spool.proximos, settings.WEBHOOK_SPOOL_BATCH_SIZE)
+        for spool_id, payload, tentativas in registros:
+            try:
+                sucesso, erro, retentar = await self.processar(payload)
+            except Exception as e:
+                logger.error(f"Erro inesperado ao processar registro {spool_id} do spool: {e}")
+                sucesso, erro, retentar = False, str(e), True
+
+            if sucesso:
+                await asyncio.to_thread(self.spool.concluir, spool_id)
+            else:
+                await asyncio.to_thread(self.spool.registrar_erro, spool_id, tentativas, erro, retentar)
+
+        return len(registros)
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                processados = await self.drenar()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erro no worker do spool: {e}", exc_info=True)
+                processados = 0
+
+            if not processados:
+                await self.spool.aguardar_novos(settings.WEBHOOK_SPOOL_POLL_INTERVAL)
@@ -8,6 +8,8 @@ from typing import Dict, Any, List, Union
 import httpx
 
 from core.config import settings
+from core import json_codec
+from models.impulso_models import Empreendedor
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,24 @@ logger = logging.getLogger(__name__)
 DEFAULT_TIMEOUT = 15.0
 
 
+def montar_sheets_payload(raw_payload: Dict[str, Any], empreendedor: Empreendedor) -> Dict[str, Any]:
+    """Montar payload do Sheets Stone com os dados do registro criado no banco"""
+    return {
+        **raw_payload,
+        # Dados do banco de dados
+        "empreendedor_id": empreendedor.id,
+        "comunidade_originadora": empreendedor.comunidade_originadora,
+        "data_inscricao": empreendedor.data_inscricao,
+        "organizacao_stone": empreendedor.organizacao_stone,
+        "formulario_tipo": empreendedor.formulario_tipo,
+        # Campos adicionais do formulário que podem estar no empreendedor
+        "faixa_renda": empreendedor.faixa_renda,
+        "fonte_renda": empreendedor.fonte_renda,
+        "raca_cor": empreendedor.raca_cor,
+        "segmento_outros": empreendedor.segmento_outros,
+    }
+
+
 async def forward_to_sheets_webhook(payload: Union[Dict[str, Any], List[Dict[str, Any]]]) -> bool:
     """
     Envia um POST ao webhook Sheets Stone com o payload do formulário Jotform.
@@ -33,7 +53,11 @@ async def forward_to_sheets_webhook(payload: Union[Dict[str, Any], List[Dict[str
 
     try:
         async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT) as client:
-            response = await client.post(url, json=payload)
+            response = await client.post(
+                url,
+                content=json_codec.dumps(payload),
+                headers={"Content-Type": "application/json"}
+            )
             if response.is_success:
                 logger.info("Encaminhamento para Sheets Stone webhook OK: %s", url)
                 return True
@@ -0,0 +1,208 @@
+"""
+Estatísticas dos empreendedores mantidas em memória
+Contadores atualizados a cada escrita do repositório e reconciliados periodicamente com o banco
+"""
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.config import settings
+from data.async_empreendedor_repository import AsyncEmpreendedorRepository
+from data.empreendedor_repository import (
+    CAMPOS_NPS,
+    DISTRIBUICOES,
+    EVENTO_ATUALIZADO,
+    EVENTO_CRIADO,
+    EVENTO_REMOVIDO,
+    montar_estatisticas
+)
+
+logger = logging.getLogger(__name__)
+
+TOTAIS = ('total_empreendedores', 'total_ativos_ludos', 'total_em_mentoria')
+
+
+class EstatisticasIncrementais:
+    """
+    Contadores de /empreendedores/stats sem varrer a tabela a cada chamada
+
+    Os contadores (no formato de EmpreendedorRepository.get_contadores) são
+    carregados do banco e depois ajustados pelos eventos de criação,
+    atualização e remoção do repositório. Um worker reconcilia com o banco a
+    cada STATS_RECONCILE_INTERVAL_SECONDS, o que também incorpora escritas de
+    outros processos; se a última reconciliação passar de
+    STATS_MAX_STALENESS_SECONDS, a leitura reconcilia antes de responder.
+
+    A divergência medida em cada reconciliação (soma das diferenças entre
+    contadores em memória e banco) indica eventos perdidos ou escritas feitas
+    fora deste processo.
+    """
+
+    def __init__(
+        self,
+        repo: AsyncEmpreendedorRepository,
+        intervalo: Optional[float] = None,
+        max_defasagem: Optional[float] = None
+    ):
+        self.repo = repo
+        self.intervalo = intervalo or settings.STATS_RECONCILE_INTERVAL_SECONDS
+        self.max_defasagem = max_defasagem or settings.STATS_MAX_STALENESS_SECONDS
+        self._contadores: Optional[Dict[str, Any]] = None
+        # Eventos recebidos enquanto a consulta de reconciliação está em andamento
+        self._pendentes: Optional[List[Tuple[Dict[str, Any], int]]] = None
+        self._lock = threading.Lock()
+        self._lock_reconciliacao = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._reconciliado_em: Optional[float] = None
+        self.ultima_reconciliacao: Optional[datetime] = None
+        self.reconciliacoes = 0
+        self.falhas = 0
+        self.eventos = 0
+        self.divergencia_ultima = 0
+        self.divergencia_maxima = 0
+        repo.sync.adicionar_observador(self.observar)
+
+    @staticmethod
+    def _aplicar(contadores: Dict[str, Any], valores: Dict[str, Any], sinal: int) -> None:
+        """Somar (sinal=1) ou subtrair (sinal=-1) uma linha dos contadores"""
+        contadores['total_empreendedores'] += sinal
+        if valores.get('ativo_na_ludos'):
+            contadores['total_ativos_ludos'] += sinal
+        if valores.get('fazendo_mentoria'):
+            contadores['total_em_mentoria'] += sinal
+        for campo in CAMPOS_NPS:
+            nota = valores.get(campo)
+            if nota is not None:
+                contadores[f'soma_{campo}'] += sinal * nota
+                contadores[f'contagem_{campo}'] += sinal
+        for chave, campo in DISTRIBUICOES:
+            valor = valores.get(campo)
+            if valor is None:
+                continue
+            distribuicao = contadores[chave]
+            total = distribuicao.get(valor, 0) + sinal
+            if total > 0:
+                distribuicao[valor] = total
+            else:
+                distribuicao.pop(valor, None)
+
+    def observar(
+        self, evento: str, antes: Optional[Dict[str, Any]], depois: Optional[Dict[str, Any]]
+    ) -> None:
+        """Observador do repositório (roda na thread de banco que fez a escrita)"""
+        ajustes: List[Tuple[Dict[str, Any], int]] = []
+        if evento in (EVENTO_ATUALIZADO, EVENTO_REMOVIDO) and antes is not None:
+            ajustes.append((antes, -1))
+        if evento in (EVENTO_CRIADO, EVENTO_ATUALIZADO) and depois is not None:
+            ajustes.append((depois, 1))
+
+        with self._lock:
+            self.eventos += 1
+            if self._pendentes is not None:
+                self._pendentes.extend(ajustes)
+            if self._contadores is not None:
+                for valores, sinal in ajustes:
+                    self._aplicar(self._contadores, valores, sinal)
+
+    @staticmethod
+    def _divergencia(memoria: Dict[str, Any], banco: Dict[str, Any]) -> int:
+        """Soma das diferenças absolutas entre contadores (totais, contagens de NPS e distribuições)"""
+        chaves = TOTAIS + tuple(f'contagem_{campo}' for campo in CAMPOS_NPS)
+        divergencia = sum(abs(memoria[chave] - banco[chave]) for chave in chaves)
+        for chave, _ in DISTRIBUICOES:
+            valores = memoria[chave].keys() | banco[chave].keys()
+            divergencia += sum(abs(memoria[chave].get(v, 0) - banco[chave].get(v, 0)) for v in valores)
+        return divergencia
+
+    async def reconciliar(self) -> None:
+        """Recarregar contadores do banco e medir a divergência em relação à memória"""
+        async with self._lock_reconciliacao:
+            with self._lock:
+                self._pendentes = []
+            try:
+                banco = await self.repo.get_contadores()
+            except Exception:
+                with self._lock:
+                    self._pendentes = None
+                self.falhas += 1
+                raise
+
+            with self._lock:
+                # Escritas confirmadas durante a consulta podem ou não estar no resultado;
+                # reaplicá-las pode contar alguma em dobro até a próxima reconciliação
+                for valores, sinal in self._pendentes:
+                    self._aplicar(banco, valores, sinal)
+                self._pendentes = None
+                if self._contadores is not None:
+                    self.divergencia_ultima = self._divergencia(self._contadores, banco)
+                    self.divergencia_maxima = max(self.divergencia_maxima, self.divergencia_ultima)
+                self._contadores = banco
+                self._reconciliado_em = time.monotonic()
+                self.ultima_reconciliacao = datetime.utcnow()
+                self.reconciliacoes += 1
+
+            if self.divergencia_ultima:
+                logger.warning(f"Estatísticas reconciliadas com divergência de {self.divergencia_ultima}")
+
+    def defasagem(self) -> Optional[float]:
+        """Segundos desde a última reconciliação (None se nunca reconciliou)"""
+        if self._reconciliado_em is None:
+            return None
+        return time.monotonic() - self._reconciliado_em
+
+    async def obter(self) -> Dict[str, Any]:
+        """Estatísticas a partir dos contadores (reconcilia antes se passaram do limite de defasagem)"""
+        defasagem = self.defasagem()
+        if defasagem is None or defasagem > self.max_defasagem:
+            await self.reconciliar()
+        with self._lock:
+            return montar_estatisticas({
+                chave: dict(valor) if isinstance(valor, dict) else valor
+                for chave, valor in self._contadores.items()
+            })
+
+    def status(self) -> Dict[str, Any]:
+        """Defasagem, reconciliações e divergência dos contadores"""
+        defasagem = self.defasagem()
+        return {
+            "carregado": self._contadores is not None,
+            "defasagem_segundos": round(defasagem, 1) if defasagem is not None else None,
+            "max_defasagem_segundos": self.max_defasagem,
+            "intervalo_reconciliacao_segundos": self.intervalo,
+            "ultima_reconciliacao": self.ultima_reconciliacao,
+            "reconciliacoes": self.reconciliacoes,
+            "falhas": self.falhas,
+            "eventos": self.eventos,
+            "divergencia_ultima": self.divergencia_ultima,
+            "divergencia_maxima": self.divergencia_maxima,
+        }
+
+    def iniciar(self) -> None:
+        """Iniciar reconciliação periódica (a primeira carga acontece imediatamente)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+            logger.info("Reconciliação das estatísticas iniciada")
+
+    async def parar(self) -> None:
+        """Parar reconciliação periódica"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Reconciliação das estatísticas parada")
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.reconciliar()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erro ao reconciliar estatísticas: {e}")
+            await asyncio.sleep(self.intervalo)
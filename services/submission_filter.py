@@ -0,0 +1,74 @@
+"""
+Filtro em memória de submissões do Jotform já processadas
+Responde reenvios conhecidos sem ida ao banco
+"""
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+import logging
+import threading
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SubmissionFilter:
+    """
+    LRU de submissionID -> empreendedor_id
+
+    Um acerto é definitivo (o submissionID foi gravado com aquele ID). Uma
+    falta não significa submissão nova: o banco continua sendo a fonte da
+    verdade, via índice único em empreendedores.submission_id.
+    """
+
+    def __init__(self, capacidade: Optional[int] = None):
+        self.capacidade = capacidade or settings.IDEMPOTENCY_CACHE_SIZE
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+
+    def obter(self, submission_id: Optional[str]) -> Optional[int]:
+        """ID do cadastro criado pela submissão, se conhecido"""
+        if not submission_id:
+            return None
+        with self._lock:
+            empreendedor_id = self._ids.get(submission_id)
+            if empreendedor_id is None:
+                self.faltas += 1
+                return None
+            self._ids.move_to_end(submission_id)
+            self.acertos += 1
+            return empreendedor_id
+
+    def registrar(self, submission_id: Optional[str], empreendedor_id: int) -> None:
+        """Registrar submissão gravada (ou reenvio confirmado pelo banco)"""
+        if not submission_id:
+            return
+        with self._lock:
+            self._ids[submission_id] = empreendedor_id
+            self._ids.move_to_end(submission_id)
+            if len(self._ids) > self.capacidade:
+                self._ids.popitem(last=False)
+
+    def carregar(self, pares: Iterable[Tuple[str, int]]) -> int:
+        """Aquecer o filtro com (submissionID, ID), do mais recente para o mais antigo"""
+        total = 0
+        for submission_id, empreendedor_id in reversed(list(pares)):
+            self.registrar(submission_id, empreendedor_id)
+            total += 1
+        return total
+
+    def status(self) -> dict:
+        """Tamanho e taxa de acerto do filtro"""
+        with self._lock:
+            return {
+                "tamanho": len(self._ids),
+                "capacidade": self.capacidade,
+                "acertos": self.acertos,
+                "faltas": self.faltas,
+            }
+
+
+# Instância compartilhada pelo webhook, spool e importação em lote
+submission_filter = SubmissionFilter()
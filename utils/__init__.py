@@ -2,6 +2,7 @@
 Utilitários da aplicação
 """
 from .jotform_processor import JotformProcessor
+from .jotform_field_mapper import JotformFieldMapper, field_mapper
 
-__all__ = ['JotformProcessor']
+__all__ = ['JotformProcessor', 'JotformFieldMapper', 'field_mapper']
 
@@ -0,0 +1,231 @@
+"""
+Leitura do body dos webhooks do Jotform
+Escolhe o parser pelo Content-Type: JSON, x-www-form-urlencoded ou multipart/form-data
+"""
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl
+import logging
+
+from fastapi import Request
+
+from core import json_codec
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+    from python_multipart.exceptions import MultipartParseError
+except ModuleNotFoundError:  # pragma: no cover - versões antigas do python-multipart
+    from multipart.multipart import MultipartParser, parse_options_header
+    from multipart.exceptions import MultipartParseError
+
+logger = logging.getLogger(__name__)
+
+# Quando o Jotform envia rawRequest, só estes campos são necessários
+CAMPOS_ESSENCIAIS = ("rawRequest", "formID", "submissionID")
+
+# Limite de um campo de texto do multipart (rawRequest costuma ter poucos KB)
+MAX_TAMANHO_CAMPO = 1024 * 1024
+
+# Limite de uma linha do NDJSON (um registro, ou um array de registros)
+MAX_TAMANHO_LINHA_NDJSON = 1024 * 1024
+
+TIPO_JSON = "json"
+TIPO_URLENCODED = "urlencoded"
+TIPO_MULTIPART = "multipart"
+
+
+class BodyInvalidoError(ValueError):
+    """Body não pôde ser interpretado no formato declarado"""
+
+
+@dataclass
+class CorpoWebhook:
+    """Resultado da leitura do body"""
+    payload: Any
+    tipo: str
+    tamanho: int
+    bruto: Optional[bytes] = None  # disponível apenas quando o body foi lido inteiro
+
+
+def _apenas_essenciais(campos: Dict[str, Any]) -> Dict[str, Any]:
+    """Se houver rawRequest, descartar os campos duplicados do form"""
+    if "rawRequest" in campos:
+        return {chave: campos[chave] for chave in CAMPOS_ESSENCIAIS if chave in campos}
+    return campos
+
+
+class _CamposMultipart:
+    """
+    Callbacks do parser multipart em streaming
+
+    Guarda apenas partes de texto (sem filename); o conteúdo de arquivos
+    enviados é descartado à medida que chega, sem buffer em memória ou disco.
+    """
+
+    def __init__(self):
+        self.campos: Dict[str, str] = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: List[Tuple[bytes, bytes]] = []
+        self._nome: Optional[str] = None
+        self._arquivo = False
+        self._partes: List[bytes] = []
+        self._tamanho = 0
+
+    def callbacks(self) -> Dict[str, Any]:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+        }
+
+    def on_part_begin(self) -> None:
+        self._headers = []
+        self._nome = None
+        self._arquivo = False
+        self._partes = []
+        self._tamanho = 0
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self._headers.append((self._header_field.lower(), self._header_value))
+        self._header_field = b""
+        self._header_value = b""
+
+    def on_headers_finished(self) -> None:
+        for campo, valor in self._headers:
+            if campo == b"content-disposition":
+                _, opcoes = parse_options_header(valor)
+                nome = opcoes.get(b"name")
+                self._nome = nome.decode("utf-8", errors="replace") if nome is not None else None
+                self._arquivo = b"filename" in opcoes
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._arquivo or self._nome is None:
+            return
+        self._tamanho += end - start
+        if self._tamanho > MAX_TAMANHO_CAMPO:
+            raise BodyInvalidoError(f"Campo '{self._nome}' excede {MAX_TAMANHO_CAMPO} bytes")
+        self._partes.append(data[start:end])
+
+    def on_part_end(self) -> None:
+        if self._nome is not None and not self._arquivo:
+            self.campos[self._nome] = b"".join(self._partes).decode("utf-8", errors="replace")
+
+
+def tipo_do_body(content_type: str) -> str:
+    """Classificar o Content-Type da requisição"""
+    content_type = content_type.lower()
+    if content_type.startswith("multipart/form-data"):
+        return TIPO_MULTIPART
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        return TIPO_URLENCODED
+    return TIPO_JSON
+
+
+async def _ler_multipart(request: Request) -> CorpoWebhook:
+    """Ler multipart/form-data em streaming"""
+    _, opcoes = parse_options_header(request.headers.get("content-type", ""))
+    boundary = opcoes.get(b"boundary")
+    if not boundary:
+        raise BodyInvalidoError("multipart/form-data sem boundary")
+
+    coletor = _CamposMultipart()
+    parser = MultipartParser(boundary, coletor.callbacks())
+    tamanho = 0
+    async for chunk in request.stream():
+        tamanho += len(chunk)
+        parser.write(chunk)
+    parser.finalize()
+
+    return CorpoWebhook(_apenas_essenciais(coletor.campos), TIPO_MULTIPART, tamanho)
+
+
+async def ler_body_webhook(request: Request) -> CorpoWebhook:
+    """
+    Ler e interpretar o body conforme o Content-Type
+
+    - multipart/form-data: streaming, sem buffer de arquivos
+    - application/x-www-form-urlencoded: parse direto dos bytes
+    - JSON (ou Content-Type ausente/desconhecido): codec JSON sobre os bytes
+
+    Raises:
+        BodyInvalidoError: body vazio ou fora do formato declarado
+    """
+    tipo = tipo_do_body(request.headers.get("content-type", ""))
+
+    if tipo == TIPO_MULTIPART:
+        try:
+            corpo = await _ler_multipart(request)
+        except MultipartParseError as e:
+            raise BodyInvalidoError(f"multipart/form-data inválido: {e}") from e
+        if not corpo.payload:
+            raise BodyInvalidoError("multipart/form-data sem campos de texto")
+        return corpo
+
+    body_bytes = await request.body()
+    if not body_bytes or not body_bytes.strip():
+        raise BodyInvalidoError("Body vazio recebido. Verifique a configuração do webhook no Jotform.")
+
+    if tipo == TIPO_URLENCODED:
+        campos = dict(parse_qsl(body_bytes.decode("latin-1"), keep_blank_values=True, encoding="utf-8"))
+        if not campos:
+            raise BodyInvalidoError("Form urlencoded sem campos")
+        return CorpoWebhook(_apenas_essenciais(campos), TIPO_URLENCODED, len(body_bytes), body_bytes)
+
+    try:
+        payload = json_codec.loads(body_bytes)
+    except json_codec.JSONDecodeError as e:
+        raise BodyInvalidoError(f"Body não é JSON válido: {e}") from e
+    return CorpoWebhook(payload, TIPO_JSON, len(body_bytes), body_bytes)
+
+
+def _registros_da_linha(numero: int, linha: bytes) -> List[Tuple[int, Union[Any, BodyInvalidoError]]]:
+    """Decodificar uma linha NDJSON (objeto ou array de objetos)"""
+    try:
+        valor = json_codec.loads(linha)
+    except json_codec.JSONDecodeError as e:
+        return [(numero, BodyInvalidoError(f"Linha {numero} não é JSON válido: {e}"))]
+    if isinstance(valor, list):
+        return [(numero, registro) for registro in valor]
+    return [(numero, valor)]
+
+
+async def iterar_ndjson(request: Request) -> AsyncIterator[Tuple[int, Union[Any, BodyInvalidoError]]]:
+    """
+    Ler um body NDJSON em streaming, um registro por vez
+
+    Cada linha pode ser um objeto ou um array de objetos (arrays em blocos).
+    Só a linha corrente fica em memória. Linhas inválidas são devolvidas como
+    BodyInvalidoError no lugar do registro, sem interromper a leitura.
+
+    Yields:
+        (número da linha, registro ou BodyInvalidoError)
+
+    Raises:
+        BodyInvalidoError: linha maior que MAX_TAMANHO_LINHA_NDJSON
+    """
+    pendente = b""
+    numero = 0
+    async for chunk in request.stream():
+        *linhas, pendente = (pendente + chunk).split(b"\n")
+        for linha in linhas:
+            numero += 1
+            if linha.strip():
+                for item in _registros_da_linha(numero, linha):
+                    yield item
+        if len(pendente) > MAX_TAMANHO_LINHA_NDJSON:
+            raise BodyInvalidoError(f"Linha {numero + 1} excede {MAX_TAMANHO_LINHA_NDJSON} bytes")
+
+    if pendente.strip():
+        for item in _registros_da_linha(numero + 1, pendente):
+            yield item
@@ -0,0 +1,166 @@
+"""
+Mapeamento de campos do rawRequest do Jotform
+Resolve chaves como q2_nome, q20_faixaDe e insirauma58 para os campos canônicos
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+import logging
+import threading
+
+from core import json_codec
+
+logger = logging.getLogger(__name__)
+
+# Chaves técnicas do Jotform que não representam campos do formulário
+CAMPOS_IGNORADOS = frozenset([
+    "slug", "uploadServerUrl", "jsExecutionTracker", "submitSource",
+    "submitDate", "buildDate", "event_id", "timeToSubmit",
+    "enterprise_server", "validatedNewRequiredFieldIDs", "path", "newCardFormMobile"
+])
+
+
+class RegraCampo(NamedTuple):
+    """Regra de mapeamento: condição sobre a chave, condição sobre o valor e campo destino"""
+    casa_chave: Callable[[str, str], bool]  # (chave em minúsculas, chave normalizada)
+    casa_valor: Optional[Callable[[Any], bool]]
+    destino: str
+    transformar: Optional[Callable[[Any], Any]] = None
+
+
+def _primeiro_item(value: Any) -> Any:
+    """Se for lista, pegar primeiro item; se for string, usar direto"""
+    return value[0] if isinstance(value, list) and len(value) > 0 else value
+
+
+def _eh_objeto_nome(value: Any) -> bool:
+    return isinstance(value, dict) and "first" in value
+
+
+# Ordem importa: a primeira regra que casar vence (ex.: escolaridade antes de idade)
+REGRAS: Tuple[RegraCampo, ...] = (
+    # Nome (q2_nome, q5_nome, etc.)
+    RegraCampo(lambda k, n: "nome" in k, _eh_objeto_nome, "Nome"),
+    RegraCampo(lambda k, n: "nome" in k, lambda v: isinstance(v, str), "nome"),
+    # Email (q3_email, etc.)
+    RegraCampo(lambda k, n: "email" in k, None, "E-mail"),
+    # Telefone (q4_telefone, etc.)
+    RegraCampo(lambda k, n: "telefone" in k, lambda v: isinstance(v, dict), "Telefone"),
+    RegraCampo(lambda k, n: "telefone" in k, None, "telefone"),
+    # CPF
+    RegraCampo(lambda k, n: "cpf" in k or "aqui" in k, None, "CPF"),
+    RegraCampo(lambda k, n: "cidade" in k, None, "Cidade"),
+    RegraCampo(lambda k, n: "estado" in k, None, "Estado"),
+    # Escolaridade antes de Idade: "escolaridade" contém "idade"
+    RegraCampo(lambda k, n: "escolaridade" in k, None, "Escolaridade"),
+    RegraCampo(lambda k, n: "idade" in k, None, "Idade"),
+    RegraCampo(lambda k, n: "genero" in k, None, "Gênero"),
+    RegraCampo(lambda k, n: "raca" in k or "cor" in k, None, "Raça/cor"),
+    # Renda (q20_faixaDe ou campos com "renda" e "insira")
+    RegraCampo(
+        lambda k, n: "faixade" in n or ("renda" in k and "insira" in k),
+        None, "Faixa de renda familiar mensal"
+    ),
+    RegraCampo(lambda k, n: "quaissao" in n, None, "Quais são as suas fontes de renda atualmente?"),
+    RegraCampo(lambda k, n: "tempode" in n, None, "Tempo de funcionamento do negócio"),
+    RegraCampo(lambda k, n: "segmentode" in n, None, "Segmento de atuação"),
+    RegraCampo(lambda k, n: "seoutros" in n, None, "Se outros, qual o segmento de atuação do seu négocio?"),
+    # Organização Stone (q10_voceVeio ou insirauma58)
+    RegraCampo(
+        lambda k, n: "voceveio" in n or "insirauma58" in n,
+        None, "Você veio de alguma organização da Rede Instituto Stone? Se sim, qual?",
+        _primeiro_item
+    ),
+)
+
+
+class JotformFieldMapper:
+    """
+    Motor de mapeamento compilado por formID
+
+    Na primeira vez que uma chave aparece para um formulário, as regras são
+    avaliadas e as candidatas ficam em cache. Depois disso cada chave custa
+    uma consulta em dicionário (mais a checagem de tipo do valor, quando a
+    regra depende dele, como Nome objeto vs. string).
+    """
+
+    MAX_FORMULARIOS = 128
+    MAX_CHAVES_POR_FORMULARIO = 1000
+
+    def __init__(self, regras: Tuple[RegraCampo, ...] = REGRAS):
+        self.regras = regras
+        self._cache: "OrderedDict[Optional[str], Dict[str, Tuple[RegraCampo, ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _compilar_chave(self, key: str) -> Tuple[RegraCampo, ...]:
+        """Avaliar as regras de nome uma única vez para a chave"""
+        key_lower = key.lower()
+        key_norm = key_lower.replace("_", "").replace(" ", "")
+        return tuple(regra for regra in self.regras if regra.casa_chave(key_lower, key_norm))
+
+    def _mapeamento_formulario(self, form_id: Optional[str]) -> Dict[str, Tuple[RegraCampo, ...]]:
+        """Obter (ou criar) o mapeamento compilado do formulário"""
+        with self._lock:
+            mapeamento = self._cache.get(form_id)
+            if mapeamento is None:
+                mapeamento = {}
+                self._cache[form_id] = mapeamento
+                if len(self._cache) > self.MAX_FORMULARIOS:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(form_id)
+            return mapeamento
+
+    def mapear(
+        self, raw_request: Dict[str, Any], form_id: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Mapear campos do rawRequest para o formato do JotformWebhookPayload
+
+        Returns:
+            Tuple[Dict[str, Any], List[str]]: (payload mapeado, chaves não mapeadas)
+        """
+        mapeamento = self._mapeamento_formulario(form_id)
+        mapped_payload: Dict[str, Any] = {}
+        chaves_mapeadas = set()
+
+        for key, value in raw_request.items():
+            candidatas = mapeamento.get(key)
+            if candidatas is None:
+                candidatas = self._compilar_chave(key)
+                if len(mapeamento) < self.MAX_CHAVES_POR_FORMULARIO:
+                    mapeamento[key] = candidatas
+
+            for regra in candidatas:
+                if regra.casa_valor is None or regra.casa_valor(value):
+                    mapped_payload[regra.destino] = regra.transformar(value) if regra.transformar else value
+                    chaves_mapeadas.add(key)
+                    break
+
+        nao_mapeadas = sorted(raw_request.keys() - chaves_mapeadas - CAMPOS_IGNORADOS)
+        return mapped_payload, nao_mapeadas
+
+    def mapear_submissao(self, raw_payload: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Mapear submissão form-data do Jotform (com rawRequest) para payload canônico
+
+        O rawRequest pode vir como string JSON ou já decodificado. Os metadados
+        submissionID e formID são preservados no payload mapeado.
+
+        Raises:
+            json_codec.JSONDecodeError: se rawRequest não for JSON válido
+        """
+        raw_request = raw_payload.get("rawRequest") or "{}"
+        if isinstance(raw_request, (str, bytes)):
+            raw_request = json_codec.loads(raw_request)
+
+        form_id = raw_payload.get("formID")
+        mapped_payload, nao_mapeadas = self.mapear(raw_request, form_id)
+
+        # Adicionar metadados úteis
+        mapped_payload["submissionID"] = raw_payload.get("submissionID")
+        mapped_payload["formID"] = form_id
+        return mapped_payload, nao_mapeadas
+
+
+# Instância compartilhada (cache de mapeamentos por formulário)
+field_mapper = JotformFieldMapper()
@@ -11,6 +11,14 @@ from dto.webhook_dtos import JotformWebhookPayload, EmpreendedorCreateRequest
 logger = logging.getLogger(__name__)
 
 
+class PayloadInvalidoError(ValueError):
+    """Payload do webhook não pôde ser validado/convertido"""
+
+
+class CamposObrigatoriosError(PayloadInvalidoError):
+    """Payload sem os campos mínimos (Nome e Telefone)"""
+
+
 class JotformProcessor:
     """Classe para processar dados do Jotform"""
     
@@ -218,7 +226,7 @@ class JotformProcessor:
             # Processar fontes de renda
             fonte_renda = JotformProcessor.processar_fontes_renda(payload)
             
-            # Criar request
+            # Criar request (campos Ludos, MGM e flags ficam com os defaults do DTO)
             return EmpreendedorCreateRequest(
                 # Obrigatórios
                 nome=nome,
@@ -245,26 +253,7 @@ class JotformProcessor:
                 segmento_outros=payload.segmento_outros,
                 organizacao_stone=JotformProcessor.padronizar_organizacao(payload.organizacao_stone),
                 formulario_tipo="Webhook Jotform",
-                
-                # Defaults para campos Ludos
-                ludos_pontos=0,
-                ludos_moedas=0,
-                ludos_nivel=1,
-                
-                # Defaults para campos MGM
-                mgm_total_mensagens=0,
-                mgm_total_reacoes=0,
-                mgm_total_interacoes=0,
-                mgm_engajamento_percent=0.0,
-                
-                # Defaults para flags
-                esta_na_comunidade=False,
-                esta_no_grupo_mentoria=False,
-                esta_no_papo_impulso=False,
-                interacao_nos_grupos=0,
-                ativo_na_ludos=False,
-                fazendo_mentoria=False,
-                solicitou_credito=False,
+                submission_id=JotformProcessor.extrair_submission_id(payload.model_extra),
             )
             
         except ValueError as e:
@@ -275,6 +264,36 @@ class JotformProcessor:
             logger.error(f"Erro ao converter payload: {e}")
             raise
     
+    @staticmethod
+    def converter_payload(raw_payload: Any) -> EmpreendedorCreateRequest:
+        """
+        Validar e converter o payload bruto em uma única passada
+        
+        Checa os campos mínimos no dict, valida uma vez com o validador
+        compilado do JotformWebhookPayload e monta o EmpreendedorCreateRequest.
+        
+        Args:
+            raw_payload: Payload bruto (já mapeado, se veio com rawRequest)
+            
+        Returns:
+            EmpreendedorCreateRequest: Dados prontos para inserção
+            
+        Raises:
+            CamposObrigatoriosError: Nome ou Telefone ausentes
+            PayloadInvalidoError: payload fora do formato esperado
+        """
+        if not isinstance(raw_payload, dict):
+            raise PayloadInvalidoError(f"Payload deve ser um objeto JSON, recebido {type(raw_payload).__name__}")
+        if not JotformProcessor.validar_payload(raw_payload):
+            raise CamposObrigatoriosError("Campos obrigatórios ausentes (Nome e Telefone)")
+        
+        try:
+            payload = JotformWebhookPayload.model_validate(raw_payload)
+            return JotformProcessor.payload_to_empreendedor(payload)
+        except ValueError as e:
+            # Inclui ValidationError do pydantic e Nome/Telefone vazios após limpeza
+            raise PayloadInvalidoError(str(e)) from e
+    
     @staticmethod
     def payload_list_to_empreendedores(
         payloads: List[JotformWebhookPayload]
@@ -330,6 +349,17 @@ class JotformProcessor:
             logger.error(f"Erro ao validar payload: {e}")
             return False
     
+    @staticmethod
+    def extrair_submission_id(payload: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Extrair submissionID do Jotform (chave de idempotência), se houver"""
+        if not payload:
+            return None
+        submission_id = payload.get('submissionID')
+        if submission_id is None:
+            return None
+        submission_id = str(submission_id).strip()
+        return submission_id[:64] if submission_id else None
+    
     @staticmethod
     def extrair_metadata(payload: Dict[str, Any]) -> Dict[str, Any]:
         """
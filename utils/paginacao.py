@@ -0,0 +1,48 @@
+"""
+Paginação por cursor (keyset) da busca de empreendedores
+O cursor é opaco para o cliente: guarda o último ID da página e a assinatura dos filtros usados
+"""
+import base64
+import json
+import zlib
+from typing import Any, Dict
+
+# Campos da busca que controlam a paginação (não fazem parte dos filtros)
+CAMPOS_PAGINACAO = {"page", "page_size", "cursor", "contagem"}
+
+VERSAO_CURSOR = 1
+
+
+class CursorInvalidoError(ValueError):
+    """Cursor malformado ou gerado para outros filtros"""
+
+
+def assinatura_filtros(filtros: Dict[str, Any]) -> str:
+    """Assinatura curta e estável dos filtros (chave do cache de contagem e validação do cursor)"""
+    serializado = json.dumps(filtros, sort_keys=True, default=str, ensure_ascii=False)
+    return format(zlib.crc32(serializado.encode("utf-8")), "08x")
+
+
+def codificar_cursor(ultimo_id: int, assinatura: str) -> str:
+    """Cursor da próxima página, a partir do último ID retornado"""
+    conteudo = json.dumps({"v": VERSAO_CURSOR, "id": ultimo_id, "f": assinatura}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(conteudo.encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: str, assinatura: str) -> int:
+    """
+    Último ID da página anterior
+
+    Raises:
+        CursorInvalidoError: cursor malformado ou de uma busca com outros filtros
+    """
+    try:
+        conteudo = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        versao, ultimo_id, assinatura_cursor = conteudo["v"], conteudo["id"], conteudo["f"]
+    except (ValueError, TypeError, KeyError):
+        raise CursorInvalidoError("Cursor inválido")
+    if versao != VERSAO_CURSOR or not isinstance(ultimo_id, int):
+        raise CursorInvalidoError("Cursor inválido")
+    if assinatura_cursor != assinatura:
+        raise CursorInvalidoError("Cursor gerado para outros filtros de busca")
+    return ultimo_id
@@ -0,0 +1,41 @@
+"""
+Normalização de texto para busca
+Remove acentos, ignora maiúsculas e espaços repetidos; aplicada na gravação e nos termos buscados
+"""
+import re
+import unicodedata
+from typing import Optional
+
+# Sufixo "_N" acrescentado a telefones repetidos
+_SUFIXO_TELEFONE = re.compile(r"_\d+$")
+_NAO_DIGITOS = re.compile(r"[^0-9]")
+
+
+def normalizar_busca(valor: Optional[str], max_length: Optional[int] = None) -> Optional[str]:
+    """
+    Forma normalizada de um texto ("  José  da SILVA " -> "jose da silva")
+
+    Returns:
+        Texto normalizado (truncado em max_length) ou None se vazio
+    """
+    if not valor:
+        return None
+    if not valor.isascii():
+        decomposto = unicodedata.normalize("NFKD", valor)
+        valor = "".join(c for c in decomposto if not unicodedata.combining(c))
+    normalizado = " ".join(valor.casefold().split())
+    if max_length:
+        normalizado = normalizado[:max_length]
+    return normalizado or None
+
+
+def digitos_telefone(telefone: Optional[str]) -> Optional[str]:
+    """
+    Chave numérica do telefone, sem formatação nem sufixo de duplicidade
+    ("(11) 99999-0000_2" -> "11999990000")
+    """
+    if not telefone:
+        return None
+    base = _SUFIXO_TELEFONE.sub("", telefone)
+    digitos = _NAO_DIGITOS.sub("", base)
+    return digitos[:20] or None